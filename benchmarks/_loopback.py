@@ -0,0 +1,164 @@
+"""
+Loopback servers standing in for a local log agent. They count what they receive and nothing else.
+"""
+from __future__ import annotations
+
+import socket
+import threading
+
+
+class LoopbackUDPServer:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        self._socket.bind((host, port))
+        self._socket.settimeout(0.2)
+        self.address: tuple[str, int] = self._socket.getsockname()
+        self.datagrams: int = 0
+        self.lines: int = 0
+        self.bytes: int = 0
+        self._running: bool = True
+        self._thread: threading.Thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                data: bytes = self._socket.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.datagrams += 1
+            self.lines += data.count(b'\n') + 1
+            self.bytes += len(data)
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._socket.close()
+
+
+class LoopbackTCPServer:
+    """
+    :param octet_counting: Counts RFC 6587 octet-counted frames instead of new-line terminated lines
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *, octet_counting: bool = False):
+        self._octet_counting: bool = octet_counting
+        self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen()
+        self._socket.settimeout(0.2)
+        self.address: tuple[str, int] = self._socket.getsockname()
+        self.connections: int = 0
+        self.lines: int = 0
+        self.bytes: int = 0
+        self._running: bool = True
+        self._thread: threading.Thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket.socket):
+        connection.settimeout(0.2)
+        pending: bytes = b''
+        with connection:
+            while self._running:
+                try:
+                    data: bytes = connection.recv(1 << 20)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+                if not data:
+                    return
+                self.bytes += len(data)
+                if not self._octet_counting:
+                    self.lines += data.count(b'\n')
+                    continue
+
+                pending += data
+                position: int = 0
+                while True:
+                    space: int = pending.find(b' ', position)
+                    if space < 0:
+                        break
+                    end: int = space + 1 + int(pending[position:space])
+                    if end > len(pending):
+                        break
+                    position = end
+                    self.lines += 1
+                pending = pending[position:]
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._socket.close()
+
+
+class LoopbackHTTPServer:
+    """
+    Accepts bulk posts on keep-alive connections, decompressing gzipped bodies and counting their lines.
+
+    :param failures: Number of posts answered with a 503 before accepting any, to exercise retries
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *, failures: int = 0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import gzip
+
+        server = self
+        self.posts: int = 0
+        self.lines: int = 0
+        self.bytes: int = 0
+        self.connections: int = 0
+        self.failures: int = failures
+        self._lock: threading.Lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                body: bytes = self.rfile.read(int(self.headers['Content-Length']))
+                with server._lock:
+                    if server.failures > 0:
+                        server.failures -= 1
+                        status: int = 503
+                    else:
+                        if self.headers.get('Content-Encoding') == 'gzip':
+                            body = gzip.decompress(body)
+                        server.posts += 1
+                        server.lines += body.count(b'\n')
+                        server.bytes += len(body)
+                        status = 200
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.address: tuple[str, int] = self._server.server_address[:2]
+        self.url: str = f'http://{self.address[0]}:{self.address[1]}/_bulk'
+        self._thread: threading.Thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,55 @@
+"""
+Compares ReporterOutletFile, which writes through a line buffered TextIOWrapper, with ReporterOutletAppendFile, which
+hands segments to os.writev on an O_APPEND descriptor: one report per call, and batches of reports.
+
+    $ python benchmarks/bench_append_file.py [number_of_reports] [batch_size]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet, ReporterOutletFile
+from ereport.library.outlet_append import ReporterOutletAppendFile
+from ereport.library.report import Report
+
+
+def _make_reports(count: int) -> list[Report]:
+    levels = (Levels.DEBUG, Levels.INFO, Levels.INFO, Levels.WARN, Levels.ERROR)
+    return [
+        Report(levels[i % len(levels)], 'bench_module', f'function_{i % 17}', i % 500, f'Processed request {i} in {i % 97} ms', 'BENCH')
+        for i in range(count)
+    ]
+
+
+def _run(name: str, outlet: ReporterOutlet, path: str, reports: list[Report], batch_size: int):
+    start: float = time.perf_counter()
+    if batch_size <= 1:
+        for report in reports:
+            outlet.emit(report)
+    else:
+        for index in range(0, len(reports), batch_size):
+            outlet.emit_many(reports[index:index + batch_size])
+    outlet.close()
+    elapsed: float = time.perf_counter() - start
+
+    print(f'{name:<28} {len(reports) / elapsed:>12,.0f} reports/s   size: {os.path.getsize(path) / 1024:>10,.0f} KiB')
+
+
+def main(count: int, batch_size: int):
+    reports: list[Report] = _make_reports(count)
+    with tempfile.TemporaryDirectory() as directory:
+        for batch in (1, batch_size):
+            suffix: str = 'emit' if batch == 1 else f'emit_many({batch})'
+            text: str = os.path.join(directory, f'text_{batch}.log')
+            _run(f'file {suffix}', ReporterOutletFile(text), text, reports, batch)
+
+            append: str = os.path.join(directory, f'append_{batch}.log')
+            _run(f'append_file {suffix}', ReporterOutletAppendFile(append), append, reports, batch)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000, int(sys.argv[2]) if len(sys.argv) > 2 else 256)
@@ -0,0 +1,61 @@
+"""
+Compares ReporterOutletFile with ReporterOutletCompressedFile: throughput on the caller's thread, total time including
+compression, written size and compression ratio.
+
+    $ python benchmarks/bench_compressed_file.py [number_of_reports]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet, ReporterOutletFile
+from ereport.library.outlet_compressed import ReporterOutletCompressedFile, zstandard
+from ereport.library.report import Report
+
+
+def _make_reports(count: int) -> list[Report]:
+    levels = (Levels.DEBUG, Levels.INFO, Levels.INFO, Levels.WARN, Levels.ERROR)
+    return [
+        Report(levels[i % len(levels)], 'bench_module', f'function_{i % 17}', i % 500, f'Processed request {i} in {i % 97} ms', 'BENCH')
+        for i in range(count)
+    ]
+
+
+def _run(name: str, outlet: ReporterOutlet, path: str, reports: list[Report]):
+    start: float = time.perf_counter()
+    for report in reports:
+        outlet.emit(report)
+    emitted: float = time.perf_counter() - start
+    outlet.close()
+    total: float = time.perf_counter() - start
+
+    size: int = os.path.getsize(path)
+    ratio: float = getattr(outlet, 'ratio', 1.0)
+    dropped: int = getattr(outlet, 'dropped', 0)
+    print(f'{name:<12} emit: {len(reports) / emitted:>12,.0f} reports/s   '
+          f'total: {len(reports) / total:>12,.0f} reports/s   '
+          f'size: {size / 1024:>10,.0f} KiB   ratio: {ratio:>6.2f}   dropped: {dropped:,}')
+
+
+def main(count: int):
+    reports: list[Report] = _make_reports(count)
+    with tempfile.TemporaryDirectory() as directory:
+        plain: str = os.path.join(directory, 'plain.log')
+        _run('plain', ReporterOutletFile(plain), plain, reports)
+
+        gzipped: str = os.path.join(directory, 'gzip.log.gz')
+        _run('gzip', ReporterOutletCompressedFile(gzipped, codec='gzip', max_pending=count), gzipped, reports)
+
+        if zstandard is not None:
+            zstd: str = os.path.join(directory, 'zstd.log.zst')
+            _run('zstd', ReporterOutletCompressedFile(zstd, codec='zstd', max_pending=count), zstd, reports)
+        else:
+            print('zstd         skipped: "zstandard" is not installed')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
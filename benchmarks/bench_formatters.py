@@ -0,0 +1,38 @@
+"""
+Compares the cost of formatting a report with the plain and the colored formatters, colors on and off, for each theme.
+
+    $ python benchmarks/bench_formatters.py [number_of_reports]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+from ereport.library.formatter import THEMES, AdaptativeColoredFormatter, BaseFormatter, ColoredFormatter, DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.report import Report
+
+
+def _measure(name: str, formatter: BaseFormatter, reports: list[Report]):
+    format_many = formatter.format_many
+    best: float = min(timeit.repeat(lambda: format_many(reports), number=1, repeat=7))
+    print(f'{name:<28} {best / len(reports) * 1e9:>8,.0f} ns/report')
+
+
+def main(count: int):
+    levels = (Levels.DEBUG, Levels.INFO, Levels.INFO, Levels.WARN, Levels.ERROR)
+    reports: list[Report] = [
+        Report(levels[i % len(levels)], 'bench_module', f'function_{i % 17}', i % 500, f'Processed request {i} in {i % 97} ms', 'BENCH')
+        for i in range(count)
+    ]
+
+    _measure('default', DefaultFormatter(), reports)
+    for theme in THEMES:
+        _measure(f'colored {theme}', ColoredFormatter(theme, enabled=True), reports)
+    _measure('colored, colors off', ColoredFormatter(enabled=False), reports)
+    _measure('adaptative', AdaptativeColoredFormatter(enabled=True), reports)
+    _measure('adaptative, colors off', AdaptativeColoredFormatter(enabled=False), reports)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,45 @@
+"""
+Measures ReporterOutletHTTP against a loopback bulk ingestion server: throughput, number of posts and connections,
+retries and drops, with and without gzip.
+
+    $ python benchmarks/bench_http_outlet.py [number_of_reports]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from _loopback import LoopbackHTTPServer
+from ereport.library.level import Levels
+from ereport.library.outlet_http import ReporterOutletHTTP
+from ereport.library.report import Report
+
+
+def _run(name: str, count: int, failures: int = 0, **kwargs):
+    server = LoopbackHTTPServer(failures=failures)
+    outlet = ReporterOutletHTTP(server.url, max_pending=count, min_backoff=0.01, **kwargs)
+    reports: list[Report] = [
+        Report(Levels.INFO, 'bench_module', 'bench_function', i % 500, f'Processed request {i}', 'BENCH') for i in range(count)
+    ]
+
+    start: float = time.perf_counter()
+    for report in reports:
+        outlet.emit(report)
+    outlet.flush()
+    elapsed: float = time.perf_counter() - start
+    outlet.close()
+    server.stop()
+
+    print(f'{name:<16} {count / elapsed:>12,.0f} reports/s   received: {server.lines:>9,}   posts: {server.posts:>5,}   '
+          f'connections: {server.connections:>3}   retries: {outlet.retries:>3}   dropped: {outlet.dropped:,}')
+
+
+def main(count: int):
+    _run('gzip', count)
+    _run('plain', count, compression_level=None)
+    _run('gzip + failures', count, failures=3)
+    _run('unrecoverable', 2000, failures=1000, max_retries=2)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
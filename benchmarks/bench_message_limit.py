@@ -0,0 +1,48 @@
+"""
+Measures the memory peak of logging large messages to an outlet queuing its reports, without a size limit, with
+truncation, and with oversized messages spilled to disk.
+
+    $ python benchmarks/bench_message_limit.py [number_of_reports] [message_size]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.outlet_compressed import ReporterOutletCompressedFile
+from ereport.library.outlet_limited import ReporterOutletLimited
+from ereport.library.reporter import Reporter
+
+
+def _run(name: str, outlet: ReporterOutlet, count: int, message_size: int):
+    reporter: Reporter = Reporter('BENCH', Levels.INFO).set_outlets([outlet])
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    for index in range(count):
+        # A distinct payload each time, as a dumped request would be
+        reporter.info(f'payload {index} ' + 'x' * message_size)
+    outlet.close()
+    elapsed: float = time.perf_counter() - start
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{name:<12} peak: {peak / 2 ** 20:>10,.1f} MiB   {count / elapsed:>10,.0f} reports/s')
+
+
+def main(count: int, message_size: int):
+    with tempfile.TemporaryDirectory() as directory:
+        def compressed(file_name: str) -> ReporterOutlet:
+            return ReporterOutletCompressedFile(os.path.join(directory, file_name), flush_interval=1.0, max_pending=count)
+
+        _run('unlimited', compressed('unlimited.log.gz'), count, message_size)
+        _run('truncated', ReporterOutletLimited(compressed('truncated.log.gz'), 4096), count, message_size)
+        spilled = ReporterOutletLimited(compressed('spilled.log.gz'), 4096, spill_directory=os.path.join(directory, 'spill'))
+        _run('spilled', spilled, count, message_size)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
@@ -0,0 +1,76 @@
+"""
+Measures throughput and loss of the UDP, TCP and syslog outlets against loopback servers, and the delivery of reports
+spilled while the TCP peer is unreachable.
+
+    $ python benchmarks/bench_network_outlets.py [number_of_reports]
+"""
+from __future__ import annotations
+
+import socket
+import sys
+import time
+
+from _loopback import LoopbackTCPServer, LoopbackUDPServer
+from ereport.library.level import Levels
+from ereport.library.outlet_network import ReporterOutletSyslogTCP, ReporterOutletSyslogUDP, ReporterOutletTCP, ReporterOutletUDP
+from ereport.library.report import Report
+
+
+def _make_reports(count: int) -> list[Report]:
+    return [Report(Levels.INFO, 'bench_module', 'bench_function', i % 500, f'Processed request {i}', 'BENCH') for i in range(count)]
+
+
+def _wait_for(server, expected: int, timeout: float = 5.0):
+    deadline: float = time.monotonic() + timeout
+    while server.lines < expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def _run(name: str, outlet, server, reports: list[Report], expected: int | None = None):
+    expected = expected or len(reports)
+    start: float = time.perf_counter()
+    for report in reports:
+        outlet.emit(report)
+    outlet.flush()
+    _wait_for(server, expected)
+    elapsed: float = time.perf_counter() - start
+    outlet.close()
+    print(f'{name:<12} {len(reports) / elapsed:>12,.0f} reports/s   '
+          f'received: {server.lines:>9,}   dropped: {outlet.dropped:>9,}   lost: {expected - server.lines - outlet.dropped:>9,}')
+    server.stop()
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def main(count: int):
+    reports: list[Report] = _make_reports(count)
+
+    server = LoopbackUDPServer()
+    _run('udp', ReporterOutletUDP(*server.address, max_pending=count), server, reports)
+
+    server = LoopbackUDPServer()
+    _run('syslog/udp', ReporterOutletSyslogUDP(*server.address, max_pending=count), server, reports)
+
+    server = LoopbackTCPServer()
+    _run('tcp', ReporterOutletTCP(*server.address, max_pending=count), server, reports)
+
+    server = LoopbackTCPServer(octet_counting=True)
+    _run('syslog/tcp', ReporterOutletSyslogTCP(*server.address, max_pending=count), server, reports)
+
+    port: int = _free_port()
+    outlet = ReporterOutletTCP('127.0.0.1', port, min_backoff=0.05, max_spill=count)
+    for report in reports[:1000]:
+        outlet.emit(report)
+    outlet.flush()
+    print(f'outage       connected: {outlet.connected}   spilled: {outlet.spilled:,}')
+    server = LoopbackTCPServer(port=port)
+    time.sleep(0.1)
+    _run('recovered', outlet, server, reports[1000:], expected=count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,90 @@
+"""
+Compares the shared memory ring transport with a multiprocessing.Queue carrying pickled reports: worker processes each
+send reports to a collector in the main process, which hands them to a counting outlet.
+
+    $ python benchmarks/bench_shm_ring.py [number_of_workers] [reports_per_worker]
+"""
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import time
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+from ereport.library.shm_ring import ReporterOutletSharedMemory, SharedMemoryCollector, encode_report
+
+
+class _CountingOutlet(ReporterOutlet):
+    def __init__(self):
+        super().__init__()
+        self.count: int = 0
+
+    def emit(self, report: Report):
+        self.count += 1
+
+
+def _make_report(index: int) -> Report:
+    return Report(Levels.INFO, 'bench_module', 'bench_function', index % 500, f'Processed request {index}', 'BENCH')
+
+
+def _ring_worker(ring_name: str, count: int):
+    outlet = ReporterOutletSharedMemory(ring_name)
+    for index in range(count):
+        record: bytes = encode_report(_make_report(index))
+        while not outlet.ring.write(record):
+            time.sleep(0.0005)
+    outlet.close()
+
+
+def _queue_worker(queue: multiprocessing.Queue, count: int):
+    for index in range(count):
+        queue.put(_make_report(index))
+
+
+def _bench_ring(workers: int, count: int) -> float:
+    counter = _CountingOutlet()
+    reporter = Reporter('BENCH_RING', Levels.ALL).set_outlets([counter])
+    collector = SharedMemoryCollector(reporter, poll_interval=0.001)
+    rings = [collector.add_ring(1024 * 1024) for _ in range(workers)]
+    collector.start()
+
+    start: float = time.perf_counter()
+    processes = [multiprocessing.Process(target=_ring_worker, args=(ring.name, count)) for ring in rings]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    while counter.count < workers * count:
+        time.sleep(0.001)
+    elapsed: float = time.perf_counter() - start
+    collector.stop()
+    return elapsed
+
+
+def _bench_queue(workers: int, count: int) -> float:
+    counter = _CountingOutlet()
+    queue: multiprocessing.Queue = multiprocessing.Queue(maxsize=10_000)
+
+    start: float = time.perf_counter()
+    processes = [multiprocessing.Process(target=_queue_worker, args=(queue, count)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in range(workers * count):
+        counter.emit(queue.get())
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start
+
+
+def main(workers: int, count: int):
+    total: int = workers * count
+    for name, bench in (('shm ring', _bench_ring), ('mp.Queue', _bench_queue)):
+        elapsed: float = bench(workers, count)
+        print(f'{name:<10} {workers} workers   {total / elapsed:>12,.0f} reports/s   {elapsed * 1e6 / total:>8.2f} us/report')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4, int(sys.argv[2]) if len(sys.argv) > 2 else 50_000)
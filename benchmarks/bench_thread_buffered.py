@@ -0,0 +1,72 @@
+"""
+Compares threads logging to a file outlet guarded by a lock with threads logging through thread-local buffers merged
+by a single writer, for an increasing number of threads.
+
+    $ python benchmarks/bench_thread_buffered.py [reports_per_thread] [file]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet, ReporterOutletFile
+from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+
+class _LockedOutlet(ReporterOutlet):
+    __slots__ = (
+        '_outlet',
+        '_lock'
+    )
+
+    def __init__(self, outlet: ReporterOutlet):
+        super().__init__()
+        self._outlet: ReporterOutlet = outlet
+        self._lock: threading.Lock = threading.Lock()
+
+    def emit(self, report: Report):
+        with self._lock:
+            self._outlet.emit(report)
+
+    def close(self):
+        self._outlet.close()
+
+
+def _log(reporter: Reporter, count: int):
+    for index in range(count):
+        reporter.info(f'Processed request {index}')
+
+
+def _bench(outlet: ReporterOutlet, threads: int, count: int) -> float:
+    reporter = Reporter(f'BENCH_{id(outlet)}', Levels.INFO).set_outlets([outlet])
+    workers = [threading.Thread(target=_log, args=(reporter, count)) for _ in range(threads)]
+    start: float = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    outlet.close()
+    return threads * count / (time.perf_counter() - start)
+
+
+def main():
+    count: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    path: str = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), 'ereport_bench_thread_buffered.log')
+    print(f'{"threads":>8} {"locked file":>16} {"thread buffered":>16}')
+    for threads in (1, 2, 4, 8, 16):
+        locked: float = _bench(_LockedOutlet(ReporterOutletFile(path, DefaultFormatter())), threads, count)
+        buffered: float = _bench(ReporterOutletThreadBuffered([ReporterOutletFile(path, DefaultFormatter())]), threads, count)
+        print(f'{threads:>8} {locked:>12,.0f} r/s {buffered:>12,.0f} r/s')
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Forks processes while reports are being logged by several threads, then checks that each file holds every report
+exactly once, without torn lines: a plain file, a file written with os.writev, a gzip compressed file, and a plain file
+behind thread-local buffers.
+
+    $ python benchmarks/stress_fork.py [number_of_children] [reports_per_child]
+"""
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutletFile
+from ereport.library.outlet_append import ReporterOutletAppendFile
+from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+from ereport.library.outlet_compressed import ReporterOutletCompressedFile
+from ereport.library.replay import iter_lines
+from ereport.library.reporter import Reporter
+
+_LINE = re.compile(r'\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{6}] \[ INFO  ] \[ STRESS \] \[\(\d{4}\) .{30}::.{30}] (\w+-\d+-\d+)$')
+
+
+def _log_from_thread(reporter: Reporter, tag: str, count: int, started: threading.Event | None = None):
+    for index in range(count):
+        reporter.info(f'{tag}-{os.getpid()}-{index}')
+        if started is not None and index == count // 10:
+            started.set()
+
+
+def _child(reporter: Reporter, outlets: list, count: int):
+    thread = threading.Thread(target=_log_from_thread, args=(reporter, 'childthread', count))
+    thread.start()
+    _log_from_thread(reporter, 'child', count)
+    thread.join()
+    for outlet in outlets:
+        outlet.close()
+    os._exit(0)  # pylint: disable=protected-access
+
+
+def _check(name: str, lines: list[str], expected: Counter) -> bool:
+    found: Counter = Counter()
+    torn: int = 0
+    for line in lines:
+        match = _LINE.match(line)
+        if match is None:
+            torn += 1
+        else:
+            found[match.group(1)] += 1
+
+    duplicated: int = sum(count - 1 for count in found.values() if count > 1)
+    lost: int = sum(1 for message in expected if message not in found)
+    unexpected: int = sum(1 for message in found if message not in expected)
+    print(f'{name:<16} {len(lines):>9} lines  {torn:>4} torn  {duplicated:>4} duplicated  {lost:>4} lost  {unexpected:>4} unexpected')
+    return not (torn or duplicated or lost or unexpected)
+
+
+def main() -> int:
+    if not hasattr(os, 'fork'):
+        print('os.fork is not available on this platform')
+        return 0
+
+    children: int = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count: int = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    directory: str = tempfile.mkdtemp(prefix='ereport_stress_fork_')
+    plain: str = os.path.join(directory, 'plain.log')
+    append: str = os.path.join(directory, 'append.log')
+    compressed: str = os.path.join(directory, 'compressed.log.gz')
+    buffered: str = os.path.join(directory, 'buffered.log')
+
+    outlets: list = [
+        ReporterOutletFile(plain, DefaultFormatter()),
+        ReporterOutletAppendFile(append, DefaultFormatter()),
+        ReporterOutletCompressedFile(compressed, DefaultFormatter(), flush_interval=0.05),
+        ReporterOutletThreadBuffered([ReporterOutletFile(buffered, DefaultFormatter())], flush_interval=0.05)
+    ]
+    reporter = Reporter('STRESS', Levels.INFO).set_outlets(outlets)
+
+    started = threading.Event()
+    background = threading.Thread(target=_log_from_thread, args=(reporter, 'parentthread', count * children, started))
+    background.start()
+    started.wait()
+
+    pids: list[int] = []
+    for _ in range(children):
+        reporter.info(f'parent-{os.getpid()}-{len(pids)}')
+        pid: int = os.fork()
+        if pid == 0:
+            _child(reporter, outlets, count)
+        pids.append(pid)
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+    background.join()
+    for outlet in outlets:
+        outlet.close()
+
+    expected: Counter = Counter()
+    expected.update(f'parentthread-{os.getpid()}-{index}' for index in range(count * children))
+    expected.update(f'parent-{os.getpid()}-{index}' for index in range(children))
+    for pid in pids:
+        expected.update(f'child-{pid}-{index}' for index in range(count))
+        expected.update(f'childthread-{pid}-{index}' for index in range(count))
+
+    succeeded: bool = True
+    for name, path in (('plain', plain), ('append', append), ('compressed', compressed), ('thread buffered', buffered)):
+        succeeded &= _check(name, [line.decode('utf8') for line in iter_lines(path)], expected)
+
+    shutil.rmtree(directory)
+    return 0 if succeeded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
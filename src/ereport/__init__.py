@@ -1,5 +1,7 @@
 import os
 
+from ereport.library._internal.traceback_cache import ExcInfo
+from ereport.library.context import bind_context, context, get_context, reset_context, with_current_context
 from ereport.library.level import Levels, Level
 from ereport.library.report import Report
 from ereport.library.reporter import Reporter
@@ -12,100 +14,80 @@ def get_or_make_reporter(name: str = None, env_var_logging_level: str = None, de
     return Reporter.get_or_make(name or 'MAIN', env_var_logging_level, default_level)
 
 
-def trace(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.TRACE):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.TRACE,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def debug(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.DEBUG):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.DEBUG,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def success(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.SUCCESS):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.SUCCESS,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def info(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.INFO):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.INFO,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def warn(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.WARN):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.WARN,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def error(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.ERROR):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.ERROR,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def severe(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.SEVERE):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.SEVERE,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
-
-
-def fatal(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0):
-    if _DEFAULT_REPORTER._level.can_log(Levels.FATAL):
-        _DEFAULT_REPORTER._log(Report(
-            level=Levels.FATAL,
-            module=module or _DEFAULT_REPORTER._find_module(stack_level),
-            function=function or _DEFAULT_REPORTER._find_function(stack_level),
-            line=line or _DEFAULT_REPORTER._find_line_number(),
-            message=message,
-            reporter_name=_DEFAULT_REPORTER._reporter_name
-        ))
+def bind(**fields) -> Reporter:
+    return _DEFAULT_REPORTER.bind(**fields)
+
+
+def trace(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+          exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.TRACE, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.TRACE)
+    ) and (_DEFAULT_REPORTER._overload is None or _DEFAULT_REPORTER._overload.admit(Levels.TRACE)):
+        _DEFAULT_REPORTER._report(Levels.TRACE, message, module, function, line, stack_level, exc_info, args)
+
+
+def debug(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+          exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.DEBUG, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.DEBUG)
+    ) and (_DEFAULT_REPORTER._overload is None or _DEFAULT_REPORTER._overload.admit(Levels.DEBUG)):
+        _DEFAULT_REPORTER._report(Levels.DEBUG, message, module, function, line, stack_level, exc_info, args)
+
+
+def success(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.SUCCESS, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.SUCCESS)
+    ) and (_DEFAULT_REPORTER._overload is None or _DEFAULT_REPORTER._overload.admit(Levels.SUCCESS)):
+        _DEFAULT_REPORTER._report(Levels.SUCCESS, message, module, function, line, stack_level, exc_info, args)
+
+
+def info(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+         exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.INFO, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.INFO)
+    ) and (_DEFAULT_REPORTER._overload is None or _DEFAULT_REPORTER._overload.admit(Levels.INFO)):
+        _DEFAULT_REPORTER._report(Levels.INFO, message, module, function, line, stack_level, exc_info, args)
+
+
+def warn(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+         exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.WARN, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.WARN)
+    ):
+        _DEFAULT_REPORTER._report(Levels.WARN, message, module, function, line, stack_level, exc_info, args)
+
+
+def error(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+          exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.ERROR, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.ERROR)
+    ):
+        _DEFAULT_REPORTER._report(Levels.ERROR, message, module, function, line, stack_level, exc_info, args)
+
+
+def severe(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+           exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.SEVERE, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.SEVERE)
+    ):
+        _DEFAULT_REPORTER._report(Levels.SEVERE, message, module, function, line, stack_level, exc_info, args)
+
+
+def fatal(message: str, module: str | None = None, function: str | None = None, line: int | None = None, stack_level: int = 0,
+          exc_info: BaseException | ExcInfo | bool = None, args: tuple = ()):
+    if (
+        _DEFAULT_REPORTER._call_site_enabled(Levels.FATAL, stack_level) if _DEFAULT_REPORTER._rules
+        else _DEFAULT_REPORTER._level.can_log(Levels.FATAL)
+    ):
+        _DEFAULT_REPORTER._report(Levels.FATAL, message, module, function, line, stack_level, exc_info, args)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,5 @@
+import sys
+
+from ereport.library.cli import main
+
+sys.exit(main())
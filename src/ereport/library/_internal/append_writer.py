@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+from typing import Final, Sequence, TypeAlias
+
+
+def _iov_max() -> int:
+    try:
+        return max(os.sysconf('SC_IOV_MAX'), 16)
+    except (AttributeError, ValueError, OSError):  # pragma: no cover - platform dependent
+        return 1024
+
+
+_IOV_MAX: Final[int] = _iov_max()
+_HAS_WRITEV: Final[bool] = hasattr(os, 'writev')
+_FLAGS: Final[int] = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+Segment: TypeAlias = bytes | memoryview
+
+
+class AppendWriter:
+    """
+    Appends byte segments to a file opened with ``O_APPEND``, without buffering nor joining them first.
+
+    Segments are handed to :func:`os.writev`, at most ``IOV_MAX`` per call. The kernel moves to the end of the file
+    before each call, so the records of several processes appending to the same file are not interleaved: writes up to
+    ``PIPE_BUF`` bytes are atomic everywhere, and most local file systems do not split larger ones. Partial writes are
+    resumed where they stopped. Where :func:`os.writev` is missing, segments are joined and written with :func:`os.write`.
+
+    Not thread-safe: callers serialize their writes.
+    """
+    __slots__ = (
+        '_fd',
+        'path'
+    )
+
+    def __init__(self, path: str, *, truncate: bool = False):
+        self.path: str = path
+        self._fd: int = os.open(path, _FLAGS | (os.O_TRUNC if truncate else 0), 0o666)
+
+    @property
+    def closed(self) -> bool:
+        return self._fd < 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def write(self, segments: Sequence[Segment]) -> int:
+        """
+        Writes every segment, in order
+
+        :return: The number of bytes written
+        :raise ValueError: When the writer is closed
+        """
+        if self._fd < 0:
+            raise ValueError(f'Cannot write to "{self.path}": the writer is closed')
+
+        if not _HAS_WRITEV:
+            return self._write_all(b''.join(segments))
+
+        written: int = 0
+        start: int = 0
+        count: int = len(segments)
+        while start < count:
+            chunk: Sequence[Segment] = segments[start:start + _IOV_MAX]
+            expected: int = sum(len(segment) for segment in chunk)
+            done: int = os.writev(self._fd, chunk)
+            if done < expected:
+                self._resume(chunk, done)
+            written += expected
+            start += _IOV_MAX
+
+        return written
+
+    def reopen(self, path: str | None = None):
+        """
+        Closes the descriptor and opens ``path`` (by default, the same file) for appending
+        """
+        self.close()
+        if path is not None:
+            self.path = path
+        self._fd = os.open(self.path, _FLAGS, 0o666)
+
+    def close(self):
+        if self._fd >= 0:
+            fd: int = self._fd
+            self._fd = -1
+            os.close(fd)
+
+    def _resume(self, chunk: Sequence[Segment], done: int):
+        # Skips the segments written in full, then writes the rest of the one the kernel stopped in and those after it
+        index: int = 0
+        while done >= len(chunk[index]):
+            done -= len(chunk[index])
+            index += 1
+
+        self._write_all(memoryview(chunk[index])[done:])
+        remaining: Sequence[Segment] = chunk[index + 1:]
+        if remaining:
+            self.write(remaining)
+
+    def _write_all(self, data: Segment) -> int:
+        view: memoryview = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+        return len(data)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+generation: int = 0
+
+
+def invalidate_call_sites():
+    """
+    Makes every reporter forget its cached call site decisions. Called whenever a level or a level rule changes.
+    """
+    global generation  # pylint: disable=global-statement
+    generation += 1
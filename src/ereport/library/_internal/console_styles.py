@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import os
 from enum import Enum
+from typing import TYPE_CHECKING, Any, Mapping, TextIO, TypeAlias
+
+if TYPE_CHECKING:
+    from ereport.library.level import Level
 
 
 class Color4Bits(Enum):
@@ -68,7 +73,7 @@ class ConsoleCharacters:
         """
         :param n: An integer between 0 and 9. 0 is the default font.
         """
-        if 0 > n > 9:
+        if not 0 <= n <= 9:
             raise ValueError(f"n must be between 0 and 9. Actual: {n}")
         else:
             return f"\u001b[{n + 10}m"
@@ -126,10 +131,10 @@ class ConsoleCharacters:
 
     @staticmethod
     def set_foreground_8bits(value: int) -> str:
-        if 0 > value > 255:
+        if not 0 <= value <= 255:
             raise ValueError(f"Value must be between 0 and 255, not {value}")
         else:
-            return f"\u001b[38;5{value}m"
+            return f"\u001b[38;5;{value}m"
 
     @staticmethod
     def set_foreground_32bits(r: int, g: int, b: int) -> str:
@@ -149,10 +154,10 @@ class ConsoleCharacters:
 
     @staticmethod
     def set_background_8bits(value: int) -> str:
-        if 0 > value > 255:
+        if not 0 <= value <= 255:
             raise ValueError(f"Value must be between 0 and 255, not {value}")
         else:
-            return f"\u001b[48;5{value}"
+            return f"\u001b[48;5;{value}m"
 
     @staticmethod
     def set_background_32bits(r: int, g: int, b: int) -> str:
@@ -404,11 +409,62 @@ class ConsoleCharacters:
 
     @staticmethod
     def _validate_rgb(r: int, g: int, b: int):
-        if 0 > r > 255:
+        if not 0 <= r <= 255:
             raise ValueError(f'"r" must be between 0 and 255, not {r}')
-        if 0 > g > 255:
+        if not 0 <= g <= 255:
             raise ValueError(f'"g" must be between 0 and 255, not {g}')
-        if 0 > b > 255:
+        if not 0 <= b <= 255:
             raise ValueError(f'"b" must be between 0 and 255, not {b}')
 
 
+ColorSpec: TypeAlias = Color4Bits | int | tuple[int, int, int]
+
+
+def foreground(color: ColorSpec) -> str:
+    """
+    The escape code setting a foreground color: a :class:`Color4Bits`, an index of the 256 colors palette, or an
+    ``(r, g, b)`` tuple for truecolor terminals
+    """
+    if isinstance(color, Color4Bits):
+        return ConsoleCharacters.set_foreground_4bits(color)
+    if isinstance(color, int):
+        return ConsoleCharacters.set_foreground_8bits(color)
+
+    return ConsoleCharacters.set_foreground_32bits(*color)
+
+
+def color_enabled(stream: TextIO | None) -> bool:
+    """
+    Tells whether escape codes should be written to ``stream``: never when there is no stream (outlets writing to files
+    or sockets) or when the ``NO_COLOR`` environment variable is set, always when ``FORCE_COLOR`` is set, otherwise only
+    when it is a terminal
+    """
+    if stream is None or os.environ.get('NO_COLOR'):
+        return False
+    if os.environ.get('FORCE_COLOR'):
+        return True
+
+    isatty: Any = getattr(stream, 'isatty', None)
+    try:
+        return bool(isatty is not None and isatty())
+    except (ValueError, OSError):
+        return False
+
+
+class Palette:
+    """
+    The escape codes of a colored line, computed once: the per-level ``prefixes`` starting a line, ``emphasis`` before the
+    message and ``suffix`` ending the line. A disabled palette holds empty strings only.
+    """
+    __slots__ = (
+        'enabled',
+        'prefixes',
+        'emphasis',
+        'suffix'
+    )
+
+    def __init__(self, colors: Mapping[Level, ColorSpec], *, enabled: bool = True):
+        self.enabled: bool = enabled
+        self.prefixes: dict[Level, str] = {level: foreground(color) if enabled else '' for level, color in colors.items()}
+        self.emphasis: str = ConsoleCharacters.set_bold() if enabled else ''
+        self.suffix: str = ConsoleCharacters.reset() if enabled else ''
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from typing import Final
+
+from ereport.library.fork import register_fork_handlers
+
+COLUMN_WIDTH: Final[int] = 30
+BADGE_WIDTH: Final[int] = 8
+
+
+class NameTable:
+    """
+    Interns module, function and reporter names to small integer IDs.
+
+    Each name is stored once, along with the text the formatters print for it: truncated and padded to
+    :data:`COLUMN_WIDTH` for modules and functions, upper cased and centered on :data:`BADGE_WIDTH` for reporters.
+    IDs are never reused: names live as long as the process.
+    """
+    __slots__ = (
+        '_ids',
+        '_names',
+        '_columns',
+        '_badges',
+        '_lock',
+        '__weakref__'
+    )
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._columns: list[str] = []
+        self._badges: list[str] = []
+        self._lock: threading.Lock = threading.Lock()
+        register_fork_handlers(self)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        name_id: int | None = self._ids.get(name)
+        if name_id is not None:
+            return name_id
+
+        with self._lock:
+            name_id = self._ids.get(name)
+            if name_id is None:
+                self._names.append(name)
+                self._columns.append(f'{name[:COLUMN_WIDTH]:<{COLUMN_WIDTH}}')
+                self._badges.append(f'{name.upper():^{BADGE_WIDTH}}')
+                # Published last: readers never get an ID whose texts are not there yet
+                name_id = self._ids[name] = len(self._names) - 1
+
+        return name_id
+
+    def name(self, name_id: int) -> str:
+        return self._names[name_id]
+
+    def column(self, name_id: int) -> str:
+        """
+        The name truncated and left aligned to :data:`COLUMN_WIDTH` characters
+        """
+        return self._columns[name_id]
+
+    def badge(self, name_id: int) -> str:
+        """
+        The name upper cased and centered on :data:`BADGE_WIDTH` characters
+        """
+        return self._badges[name_id]
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+
+
+NAMES: Final[NameTable] = NameTable()
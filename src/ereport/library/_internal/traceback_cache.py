@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sys
+from traceback import extract_tb, format_exception_only, format_list
+from types import TracebackType
+from typing import Final, Type, TypeAlias
+
+ExcInfo: TypeAlias = tuple[Type[BaseException], BaseException, TracebackType | None] | str | None
+
+_CAUSE_SEPARATOR: Final[str] = '\nThe above exception was the direct cause of the following exception:\n\n'
+_CONTEXT_SEPARATOR: Final[str] = '\nDuring handling of the above exception, another exception occurred:\n\n'
+_MAX_CACHED_STACKS: Final[int] = 1024
+
+# Keyed by the ids of the exception type and of the code objects, with the instruction offsets, which unlike line numbers
+# are read without scanning the code. The value keeps those objects alive, so that their ids are not reused while cached.
+_STACK_CACHE: dict[tuple[int, ...], tuple[tuple, str]] = {}
+
+
+def capture_exc_info(exc_info: BaseException | tuple | bool | None) -> ExcInfo:
+    """
+    Normalizes what the caller passed as ``exc_info`` to a ``(type, value, traceback)`` tuple, without rendering anything.
+
+    :param exc_info: ``True`` to capture the exception being currently handled, an exception instance or an already built tuple
+    :return: The exception tuple, or None when there is nothing to capture
+    """
+    if not exc_info:
+        return None
+
+    if exc_info is True:
+        exc_info = sys.exc_info()
+        return exc_info if exc_info[0] is not None else None
+
+    if isinstance(exc_info, BaseException):
+        return type(exc_info), exc_info, exc_info.__traceback__
+
+    return exc_info
+
+
+def render_exc_info(exc_info: ExcInfo) -> str:
+    """
+    Renders an exception tuple the same way :func:`traceback.format_exception` would, minus the trailing new line.
+
+    The stack part of each exception is cached per (exception type, code location chain), so a failure repeating
+    at the same place is only walked and rendered once. Only the exception's message line is rendered on each call.
+
+    :param exc_info: The tuple captured by :func:`capture_exc_info`. Strings are considered already rendered.
+    """
+    if not exc_info:
+        return ''
+
+    if isinstance(exc_info, str):
+        return exc_info
+
+    exc_type, exc_value, traceback = exc_info
+    if exc_value is None:
+        return ''.join(format_exception_only(exc_type, None)).rstrip('\n')
+
+    parts: list[str] = []
+    _render_chain(exc_value, traceback, parts, set())
+    return ''.join(parts).rstrip('\n')
+
+
+def clear_traceback_cache():
+    _STACK_CACHE.clear()
+
+
+def _render_chain(exc_value: BaseException, traceback: TracebackType | None, parts: list[str], seen: set[int]):
+    seen.add(id(exc_value))
+
+    cause: BaseException | None = exc_value.__cause__
+    context: BaseException | None = exc_value.__context__
+    if cause is not None and id(cause) not in seen:
+        _render_chain(cause, cause.__traceback__, parts, seen)
+        parts.append(_CAUSE_SEPARATOR)
+    elif context is not None and not exc_value.__suppress_context__ and id(context) not in seen:
+        _render_chain(context, context.__traceback__, parts, seen)
+        parts.append(_CONTEXT_SEPARATOR)
+
+    if traceback is not None:
+        parts.append(_render_stack(type(exc_value), traceback))
+
+    parts.extend(format_exception_only(type(exc_value), exc_value))
+
+
+def _render_stack(exc_type: Type[BaseException], traceback: TracebackType) -> str:
+    locations: list[int] = [id(exc_type)]
+    current: TracebackType | None = traceback
+    while current is not None:
+        locations.append(id(current.tb_frame.f_code))
+        locations.append(current.tb_lasti)
+        current = current.tb_next
+
+    key: tuple[int, ...] = tuple(locations)
+    cached: tuple[tuple, str] | None = _STACK_CACHE.get(key)
+    if cached is not None:
+        return cached[1]
+
+    if len(_STACK_CACHE) >= _MAX_CACHED_STACKS:
+        _STACK_CACHE.clear()
+
+    referents: list = [exc_type]
+    current = traceback
+    while current is not None:
+        referents.append(current.tb_frame.f_code)
+        current = current.tb_next
+
+    rendered: str = 'Traceback (most recent call last):\n' + ''.join(format_list(extract_tb(traceback)))
+    _STACK_CACHE[key] = (tuple(referents), rendered)
+    return rendered
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable
+
+from ereport.library import clock
+from ereport.library.fork import register_fork_handlers
+
+
+class BatchingWorker:
+    """
+    Hands items submitted from any thread to a handler, in batches, on a daemon thread.
+
+    A batch is handed over every ``flush_interval`` seconds, or as soon as ``max_batch`` items are pending. When
+    ``max_pending`` items are already waiting, new items are dropped and counted instead of blocking the caller.
+    The thread is started on the first submission. Workers are closed at exit, waiting at most ``close_timeout`` seconds
+    for a handler that is stuck.
+    """
+    __slots__ = (
+        '_name',
+        '_handler',
+        '_on_interval',
+        '_max_batch',
+        '_flush_interval',
+        '_max_pending',
+        '_close_timeout',
+        '_pending',
+        '_wake',
+        '_drain_lock',
+        '_thread',
+        '_closing',
+        '_busy_since',
+        'dropped',
+        'errors',
+        '__weakref__'
+    )
+
+    def __init__(
+            self,
+            name: str,
+            handler: Callable[[list], Any],
+            *,
+            max_batch: int = 1000,
+            flush_interval: float = 1.0,
+            max_pending: int = 100_000,
+            on_interval: Callable[[], Any] | None = None,
+            close_timeout: float = 5.0
+    ):
+        """
+        :param name: Name of the thread
+        :param handler: Called on the worker thread with a list of at most ``max_batch`` items
+        :param max_batch: Maximum number of items per batch
+        :param flush_interval: Maximum number of seconds an item waits before being handed over
+        :param max_pending: Maximum number of items waiting to be handed over
+        :param on_interval: Called on the worker thread every ``flush_interval`` seconds, after the pending items were
+                            handed over, e.g. to retry what the handler could not do
+        :param close_timeout: Maximum number of seconds :meth:`close` waits for the thread to hand over a batch
+        """
+        self._name: str = name
+        self._handler: Callable[[list], Any] = handler
+        self._on_interval: Callable[[], Any] | None = on_interval
+        self._max_batch: int = max_batch
+        self._flush_interval: float = flush_interval
+        self._max_pending: int = max_pending
+        self._close_timeout: float = close_timeout
+        self._pending: deque = deque()
+        self._wake: threading.Event = threading.Event()
+        self._drain_lock: threading.Lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closing: bool = False
+        self._busy_since: float = 0.0
+        self.dropped: int = 0
+        self.errors: int = 0
+        register_fork_handlers(self)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def fill(self) -> float:
+        """
+        Fraction of ``max_pending`` in use
+        """
+        return len(self._pending) / self._max_pending
+
+    @property
+    def lag(self) -> float:
+        """
+        Seconds since the worker last had nothing pending, 0 when it has nothing pending
+        """
+        return clock.monotonic() - self._busy_since if self._pending else 0.0
+
+    def submit(self, item: Any) -> bool:
+        """
+        Queues an item. Never blocks.
+
+        :return: False when the item was dropped because too many items are pending or the worker is closed
+        """
+        if self._closing or len(self._pending) >= self._max_pending:
+            self.dropped += 1
+            return False
+
+        if not self._pending:
+            self._busy_since = clock.monotonic()
+        self._pending.append(item)
+        if self._thread is None:
+            self._start()
+        elif len(self._pending) >= self._max_batch:
+            self._wake.set()
+
+        return True
+
+    def submit_many(self, items: list) -> int:
+        """
+        Queues several items at once. Never blocks. Items beyond ``max_pending`` are dropped and counted.
+
+        :return: Number of items queued
+        """
+        if self._closing:
+            self.dropped += len(items)
+            return 0
+
+        room: int = self._max_pending - len(self._pending)
+        if room < len(items):
+            self.dropped += len(items) - max(room, 0)
+            items = items[:max(room, 0)]
+
+        if not self._pending:
+            self._busy_since = clock.monotonic()
+        self._pending.extend(items)
+        if self._thread is None:
+            self._start()
+        elif len(self._pending) >= self._max_batch:
+            self._wake.set()
+
+        return len(items)
+
+    def flush(self):
+        """
+        Hands every pending item to the handler, from the calling thread
+        """
+        self._drain()
+
+    def close(self):
+        """
+        Stops the thread after handing over every pending item. When the handler is stuck for more than
+        ``close_timeout`` seconds, returns without waiting for it, leaving the pending items to the thread.
+        """
+        if self._closing:
+            return
+
+        self._closing = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self._close_timeout)
+            if self._thread.is_alive():
+                print(
+                    f'Worker "{self._name}" is still handling a batch after {self._close_timeout:g}s, '
+                    f'leaving {len(self._pending)} pending item(s)',
+                    file=sys.stderr
+                )
+                return
+
+        self._drain()
+
+    def _at_exit(self):
+        self.close()
+
+    def _before_fork(self):
+        # Held during the fork: the handler is not halfway through a batch in the child
+        self._drain_lock.acquire()  # pylint: disable=consider-using-with
+        self._hand_over()
+
+    def _after_fork_in_parent(self):
+        self._drain_lock.release()
+
+    def _after_fork_in_child(self):
+        # Items still pending belong to the parent, which hands them over. The thread is started again on demand.
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread = None
+        self._busy_since = 0.0
+
+    def _start(self):
+        with self._drain_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._closing:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._on_interval is not None:
+                with self._drain_lock:
+                    try:
+                        self._on_interval()
+                    except Exception as error:  # pylint: disable=broad-except
+                        self.errors += 1
+                        print(f'Worker "{self._name}" failed its periodic task: {error!r}', file=sys.stderr)
+
+    def _drain(self):
+        with self._drain_lock:
+            self._hand_over()
+
+    def _hand_over(self):
+        pending: deque = self._pending
+        while pending:
+            batch: list = []
+            while pending and len(batch) < self._max_batch:
+                batch.append(pending.popleft())
+
+            try:
+                self._handler(batch)
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors += 1
+                print(f'Worker "{self._name}" could not handle a batch of {len(batch)} items: {error!r}', file=sys.stderr)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, Final, Iterator
+
+from frozendict import frozendict
+
+from ereport.library._internal.traceback_cache import render_exc_info
+from ereport.library.context import EMPTY_FIELDS
+from ereport.library.fork import child_path, discard_file
+from ereport.library.formatter import BaseFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.replay import iter_lines
+from ereport.library.report import Report
+
+TEMPLATE_RECORD: Final[str] = 'T'
+SITE_RECORD: Final[str] = 'S'
+REPORT_RECORD: Final[str] = 'R'
+MESSAGE_RECORD: Final[str] = 'M'
+
+_MAX_CACHED_FINGERPRINTS: Final[int] = 8192
+_FINGERPRINTS: dict[str, str] = {}
+_DATE_TIME_FORMAT: Final[str] = '%Y-%m-%d %H:%M:%S,%f'
+
+
+def fingerprint(template: str) -> str:
+    """
+    A stable identifier of a message template: the same in every process and every run
+    """
+    identifier: str | None = _FINGERPRINTS.get(template)
+    if identifier is None:
+        if len(_FINGERPRINTS) >= _MAX_CACHED_FINGERPRINTS:
+            _FINGERPRINTS.clear()
+
+        identifier = _FINGERPRINTS[template] = blake2b(template.encode('utf8'), digest_size=8).hexdigest()
+
+    return identifier
+
+
+class ReporterOutletCatalog(ReporterOutlet):
+    """
+    Writes reports compactly, as one JSON array per line.
+
+    Each message template (see :class:`Reporter`) is written once, under its :func:`fingerprint`, and so is each call
+    site (level, reporter, module, function, line and template). A report then only holds its call site number, date
+    and time, and arguments. Messages logged without ``args`` are written in full.
+
+    Arguments are written as JSON, those that are not JSON types as their ``str()``. Use :class:`CatalogReader` to read
+    the file back. Forked processes write to ``<file>.<pid>``.
+    """
+    __slots__ = (
+        '_path',
+        '_file',
+        '_templates',
+        '_sites',
+        '_lock'
+    )
+
+    def __init__(self, file: str, formatter: BaseFormatter = None, *, truncate: bool = True):
+        """
+        :param formatter: Unused, reports are written as records
+        :param truncate: Truncates the file when True, appends to it otherwise. Templates and call sites are written
+                         again in the latter case.
+        """
+        super().__init__(formatter)
+        self._path: str = file
+        self._file = open(file, 'w' if truncate else 'a', encoding='utf8', buffering=1)  # pylint: disable=consider-using-with
+        self._templates: set[str] = set()
+        self._sites: dict[tuple, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def emit(self, report: Report):
+        with self._lock:
+            self._file.write(self._record(report))
+
+    def emit_many(self, reports: list[Report]):
+        with self._lock:
+            self._file.write(''.join([self._record(report) for report in reports]))
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def _before_fork(self):
+        self._lock.acquire()  # pylint: disable=consider-using-with
+        self._file.flush()
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        # Call site numbers are only meaningful within one file: each forked process writes its own catalog
+        self._lock = threading.Lock()
+        discard_file(self._file)
+        self._file = open(child_path(self._path, force_suffix=True), 'w', encoding='utf8', buffering=1)  # pylint: disable=consider-using-with
+        self._templates = set()
+        self._sites = {}
+
+    def _record(self, report: Report) -> str:
+        extras: list[Any] = _extras(report)
+        if report.template is None:
+            return _dumps([
+                MESSAGE_RECORD, report.date_time, report.level.name, report.reporter_name, report.module, report.function,
+                report.line, report.message, *extras
+            ])
+
+        declarations: str = ''
+        identifier: str = fingerprint(report.template)
+        if identifier not in self._templates:
+            self._templates.add(identifier)
+            declarations = _dumps([TEMPLATE_RECORD, identifier, report.template])
+
+        key: tuple = (report.level.weight, report.reporter_id, report.module_id, report.function_id, report.line, identifier)
+        site: int | None = self._sites.get(key)
+        if site is None:
+            site = self._sites[key] = len(self._sites)
+            declarations += _dumps([
+                SITE_RECORD, site, identifier, report.level.name, report.reporter_name, report.module, report.function, report.line
+            ])
+
+        return declarations + _dumps([REPORT_RECORD, site, report.date_time, list(report.args), *extras])
+
+
+class TemplateStatistics:
+    """
+    How often a template was reported, see :meth:`CatalogReader.statistics`
+    """
+    __slots__ = (
+        'fingerprint',
+        'template',
+        'count',
+        'first',
+        'last'
+    )
+
+    def __init__(self, template_fingerprint: str, template: str, count: int, first: str, last: str):
+        self.fingerprint: str = template_fingerprint
+        self.template: str = template
+        self.count: int = count
+        self.first: str = first
+        self.last: str = last
+
+    @property
+    def rate(self) -> float:
+        """
+        Reports per second between the first and the last one
+        """
+        elapsed: float = (datetime.strptime(self.last, _DATE_TIME_FORMAT) - datetime.strptime(self.first, _DATE_TIME_FORMAT)).total_seconds()
+        return self.count / elapsed if elapsed > 0 else float(self.count)
+
+
+class CatalogReader:
+    """
+    Reads a file written by :class:`ReporterOutletCatalog`
+    """
+    __slots__ = (
+        '_path',
+    )
+
+    def __init__(self, path: str):
+        self._path: str = path
+
+    def reports(self) -> Iterator[Report]:
+        """
+        Yields the reports of the file. Their message is only rebuilt from its template when read.
+        """
+        templates: dict[str, str] = {}
+        sites: dict[int, tuple] = {}
+        for line in iter_lines(self._path):
+            if not line:
+                continue
+
+            record: list = json.loads(line)
+            kind: str = record[0]
+            if kind == REPORT_RECORD:
+                level, reporter_name, module, function, line_number, identifier = sites[record[1]]
+                yield Report(
+                    level=level,
+                    module=module,
+                    function=function,
+                    line=line_number,
+                    message=templates[identifier],
+                    reporter_name=reporter_name,
+                    date_time=record[2],
+                    exc_info=_exc_text(record, 4),
+                    fields=_fields(record, 4),
+                    args=tuple(record[3])
+                )
+            elif kind == MESSAGE_RECORD:
+                yield Report(
+                    level=Levels.parse_from_string(record[2]),
+                    module=record[4],
+                    function=record[5],
+                    line=record[6],
+                    message=record[7],
+                    reporter_name=record[3],
+                    date_time=record[1],
+                    exc_info=_exc_text(record, 8),
+                    fields=_fields(record, 8)
+                )
+            elif kind == TEMPLATE_RECORD:
+                templates[record[1]] = record[2]
+            elif kind == SITE_RECORD:
+                sites[record[1]] = (Levels.parse_from_string(record[3]), record[4], record[5], record[6], record[7], record[2])
+
+    def statistics(self) -> list[TemplateStatistics]:
+        """
+        Counts the reports of each template, most reported first. Report records are not decoded.
+        """
+        templates: dict[str, str] = {}
+        site_templates: dict[int, str] = {}
+        statistics: dict[str, TemplateStatistics] = {}
+        for line in iter_lines(self._path):
+            if line.startswith(b'["R",'):
+                site_end: int = line.index(b',', 5)
+                identifier: str = site_templates[int(line[5:site_end])]
+                entry: TemplateStatistics | None = statistics.get(identifier)
+                date_time_text: str = line[site_end + 2:site_end + 28].decode('ascii')
+                if entry is None:
+                    statistics[identifier] = TemplateStatistics(identifier, templates[identifier], 1, date_time_text, date_time_text)
+                else:
+                    entry.count += 1
+                    entry.last = date_time_text
+            elif line.startswith(b'["T",'):
+                record: list = json.loads(line)
+                templates[record[1]] = record[2]
+            elif line.startswith(b'["S",'):
+                record = json.loads(line)
+                site_templates[record[1]] = record[2]
+
+        return sorted(statistics.values(), key=lambda entry: entry.count, reverse=True)
+
+
+def _dumps(record: list) -> str:
+    return f'{json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)}\n'
+
+
+def _extras(report: Report) -> list[Any]:
+    if report.exc_info:
+        return [dict(report.fields), render_exc_info(report.exc_info)]
+    if report.fields:
+        return [dict(report.fields)]
+
+    return []
+
+
+def _fields(record: list, index: int) -> frozendict:
+    return frozendict(record[index]) if len(record) > index and record[index] else EMPTY_FIELDS
+
+
+def _exc_text(record: list, index: int) -> str | None:
+    return record[index + 1] if len(record) > index + 1 else None
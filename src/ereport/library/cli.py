@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Callable, Iterable, Iterator, Mapping, TextIO
+
+from ereport.library.catalog import CatalogReader
+from ereport.library.config import ConfigurationError, apply_config, load_config
+from ereport.library.formatter import FORMATTERS, BaseFormatter, DictFormatter
+from ereport.library.level import Level, Levels
+from ereport.library.loadgen import TrafficMix, parse_levels, run_load
+from ereport.library.replay import follow_lines, iter_lines, make_filter, parse_reports
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Entry point of the ``ereport`` command
+    """
+    parser: argparse.ArgumentParser = _make_parser()
+    options: argparse.Namespace = parser.parse_args(arguments)
+    try:
+        return options.command(options)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        sys.stderr.close()
+        return 0
+
+
+def _make_parser() -> argparse.ArgumentParser:
+    filters: argparse.ArgumentParser = argparse.ArgumentParser(add_help=False)
+    filters.add_argument('--level', type=_parse_level, help='Minimum level of the reports to show')
+    filters.add_argument('--reporter', action='append', dest='reporters', help='Reporter name. Can be repeated.')
+    filters.add_argument('--module', action='append', dest='modules', help='Module name, wildcards accepted. Can be repeated.')
+    filters.add_argument('--since', help='Show reports made at or after this date and time, e.g. "2023-06-01 13:30"')
+    filters.add_argument('--until', help='Show reports made before this date and time')
+    filters.add_argument('--grep', dest='pattern', help='Regular expression searched in the messages')
+    filters.add_argument('--format', choices=sorted(FORMATTERS), default='default', help='Formatter used to render the reports')
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='ereport',
+        description='Reads files written by ereport outlets and measures outlet configurations'
+    )
+    commands = parser.add_subparsers(required=True, metavar='command')
+
+    read: argparse.ArgumentParser = commands.add_parser('read', parents=[filters], help='Reads and filters files')
+    read.add_argument('files', nargs='+', help='Files to read. ".gz" and ".zst" files are decompressed, ".catalog" files are expanded.')
+    read.set_defaults(command=_read)
+
+    tail: argparse.ArgumentParser = commands.add_parser('tail', parents=[filters], help='Follows a file as it is written')
+    tail.add_argument('file', help='File to follow')
+    tail.add_argument('--from-start', action='store_true', help='Reads the whole file before following it')
+    tail.set_defaults(command=_tail)
+
+    templates: argparse.ArgumentParser = commands.add_parser('templates', help='Lists the most reported templates of a catalog file')
+    templates.add_argument('file', help='File written by the catalog outlet')
+    templates.add_argument('--top', type=int, default=20, help='Number of templates to list')
+    templates.set_defaults(command=_templates)
+
+    load: argparse.ArgumentParser = commands.add_parser('load', help='Logs generated traffic through a configuration and measures it')
+    load.add_argument('config', help='Configuration file (TOML or JSON) defining the reporter and its outlets')
+    load.add_argument('--reporter', default='MAIN', help='Name of the reporter to log with')
+    load.add_argument('--levels', type=_parse_level_weights, default=None, help='Level weights, e.g. "info=8,debug=1,warn=1"')
+    load.add_argument('--sizes', type=_parse_sizes, default=(80,), help='Message sizes in characters, e.g. "80,400"')
+    load.add_argument('--threads', type=int, default=1, help='Number of threads logging at the same time')
+    load.add_argument('--reports', type=int, default=100_000, help='Total number of reports')
+    load.add_argument('--burst', type=int, default=0, help='Reports each thread logs back to back before pausing')
+    load.add_argument('--pause', type=float, default=0.0, help='Seconds a thread pauses after each burst')
+    load.add_argument('--seed', type=int, default=0, help='Seed of the random choices')
+    load.set_defaults(command=_load)
+
+    return parser
+
+
+def _parse_level(value: str) -> Level:
+    try:
+        return Levels.parse_from_string(value)
+    except KeyError as error:
+        raise argparse.ArgumentTypeError(f'unknown level "{value}"') from error
+
+
+def _parse_level_weights(value: str) -> dict[Level, int]:
+    try:
+        return parse_levels(value)
+    except (KeyError, ValueError) as error:
+        raise argparse.ArgumentTypeError(f'invalid level weights "{value}"') from error
+
+
+def _parse_sizes(value: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(size) for size in value.split(','))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f'invalid message sizes "{value}"') from error
+
+
+def _read(options: argparse.Namespace) -> int:
+    for file in options.files:
+        if file.endswith('.catalog'):
+            _render(CatalogReader(file).reports(), options)
+        else:
+            _render(parse_reports(iter_lines(file), options.level), options)
+
+    return 0
+
+
+def _tail(options: argparse.Namespace) -> int:
+    _render(parse_reports(follow_lines(options.file, from_start=options.from_start), options.level), options, batch_size=1)
+    return 0
+
+
+def _templates(options: argparse.Namespace) -> int:
+    output: TextIO = sys.stdout
+    output.write(f'{"count":>10} {"per second":>10}  {"fingerprint":<16}  template\n')
+    for entry in CatalogReader(options.file).statistics()[:options.top]:
+        output.write(f'{entry.count:>10} {entry.rate:>10.2f}  {entry.fingerprint:<16}  {entry.template}\n')
+
+    return 0
+
+
+def _load(options: argparse.Namespace) -> int:
+    try:
+        apply_config(load_config(options.config))
+    except ConfigurationError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    try:
+        mix: TrafficMix = TrafficMix(
+            message_sizes=options.sizes,
+            threads=options.threads,
+            reports=options.reports,
+            burst=options.burst,
+            pause=options.pause,
+            seed=options.seed,
+            **({'levels': options.levels} if options.levels else {})
+        )
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    reporter: Reporter = Reporter.get_or_make(options.reporter)
+    print(run_load(reporter, mix).summary())
+    for outlet in reporter.get_all_outlets():
+        outlet.close()
+
+    return 0
+
+
+def _render(reports: Iterable[Report], options: argparse.Namespace, *, batch_size: int = 1024):
+    keep: Callable[[Report], bool] = make_filter(
+        level=options.level,
+        reporters=options.reporters,
+        modules=options.modules,
+        since=options.since,
+        until=options.until,
+        pattern=options.pattern
+    )
+    formatter: BaseFormatter = FORMATTERS[options.format]()
+    # Dictionaries are written as JSON documents, one per line, rather than as their Python representation
+    to_json: bool = isinstance(formatter, DictFormatter)
+    output: TextIO = sys.stdout
+    for batch in _batches((report for report in reports if keep(report)), batch_size):
+        lines: list = formatter.format_many(batch)
+        if to_json:
+            lines = [json.dumps(line, ensure_ascii=False, default=_json_value) for line in lines]
+        output.write(''.join([f'{line}\n' for line in lines]))
+        output.flush()
+
+
+def _json_value(value: Any) -> Any:
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def _batches(reports: Iterator[Report], size: int) -> Iterator[list[Report]]:
+    batch: list[Report] = []
+    for report in reports:
+        batch.append(report)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time as _time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+
+class Clock(ABC):
+    """
+    Where reports, formatters and outlets read the time from. See :func:`set_clock`.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def time(self) -> float:
+        """
+        Seconds since the epoch, like :func:`time.time`
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """
+        Seconds that never go backwards, like :func:`time.monotonic`. Only differences between two values are meaningful.
+        """
+        raise NotImplementedError()
+
+    def now(self) -> datetime:
+        """
+        The local date and time, like :meth:`datetime.now`
+        """
+        return datetime.fromtimestamp(self.time())
+
+
+class SystemClock(Clock):
+    """
+    The time of the system. This is the default clock.
+    """
+    __slots__ = ()
+
+    time = staticmethod(_time.time)
+    monotonic = staticmethod(_time.monotonic)
+    now = staticmethod(datetime.now)
+
+
+class ManualClock(Clock):
+    """
+    A clock that only moves when told to, making time dependent behaviors reproducible.
+
+    Background threads still wait in real time: a flush interval, for instance, is not shortened by :meth:`advance`,
+    but the intervals and durations they compute come from this clock.
+    """
+    __slots__ = (
+        '_time',
+        '_monotonic',
+        '_lock'
+    )
+
+    def __init__(self, start: float | datetime = 0.0):
+        """
+        :param start: Initial time, as seconds since the epoch or as a local date and time
+        """
+        self._time: float = start.timestamp() if isinstance(start, datetime) else start
+        self._monotonic: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._time
+
+    def monotonic(self) -> float:
+        return self._monotonic
+
+    def advance(self, seconds: float):
+        """
+        Moves both the time and the monotonic time forward
+        """
+        if seconds < 0:
+            raise ValueError(f'A clock cannot go backwards, got {seconds} seconds')
+
+        with self._lock:
+            self._time += seconds
+            self._monotonic += seconds
+
+    def set(self, when: float | datetime):
+        """
+        Sets the time, forward or backward, like a system clock adjustment. The monotonic time only moves forward.
+        """
+        timestamp: float = when.timestamp() if isinstance(when, datetime) else when
+        with self._lock:
+            self._monotonic += max(timestamp - self._time, 0.0)
+            self._time = timestamp
+
+
+_CLOCK: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    return _CLOCK
+
+
+def set_clock(clock: Clock | None) -> Clock:
+    """
+    Replaces the clock used by the whole library
+
+    :param clock: The new clock, or None to go back to the :class:`SystemClock`
+    :return: The previous clock
+    """
+    global _CLOCK  # pylint: disable=global-statement
+    previous: Clock = _CLOCK
+    _CLOCK = clock if clock is not None else SystemClock()
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """
+    Uses ``clock`` within a ``with`` block, then restores the previous one
+    """
+    previous: Clock = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def now() -> datetime:
+    return _CLOCK.now()
+
+
+def time() -> float:
+    return _CLOCK.time()
+
+
+def monotonic() -> float:
+    return _CLOCK.monotonic()
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import signal
+import sys
+import threading
+from typing import Any, Final, Mapping
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python 3.10
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from frozendict import frozendict
+
+from ereport.library.fork import register_fork_handlers
+from ereport.library.formatter import FORMATTERS, BaseFormatter
+from ereport.library.level import Level, LevelRule, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.outlet_limited import ReporterOutletLimited
+from ereport.library.reporter import Reporter
+
+OUTLETS: Final[frozendict[str, str]] = frozendict({
+    'stdout': 'ereport.library.outlet:ReporterOutletStdOut',
+    'file': 'ereport.library.outlet:ReporterOutletFile',
+    'append_file': 'ereport.library.outlet_append:ReporterOutletAppendFile',
+    'catalog': 'ereport.library.catalog:ReporterOutletCatalog',
+    'compressed_file': 'ereport.library.outlet_compressed:ReporterOutletCompressedFile',
+    'partitioned_file': 'ereport.library.outlet_partitioned:ReporterOutletPartitionedFile',
+    'udp': 'ereport.library.outlet_network:ReporterOutletUDP',
+    'tcp': 'ereport.library.outlet_network:ReporterOutletTCP',
+    'syslog_udp': 'ereport.library.outlet_network:ReporterOutletSyslogUDP',
+    'syslog_tcp': 'ereport.library.outlet_network:ReporterOutletSyslogTCP',
+    'http': 'ereport.library.outlet_http:ReporterOutletHTTP',
+    'metrics': 'ereport.library.outlet_metrics:ReporterOutletMetrics',
+    'logging': 'ereport.library.logging_bridge:ReporterOutletLogging'
+})
+
+# Outlets truncating their file unless told otherwise
+_TRUNCATING_TYPES: Final[frozenset[str]] = frozenset({'file', 'append_file', 'catalog', 'compressed_file'})
+_RETIRE_DELAY: Final[float] = 2.0
+
+_CONFIG_LOCK: threading.Lock = threading.Lock()
+_ACTIVE_OUTLETS: dict[tuple[str, str], ReporterOutlet] = {}
+
+
+class ConfigurationError(ValueError):
+    """
+    Raised when a configuration cannot be loaded or applied. The running configuration is then left untouched.
+    """
+
+
+def load_config(path: str) -> dict[str, Any]:
+    """
+    Reads a TOML (``.toml``) or JSON configuration file. Its layout is::
+
+        [reporters.MAIN]
+        level = "info"
+        outlets = ["console", "app_file"]
+        rules = [{ module = "db_*", level = "debug" }]
+
+        [outlets.console]
+        type = "stdout"
+        formatter = "colored"
+
+        [outlets.app_file]
+        type = "file"
+        file = "app.log"
+        truncate = false
+        formatter = { type = "json" }
+
+    Rules override the reporter's level for some modules and/or functions, see :class:`LevelRule`. File outlets
+    rebuilt by a reload, because their definition changed, append to the file they were writing unless ``truncate`` is
+    set. An outlet's
+    ``max_message_size`` and ``spill_directory`` keys wrap it in a :class:`ReporterOutletLimited`: ``spill_directory``
+    requires ``max_message_size``, a :class:`ConfigurationError` is raised otherwise. Its other keys but ``type`` and
+    ``formatter`` are given to its constructor. See :data:`OUTLETS` and :data:`ereport.library.formatter.FORMATTERS` for
+    the available types.
+    """
+    try:
+        if path.endswith('.toml'):
+            if tomllib is None:
+                raise ConfigurationError('Reading TOML files requires Python 3.11 or the "tomli" package')
+
+            with open(path, 'rb') as file:
+                return tomllib.load(file)
+
+        with open(path, 'r', encoding='utf8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as error:
+        if isinstance(error, ConfigurationError):
+            raise
+        raise ConfigurationError(f'Could not read configuration "{path}": {error}') from error
+
+
+def apply_config(config: Mapping[str, Any]):
+    """
+    Applies a configuration to the running reporters, creating the missing ones.
+
+    Everything is built before anything is changed: each reporter then gets its new level, rules and outlets together,
+    see :meth:`Reporter.configure`, without pausing logging. Outlets whose definition did not change are kept as is
+    (files are not reopened). Outlets no reporter uses anymore, e.g. not those of the reporters left out of the
+    configuration, are closed a couple of seconds later, once the reports being logged to them were written.
+    """
+    with _CONFIG_LOCK:
+        outlet_specs: Mapping[str, Any] = config.get('outlets', {})
+        outlets: dict[tuple[str, str], ReporterOutlet] = {}
+        plans: list[tuple[str, Level | None, list[ReporterOutlet] | None, list[LevelRule] | None]] = []
+        try:
+            for name, reporter_spec in config.get('reporters', {}).items():
+                level: Level | None = _parse_level(reporter_spec['level']) if 'level' in reporter_spec else None
+                reporter_outlets: list[ReporterOutlet] | None = None
+                if 'outlets' in reporter_spec:
+                    reporter_outlets = [_get_outlet(outlet_name, outlet_specs, outlets) for outlet_name in reporter_spec['outlets']]
+                rules: list[LevelRule] | None = None
+                if 'rules' in reporter_spec:
+                    rules = [
+                        LevelRule(_parse_level(rule['level']), rule.get('module'), rule.get('function')) for rule in reporter_spec['rules']
+                    ]
+                plans.append((name, level, reporter_outlets, rules))
+        except Exception:
+            for key, outlet in outlets.items():
+                if _ACTIVE_OUTLETS.get(key) is not outlet:
+                    outlet.close()
+            raise
+
+        for name, level, reporter_outlets, rules in plans:
+            Reporter.get_or_make(name, default_level=level or Levels.INFO).configure(level, rules, reporter_outlets)
+
+        in_use: set[int] = _outlets_in_use()
+        retired: list[ReporterOutlet] = []
+        for key, outlet in _ACTIVE_OUTLETS.items():
+            if outlets.get(key) is outlet:
+                continue
+            if id(outlet) in in_use:
+                # Still used by a reporter this configuration left as is: kept, and reused if defined again
+                outlets.setdefault(key, outlet)
+            else:
+                retired.append(outlet)
+        _ACTIVE_OUTLETS.clear()
+        _ACTIVE_OUTLETS.update(outlets)
+        if retired:
+            _retire(retired)
+
+
+class ConfigWatcher:
+    """
+    Reloads a configuration file when it changes, or when a signal (e.g. ``SIGHUP``) is received.
+
+    The file is checked every ``interval`` seconds from a daemon thread. A configuration that cannot be loaded or
+    applied is reported on stderr and the running one is kept.
+    """
+    __slots__ = (
+        '_path',
+        '_interval',
+        '_signature',
+        '_reload',
+        '_stop',
+        '_thread',
+        '__weakref__'
+    )
+
+    def __init__(self, path: str, *, interval: float = 1.0, reload_signal: int | None = None, apply_now: bool = True):
+        """
+        :param path: The configuration file
+        :param interval: Seconds between two checks of the file
+        :param reload_signal: A signal number triggering a reload. Must be set up from the main thread.
+        :param apply_now: Applies the configuration before returning. Errors are then raised.
+        """
+        self._path: str = path
+        self._interval: float = interval
+        self._signature: tuple[int, int] | None = None
+        self._reload: threading.Event = threading.Event()
+        self._stop: threading.Event = threading.Event()
+        if apply_now:
+            self._signature = self._file_signature()
+            apply_config(load_config(path))
+
+        if reload_signal is not None:
+            signal.signal(reload_signal, lambda signum, frame: self._reload.set())
+
+        self._thread: threading.Thread = threading.Thread(target=self._run, name='ereport-config-watcher', daemon=True)
+        self._thread.start()
+        register_fork_handlers(self)
+
+    def reload(self):
+        """
+        Requests a reload, whether the file changed or not
+        """
+        self._reload.set()
+
+    def stop(self):
+        self._stop.set()
+        self._reload.set()
+        self._thread.join()
+
+    def _after_fork_in_child(self):
+        global _CONFIG_LOCK  # pylint: disable=global-statement
+        _CONFIG_LOCK = threading.Lock()
+        self._reload = threading.Event()
+        if not self._stop.is_set():
+            self._thread = threading.Thread(target=self._run, name='ereport-config-watcher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            forced: bool = self._reload.wait(self._interval)
+            self._reload.clear()
+            if self._stop.is_set():
+                return
+
+            signature: tuple[int, int] | None = self._file_signature()
+            if not forced and signature == self._signature:
+                continue
+
+            self._signature = signature
+            try:
+                apply_config(load_config(self._path))
+            except Exception as error:  # pylint: disable=broad-except
+                print(f'Could not reload configuration "{self._path}": {error!r}', file=sys.stderr)
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            status: os.stat_result = os.stat(self._path)
+        except OSError:
+            return None
+
+        return status.st_mtime_ns, status.st_size
+
+
+def _outlets_in_use() -> set[int]:
+    """
+    Identifiers of the outlets of every reporter, including the outlets wrapped by others
+    """
+    in_use: set[int] = set()
+    reporters: list[Reporter] = list(Reporter._instances.values())  # pylint: disable=protected-access
+    while reporters:
+        reporter: Reporter = reporters.pop()
+        reporters.extend(reporter._children)  # pylint: disable=protected-access
+        outlets: list[ReporterOutlet] = list(reporter.get_all_outlets())
+        while outlets:
+            outlet: ReporterOutlet = outlets.pop()
+            if id(outlet) not in in_use:
+                in_use.add(id(outlet))
+                outlets.extend(getattr(outlet, 'outlets', ()))
+
+    return in_use
+
+
+def _retire(outlets: list[ReporterOutlet]):
+    """
+    Closes outlets no reporter uses anymore. Threads may still be in the middle of logging to them: they are given
+    :data:`_RETIRE_DELAY` seconds to finish first.
+    """
+    def close():
+        for outlet in outlets:
+            try:
+                outlet.close()
+            except Exception as error:  # pylint: disable=broad-except
+                print(f'Could not close outlet {type(outlet).__name__}: {error!r}', file=sys.stderr)
+
+    timer: threading.Timer = threading.Timer(_RETIRE_DELAY, close)
+    timer.name = 'ereport-outlet-retirement'
+    timer.daemon = True
+    timer.start()
+
+
+def _get_outlet(name: str, outlet_specs: Mapping[str, Any], built: dict[tuple[str, str], ReporterOutlet]) -> ReporterOutlet:
+    if name not in outlet_specs:
+        raise ConfigurationError(f'Unknown outlet "{name}"')
+
+    spec: Mapping[str, Any] = outlet_specs[name]
+    key: tuple[str, str] = (name, json.dumps(spec, sort_keys=True, default=str))
+    outlet: ReporterOutlet | None = built.get(key) or _ACTIVE_OUTLETS.get(key)
+    if outlet is None:
+        outlet = _make_outlet(name, spec, reopened=_is_written(name, spec))
+
+    built[key] = outlet
+    return outlet
+
+
+def _is_written(name: str, spec: Mapping[str, Any]) -> bool:
+    """
+    Tells whether the running configuration already has an outlet of this name, or writing to the file of ``spec``
+    """
+    file: Any = spec.get('file')
+    return any(key[0] == name or (file is not None and json.loads(key[1]).get('file') == file) for key in _ACTIVE_OUTLETS)
+
+
+def _make_outlet(name: str, spec: Mapping[str, Any], *, reopened: bool = False) -> ReporterOutlet:
+    """
+    :param reopened: The outlet's file is being written by the running configuration: it is not truncated by default
+    """
+    arguments: dict[str, Any] = dict(spec)
+    outlet_type: str = arguments.pop('type', '')
+    if outlet_type not in OUTLETS:
+        raise ConfigurationError(f'Outlet "{name}" has an unknown type "{outlet_type}". Expected one of: {", ".join(OUTLETS)}')
+
+    if reopened and outlet_type in _TRUNCATING_TYPES:
+        arguments.setdefault('truncate', False)
+
+    if 'formatter' in arguments:
+        arguments['formatter'] = _make_formatter(arguments['formatter'])
+
+    max_message_size: int | None = arguments.pop('max_message_size', None)
+    spill_directory: str | None = arguments.pop('spill_directory', None)
+    if spill_directory is not None and max_message_size is None:
+        raise ConfigurationError(f'Outlet "{name}" has a "spill_directory" but no "max_message_size" to spill messages from')
+
+    module_name, class_name = OUTLETS[outlet_type].split(':')
+    outlet_class: type[ReporterOutlet] = getattr(importlib.import_module(module_name), class_name)
+    try:
+        outlet: ReporterOutlet = outlet_class(**arguments)
+        if max_message_size is not None:
+            outlet = ReporterOutletLimited(outlet, max_message_size, spill_directory=spill_directory)
+        return outlet
+    except (TypeError, ValueError, OSError) as error:
+        raise ConfigurationError(f'Could not make outlet "{name}": {error}') from error
+
+
+def _make_formatter(spec: str | Mapping[str, Any]) -> BaseFormatter:
+    arguments: dict[str, Any] = {'type': spec} if isinstance(spec, str) else dict(spec)
+    formatter_type: str = arguments.pop('type', '')
+    if formatter_type not in FORMATTERS:
+        raise ConfigurationError(f'Unknown formatter type "{formatter_type}". Expected one of: {", ".join(FORMATTERS)}')
+
+    try:
+        if formatter_type == 'dict':
+            return FORMATTERS[formatter_type](*arguments.pop('attributes', ()))
+
+        return FORMATTERS[formatter_type](**arguments)
+    except (TypeError, ValueError) as error:
+        raise ConfigurationError(f'Could not make formatter "{formatter_type}": {error}') from error
+
+
+def _parse_level(level: str) -> Level:
+    try:
+        return Levels.parse_from_string(level)
+    except KeyError as error:
+        raise ConfigurationError(f'Unknown level "{level}"') from error
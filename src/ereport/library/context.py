@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token, copy_context
+from functools import wraps
+from typing import Any, Callable, Final, Iterator, Mapping
+
+from frozendict import frozendict
+
+EMPTY_FIELDS: Final[frozendict] = frozendict()
+
+_CONTEXT_FIELDS: ContextVar[frozendict] = ContextVar('ereport_context_fields', default=EMPTY_FIELDS)
+
+
+def get_context() -> frozendict:
+    """
+    Returns the fields bound to the current context (thread or asyncio task)
+    """
+    return _CONTEXT_FIELDS.get()
+
+
+def bind_context(**fields: Any) -> Token:
+    """
+    Adds fields to the current context. Every report made from this context, whatever the reporter, will carry them.
+
+    asyncio tasks inherit the context they were created from. Threads start with an empty context: use
+    :func:`with_current_context` to hand the caller's context to a thread.
+
+    :return: A token to give to :func:`reset_context` to restore the previous fields
+    """
+    return _CONTEXT_FIELDS.set(merge_fields(_CONTEXT_FIELDS.get(), frozendict(fields)))
+
+
+def reset_context(token: Token):
+    _CONTEXT_FIELDS.reset(token)
+
+
+@contextmanager
+def context(**fields: Any) -> Iterator[frozendict]:
+    """
+    Binds fields to the current context for the duration of the ``with`` block
+    """
+    token: Token = bind_context(**fields)
+    try:
+        yield _CONTEXT_FIELDS.get()
+    finally:
+        _CONTEXT_FIELDS.reset(token)
+
+
+def with_current_context(function: Callable) -> Callable:
+    """
+    Wraps a callable so it runs within a copy of the caller's context, e.g. when submitted to a thread or an executor
+    """
+    captured = copy_context()
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        return captured.copy().run(function, *args, **kwargs)
+
+    return wrapper
+
+
+def merge_fields(base: frozendict, override: Mapping) -> frozendict:
+    """
+    Merges two field mappings. When one of them is empty, the other one is returned as is, no copy is made.
+    """
+    if not override:
+        return base
+    if not base:
+        return override if isinstance(override, frozendict) else frozendict(override)
+
+    return base | override
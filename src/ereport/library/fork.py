@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+from itertools import count
+from typing import Any, Iterator
+from weakref import WeakValueDictionary
+
+# Ordered by registration: objects wrapping others are registered after them
+_FORK_AWARE: WeakValueDictionary[int, Any] = WeakValueDictionary()
+_REGISTRATIONS: Iterator[int] = count()
+_pid_suffix: bool = False
+_forked: bool = False
+
+
+def register_fork_handlers(instance: Any):
+    """
+    Makes an object take part in forks. Like the callables of :func:`os.register_at_fork`, its ``_before_fork()``
+    method is called before each :func:`os.fork` (the last registered object first), and its ``_after_fork_in_parent()``
+    and ``_after_fork_in_child()`` methods right after (the first registered object first). Missing methods are skipped.
+
+    Objects flush their buffers and take the locks guarding them before the fork, so that no other thread is halfway
+    through a write, and release them in the parent. In the child, they replace their locks, queues and threads, forget
+    what the parent still has to write, and reopen their files.
+
+    At exit, their ``_at_exit()`` method is called, the last registered object first: an outlet wrapping others is
+    created, and registered, after them, so it hands them what it buffered before they are closed.
+    """
+    _FORK_AWARE[next(_REGISTRATIONS)] = instance
+
+
+def use_pid_suffix(enabled: bool = True):
+    """
+    Makes the file outlets of forked processes write to ``<file>.<pid>`` instead of appending to their parent's file
+    """
+    global _pid_suffix  # pylint: disable=global-statement
+    _pid_suffix = enabled
+
+
+def child_path(path: str, *, force_suffix: bool = False) -> str:
+    """
+    The path a process writes to instead of ``path``: ``<path>.<pid>`` in forked processes when asked to, ``path``
+    otherwise
+    """
+    return f'{path}.{os.getpid()}' if _forked and (_pid_suffix or force_suffix) else path
+
+
+def discard_file(file: Any):
+    """
+    Closes a file inherited from the parent process without writing what it buffered, which the parent writes itself.
+    The file must not have been in use by another thread during the fork.
+    """
+    try:
+        os.close(file.fileno())
+    except (OSError, ValueError):
+        return
+
+    try:
+        file.close()
+    except OSError:
+        pass
+
+
+def _after_fork_in_child():
+    global _forked  # pylint: disable=global-statement
+    _forked = True
+    _call('_after_fork_in_child')
+
+
+def _call(method_name: str, reverse: bool = False):
+    instances: list[Any] = list(_FORK_AWARE.values())
+    for instance in reversed(instances) if reverse else instances:
+        method = getattr(instance, method_name, None)
+        if method is None:
+            continue
+
+        try:
+            method()
+        except Exception as error:  # pylint: disable=broad-except
+            print(f'{type(instance).__name__}.{method_name} failed: {error!r}', file=sys.stderr)
+
+
+@atexit.register
+def _at_exit():
+    _call('_at_exit', reverse=True)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(
+        before=lambda: _call('_before_fork', reverse=True),
+        after_in_parent=lambda: _call('_after_fork_in_parent'),
+        after_in_child=_after_fork_in_child
+    )
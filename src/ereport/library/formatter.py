@@ -1,11 +1,16 @@
+import json
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Final
+from typing import Any, Final, Iterable, Mapping, TextIO
 
 from edata.sun import Sun
 from frozendict import frozendict
 
-from ereport.library._internal.console_styles import Color4Bits, ConsoleCharacters
+from ereport.library import clock
+from ereport.library._internal.console_styles import Color4Bits, ColorSpec, Palette, color_enabled
+from ereport.library._internal.names import NAMES
+from ereport.library._internal.traceback_cache import render_exc_info
 from ereport.library.level import Level, Levels
 from ereport.library.report import Report
 
@@ -23,29 +28,56 @@ class BaseFormatter(ABC):
         """
         raise NotImplementedError()
 
+    def format_many(self, reports: Iterable[Report]) -> list[Any]:
+        """
+        Formats several reports at once. Formatters able to share work between reports may override it.
+        """
+        format_report = self.format
+        return [format_report(report) for report in reports]
+
+    def set_stream(self, stream: TextIO | None):
+        """
+        Called by outlets with the standard stream they write the formatted reports to, None when they write elsewhere
+        (files, sockets...). Formatters whose output depends on it, e.g. on whether it is a terminal, may override it.
+        """
+
 
 class DefaultFormatter(BaseFormatter):
     """
     Default formatter
+
+    Bound fields are rendered as ``{key=value, ...}`` after the message. When the report carries an exception,
+    its traceback is rendered on the lines following the message.
     """
 
     def format(self, report: Report) -> str:
-        effective_module: str = report.module[:30]
-        effective_function: str = report.function[:30]
-
         return f'[{report.date_time}] ' \
                f'[{str(report.level):^7}] ' \
-               f'[{report.reporter_name.upper():^8}] ' \
-               f'[({report.line:0>4}) {effective_module:<30}::{effective_function:<30}] ' \
-               f'{report.message}'
+               f'[{NAMES.badge(report.reporter_id)}] ' \
+               f'[({report.line:0>4}) {NAMES.column(report.module_id)}::{NAMES.column(report.function_id)}] ' \
+               f'{report.message}' \
+               f'{_fields_suffix(report)}' \
+               f'{_traceback_suffix(report)}'
 
 
 class ColoredFormatter(BaseFormatter):
     """
     A colored formatter.
 
-    Each level has its own color.
+    Each level has its own color, taken from ``theme``: one of :data:`THEMES` or a mapping of levels to colors. The
+    escape codes of each level are computed once, when the formatter is made.
+
+    Colors are only written when ``enabled`` is True. By default, they are written when the stream of the outlets using
+    the formatter is a terminal, see :func:`color_enabled`: never by outlets writing to files or sockets. Without colors,
+    the same line is written without any escape code.
     """
+    __slots__ = (
+        '_colors',
+        '_enabled',
+        '_stream_set',
+        '_palette'
+    )
+
     COLORS: Final[frozendict[Level, Color4Bits]] = frozendict({
         Levels.TRACE: Color4Bits.GRAY,
         Levels.DEBUG: Color4Bits.BLACK,
@@ -57,23 +89,50 @@ class ColoredFormatter(BaseFormatter):
         Levels.FATAL: Color4Bits.PURPLE
     })
 
-    def format(self, report: Report) -> str:
-        return ColoredFormatter.get_report_string(report, ColoredFormatter.COLORS)
+    def __init__(self, theme: str | Mapping[Level, ColorSpec] = 'default', *, enabled: bool | None = None):
+        """
+        :param enabled: Whether to write colors. When None, decided by the outlets using the formatter, see
+                        :meth:`set_stream`. Until then, colors are written when the standard output is a terminal.
+        """
+        self._colors: Mapping[Level, ColorSpec] = _theme(theme)
+        self._enabled: bool | None = enabled
+        self._stream_set: bool = False
+        self._palette: Palette = Palette(self._colors, enabled=color_enabled(sys.stdout) if enabled is None else enabled)
 
-    @staticmethod
-    def get_report_string(report: Report, colors: frozendict[Level, Color4Bits]) -> str:
-        color = ConsoleCharacters.set_foreground_4bits(colors[report.level])
-        effective_module: str = report.module[:30]
-        effective_function: str = report.function[:30]
+    def set_stream(self, stream: TextIO | None):
+        if self._enabled is None:
+            # Shared by several outlets: colors are only kept if every one of them writes to a terminal
+            enabled: bool = color_enabled(stream) and (self._palette.enabled or not self._stream_set)
+            self._palette = Palette(self._colors, enabled=enabled)
+            self._stream_set = True
 
-        return f'{color}' \
+    def format(self, report: Report) -> str:
+        palette: Palette = self._palette
+        if not palette.enabled:
+            return f'[{report.date_time}] ' \
+                   f'[{str(report.level):^8}] ' \
+                   f'[{NAMES.badge(report.reporter_id)}] ' \
+                   f'[({report.line:0>4}) {NAMES.column(report.module_id)}::{NAMES.column(report.function_id)}] ' \
+                   f'{report.message}' \
+                   f'{_fields_suffix(report)}' \
+                   f'{_traceback_suffix(report)}'
+
+        return f'{palette.prefixes[report.level]}' \
                f'[{report.date_time}] ' \
                f'[{str(report.level):^8}] ' \
-               f'[{report.reporter_name.upper():^8}] ' \
-               f'[({report.line:0>4}) {effective_module:<30}::{effective_function:<30}] ' \
-               f'{ConsoleCharacters.set_bold()}' \
+               f'[{NAMES.badge(report.reporter_id)}] ' \
+               f'[({report.line:0>4}) {NAMES.column(report.module_id)}::{NAMES.column(report.function_id)}] ' \
+               f'{palette.emphasis}' \
                f'{report.message}' \
-               f'{ConsoleCharacters.reset()}'
+               f'{_fields_suffix(report)}' \
+               f'{_traceback_suffix(report)}' \
+               f'{palette.suffix}'
+
+    @staticmethod
+    def get_report_string(report: Report, colors: Palette | Mapping[Level, ColorSpec]) -> str:
+        formatter: ColoredFormatter = ColoredFormatter.__new__(ColoredFormatter)
+        formatter._palette = colors if isinstance(colors, Palette) else Palette(colors)
+        return formatter.format(report)
 
 
 class AdaptativeColoredFormatter(BaseFormatter):
@@ -86,6 +145,18 @@ class AdaptativeColoredFormatter(BaseFormatter):
 
     .. warning :: Do not use this formatter if you need a fast logger. Use instead :class:`DefaultFormatter`.
     """
+    __slots__ = (
+        '_day_colors',
+        '_night_colors',
+        '_enabled',
+        '_stream_set',
+        '_day_palette',
+        '_night_palette',
+        '_palette',
+        '_palette_since',
+        '_palette_until'
+    )
+
     NIGHT_COLORS: Final[frozendict[Level, Color4Bits]] = frozendict({
         Levels.TRACE: Color4Bits.SILVER,
         Levels.DEBUG: Color4Bits.WHITE,
@@ -100,27 +171,78 @@ class AdaptativeColoredFormatter(BaseFormatter):
     _SUNRISE_DATETIME: int | None = None
     _SUNSET_DATETIME: int | None = None
 
-    def __init__(self):
+    def __init__(
+            self,
+            day_theme: str | Mapping[Level, ColorSpec] = 'default',
+            night_theme: str | Mapping[Level, ColorSpec] = 'night',
+            *,
+            enabled: bool | None = None
+    ):
+        """
+        :param enabled: See :class:`ColoredFormatter`
+        """
+        self._day_colors: Mapping[Level, ColorSpec] = _theme(day_theme)
+        self._night_colors: Mapping[Level, ColorSpec] = _theme(night_theme)
+        self._enabled: bool | None = enabled
+        self._stream_set: bool = False
+        self._make_palettes(color_enabled(sys.stdout) if enabled is None else enabled)
         if not AdaptativeColoredFormatter._SUNRISE_DATETIME:
             AdaptativeColoredFormatter._SUNRISE_DATETIME = AdaptativeColoredFormatter._hour_minute_timestamp(
-                Sun.get_sun_data_from_datetime(datetime.now()).sun_rise
+                Sun.get_sun_data_from_datetime(clock.now()).sun_rise
             )
 
         if not AdaptativeColoredFormatter._SUNSET_DATETIME:
             AdaptativeColoredFormatter._SUNSET_DATETIME = AdaptativeColoredFormatter._hour_minute_timestamp(
-                Sun.get_sun_data_from_datetime(datetime.now()).sun_set
+                Sun.get_sun_data_from_datetime(clock.now()).sun_set
             )
 
+    def set_stream(self, stream: TextIO | None):
+        if self._enabled is None:
+            # See ColoredFormatter.set_stream
+            self._make_palettes(color_enabled(stream) and (self._palette.enabled or not self._stream_set))
+            self._stream_set = True
+
     def format(self, report: Report) -> Any:
-        return ColoredFormatter.get_report_string(report, AdaptativeColoredFormatter._get_color_mapping())
+        if not self._palette.enabled:
+            return f'[{report.date_time}] ' \
+                   f'[{str(report.level):^8}] ' \
+                   f'[{NAMES.badge(report.reporter_id)}] ' \
+                   f'[({report.line:0>4}) {NAMES.column(report.module_id)}::{NAMES.column(report.function_id)}] ' \
+                   f'{report.message}' \
+                   f'{_fields_suffix(report)}' \
+                   f'{_traceback_suffix(report)}'
 
-    @staticmethod
-    def _get_color_mapping() -> frozendict[Level, Color4Bits]:
-        now_timestamp: int = AdaptativeColoredFormatter._hour_minute_timestamp(datetime.now())
+        palette: Palette = self._palette if self._palette_since <= clock.time() < self._palette_until else self._update_palette()
+        return f'{palette.prefixes[report.level]}' \
+               f'[{report.date_time}] ' \
+               f'[{str(report.level):^8}] ' \
+               f'[{NAMES.badge(report.reporter_id)}] ' \
+               f'[({report.line:0>4}) {NAMES.column(report.module_id)}::{NAMES.column(report.function_id)}] ' \
+               f'{palette.emphasis}' \
+               f'{report.message}' \
+               f'{_fields_suffix(report)}' \
+               f'{_traceback_suffix(report)}' \
+               f'{palette.suffix}'
+
+    def _make_palettes(self, enabled: bool):
+        self._day_palette: Palette = Palette(self._day_colors, enabled=enabled)
+        self._night_palette: Palette = Palette(self._night_colors, enabled=enabled)
+        self._palette: Palette = self._day_palette
+        self._palette_since: float = float('-inf')
+        self._palette_until: float = 0.0
+
+    def _update_palette(self) -> Palette:
+        # Sunrise and sunset are known to the minute: the palette is kept until the minute is over
+        now: datetime = clock.now()
+        self._palette_since = now.timestamp() - now.second - now.microsecond / 1_000_000
+        self._palette_until = self._palette_since + 60
+        now_timestamp: int = AdaptativeColoredFormatter._hour_minute_timestamp(now)
         if AdaptativeColoredFormatter._SUNRISE_DATETIME <= now_timestamp < AdaptativeColoredFormatter._SUNSET_DATETIME:
-            return ColoredFormatter.COLORS
+            self._palette = self._day_palette
         else:
-            return AdaptativeColoredFormatter.NIGHT_COLORS
+            self._palette = self._night_palette
+
+        return self._palette
 
     @staticmethod
     def _hour_minute_timestamp(dt: datetime) -> int:
@@ -131,16 +253,101 @@ class DictFormatter(BaseFormatter):
     """
     Formats a provided report to a dictionary.
 
-    Each key of the dictionary corresponds to the attribute name of :class:`ereport.report.Report`
+    Each key of the dictionary corresponds to the attribute name of :class:`ereport.report.Report`.
+    The ``exc_info`` key holds the rendered traceback, or None.
     """
     __slots__ = (
         '_attributes',
     )
 
     def __init__(self, *report_attributes_to_keep: str):
-        self._attributes: tuple[str, ...] = report_attributes_to_keep or Report.__slots__
+        self._attributes: tuple[str, ...] = report_attributes_to_keep or Report.ATTRIBUTES
 
     def format(self, report: Report) -> dict:
-        return {
+        result: dict = {
             attribute: getattr(report, attribute, None) for attribute in self._attributes
         }
+        if result.get('exc_info'):
+            result['exc_info'] = render_exc_info(report.exc_info)
+
+        return result
+
+
+class JSONFormatter(BaseFormatter):
+    """
+    Formats a report as a single line JSON document, suitable for NDJSON outputs.
+
+    The level is written by name, bound fields under ``fields`` and the rendered traceback under ``exc_info``. Both keys
+    are omitted when empty.
+    """
+
+    def format(self, report: Report) -> str:
+        document: dict[str, Any] = {
+            'date_time': report.date_time,
+            'level': report.level.name,
+            'reporter_name': report.reporter_name,
+            'module': report.module,
+            'function': report.function,
+            'line': report.line,
+            'message': report.message
+        }
+        if report.fields:
+            document['fields'] = dict(report.fields)
+        if report.exc_info:
+            document['exc_info'] = render_exc_info(report.exc_info)
+
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+THEMES: Final[frozendict[str, frozendict[Level, ColorSpec]]] = frozendict({
+    'default': ColoredFormatter.COLORS,
+    'night': AdaptativeColoredFormatter.NIGHT_COLORS,
+    'ansi256': frozendict({
+        Levels.TRACE: 245,
+        Levels.DEBUG: 240,
+        Levels.SUCCESS: 34,
+        Levels.INFO: 31,
+        Levels.WARN: 172,
+        Levels.ERROR: 160,
+        Levels.SEVERE: 25,
+        Levels.FATAL: 129
+    }),
+    'truecolor': frozendict({
+        Levels.TRACE: (128, 128, 128),
+        Levels.DEBUG: (70, 70, 70),
+        Levels.SUCCESS: (46, 139, 87),
+        Levels.INFO: (0, 128, 160),
+        Levels.WARN: (204, 136, 0),
+        Levels.ERROR: (200, 30, 30),
+        Levels.SEVERE: (40, 80, 200),
+        Levels.FATAL: (150, 40, 170)
+    })
+})
+
+FORMATTERS: Final[frozendict[str, type[BaseFormatter]]] = frozendict({
+    'default': DefaultFormatter,
+    'colored': ColoredFormatter,
+    'adaptative': AdaptativeColoredFormatter,
+    'dict': DictFormatter,
+    'json': JSONFormatter
+})
+
+
+def _theme(theme: str | Mapping[Level, ColorSpec]) -> Mapping[Level, ColorSpec]:
+    if not isinstance(theme, str):
+        return theme
+    if theme not in THEMES:
+        raise ValueError(f'Unknown theme "{theme}". Expected one of: {", ".join(THEMES)}')
+
+    return THEMES[theme]
+
+
+def _fields_suffix(report: Report) -> str:
+    if not report.fields:
+        return ''
+
+    return ' {' + ', '.join([f'{key}={value}' for key, value in report.fields.items()]) + '}'
+
+
+def _traceback_suffix(report: Report) -> str:
+    return f'\n{render_exc_info(report.exc_info)}' if report.exc_info else ''
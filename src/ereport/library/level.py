@@ -1,4 +1,5 @@
 from __future__ import annotations
+from fnmatch import fnmatchcase
 from typing import Final
 
 
@@ -65,6 +66,32 @@ class Levels:
         return _STRING_TO_LEVEL[level.lower()]
 
 
+class LevelRule:
+    """
+    Overrides the level of a reporter for the call sites of some modules and/or functions.
+
+    Patterns are matched against the module name (the file name without its extension) and the function name. Shell-style
+    wildcards are accepted, None matches everything.
+    """
+    __slots__ = (
+        'level',
+        'module',
+        'function'
+    )
+
+    def __init__(self, level: Level, module: str | None = None, function: str | None = None):
+        self.level: Level = level
+        self.module: str | None = module
+        self.function: str | None = function
+
+    def __repr__(self) -> str:
+        return f'LevelRule(level={self.level!r}, module={self.module!r}, function={self.function!r})'
+
+    def matches(self, module: str, function: str) -> bool:
+        return (self.module is None or fnmatchcase(module, self.module)) and \
+            (self.function is None or fnmatchcase(function, self.function))
+
+
 _STRING_TO_LEVEL = {
     'all': Levels.ALL,
     'trace': Levels.TRACE,
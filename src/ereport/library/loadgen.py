@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Callable, Final, Iterable, Mapping
+
+from frozendict import frozendict
+
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.reporter import Reporter
+
+DEFAULT_LEVELS: Final[frozendict[Level, int]] = frozendict({
+    Levels.DEBUG: 1,
+    Levels.INFO: 8,
+    Levels.WARN: 1
+})
+PERCENTILES: Final[tuple[float, ...]] = (50.0, 90.0, 99.0, 99.9)
+
+
+class TrafficMix:
+    """
+    The traffic a load run replays: which levels and message sizes, from how many threads, how many reports and at
+    what pace. Two runs of the same mix log the same reports in the same order on each thread.
+    """
+    __slots__ = (
+        'levels',
+        'message_sizes',
+        'threads',
+        'reports',
+        'burst',
+        'pause',
+        'seed'
+    )
+
+    def __init__(
+            self,
+            *,
+            levels: Mapping[Level, int] = DEFAULT_LEVELS,
+            message_sizes: Iterable[int] = (80,),
+            threads: int = 1,
+            reports: int = 100_000,
+            burst: int = 0,
+            pause: float = 0.0,
+            seed: int = 0
+    ):
+        """
+        :param levels: Relative weight of each level, at least one of them positive. ``Levels.ALL`` only exists to configure
+                       reporters and cannot be logged at.
+        :param message_sizes: Sizes of the messages, in characters, picked uniformly. At least one is required.
+        :param threads: Number of threads logging at the same time
+        :param reports: Total number of reports, shared among the threads
+        :param burst: Number of reports each thread logs back to back before pausing, 0 to never pause
+        :param pause: Seconds a thread pauses after each burst
+        :param seed: Seed of the random choices
+        """
+        if threads < 1 or reports < 1:
+            raise ValueError('A traffic mix needs at least one thread and one report')
+        if Levels.ALL in levels:
+            raise ValueError('Reports cannot be logged at the ALL level')
+        if any(weight < 0 for weight in levels.values()) or sum(levels.values()) <= 0:
+            raise ValueError('A traffic mix needs level weights that are not negative, at least one of them positive')
+        sizes: tuple[int, ...] = tuple(message_sizes)
+        if not sizes or any(size < 0 for size in sizes):
+            raise ValueError('A traffic mix needs at least one message size, none of them negative')
+
+        self.levels: frozendict[Level, int] = frozendict(levels)
+        self.message_sizes: tuple[int, ...] = sizes
+        self.threads: int = threads
+        self.reports: int = reports
+        self.burst: int = burst
+        self.pause: float = pause
+        self.seed: int = seed
+
+
+class LoadResult:
+    """
+    What a load run measured. ``reports`` counts the level method calls, including those below the reporter's level.
+    Latencies are those of the calls, in seconds.
+    """
+    __slots__ = (
+        'reports',
+        'threads',
+        'emit_seconds',
+        'total_seconds',
+        'latencies',
+        'dropped'
+    )
+
+    def __init__(self, reports: int, threads: int, emit_seconds: float, total_seconds: float, latencies: list[float], dropped: int):
+        """
+        :param emit_seconds: Time until every thread was done logging
+        :param total_seconds: Time until the outlets were done writing as well
+        :param latencies: Latency of each call, sorted
+        """
+        self.reports: int = reports
+        self.threads: int = threads
+        self.emit_seconds: float = emit_seconds
+        self.total_seconds: float = total_seconds
+        self.latencies: list[float] = latencies
+        self.dropped: int = dropped
+
+    @property
+    def throughput(self) -> float:
+        """
+        Calls per second, until the outlets were done writing
+        """
+        return self.reports / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    @property
+    def emit_throughput(self) -> float:
+        """
+        Calls per second, as seen by the logging threads
+        """
+        return self.reports / self.emit_seconds if self.emit_seconds > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+
+        return self.latencies[min(int(len(self.latencies) * percent / 100.0), len(self.latencies) - 1)]
+
+    def summary(self) -> str:
+        latencies: str = '  '.join(f'p{percent:g}: {self.percentile(percent) * 1e6:,.1f}' for percent in PERCENTILES)
+        maximum: float = self.latencies[-1] if self.latencies else 0.0
+        return (
+            f'{self.reports:,} calls from {self.threads} thread(s)\n'
+            f'throughput: {self.throughput:,.0f} calls/s ({self.emit_throughput:,.0f} calls/s until the last call returned)\n'
+            f'latency (us): {latencies}  max: {maximum * 1e6:,.1f}\n'
+            f'dropped: {self.dropped:,}'
+        )
+
+
+def run_load(reporter: Reporter, mix: TrafficMix) -> LoadResult:
+    """
+    Logs the reports of ``mix`` with ``reporter``, then flushes its outlets. Reports are subject to the reporter's level.
+    """
+    plans: list[list[tuple[Callable, str]]] = [_plan(reporter, mix, index) for index in range(mix.threads)]
+    latencies: list[list[float]] = [[] for _ in plans]
+    dropped_before: int = _dropped(reporter.get_all_outlets())
+    start_barrier: threading.Barrier = threading.Barrier(mix.threads + 1)
+    threads: list[threading.Thread] = [
+        threading.Thread(target=_replay, args=(plan, mix, start_barrier, thread_latencies), name=f'ereport-load-{index}')
+        for index, (plan, thread_latencies) in enumerate(zip(plans, latencies))
+    ]
+    for thread in threads:
+        thread.start()
+
+    start_barrier.wait()
+    start: float = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    emitted: float = time.perf_counter() - start
+    for outlet in reporter.get_all_outlets():
+        outlet.flush()
+    total: float = time.perf_counter() - start
+
+    return LoadResult(
+        sum(len(plan) for plan in plans),
+        mix.threads,
+        emitted,
+        total,
+        sorted(latency for thread_latencies in latencies for latency in thread_latencies),
+        _dropped(reporter.get_all_outlets()) - dropped_before
+    )
+
+
+def parse_levels(text: str) -> dict[Level, int]:
+    """
+    Parses level weights written as ``info=8,debug=1,warn=1``
+    """
+    levels: dict[Level, int] = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        level: Level = Levels.parse_from_string(name.strip())
+        if level == Levels.ALL:
+            raise ValueError('Reports cannot be logged at the ALL level')
+        levels[level] = int(weight) if weight else 1
+
+    return levels
+
+
+def _plan(reporter: Reporter, mix: TrafficMix, index: int) -> list[tuple[Callable, str]]:
+    # Built before the run: choosing and building messages is not measured
+    generator: random.Random = random.Random(mix.seed * 1_000_003 + index)
+    count: int = mix.reports // mix.threads + (1 if index < mix.reports % mix.threads else 0)
+    methods: list[Callable] = [getattr(reporter, level.name.lower()) for level in mix.levels]
+    levels: list[Callable] = generator.choices(methods, weights=list(mix.levels.values()), k=count)
+    messages: dict[int, str] = {size: _message(index, size) for size in mix.message_sizes}
+    sizes: list[int] = generator.choices(mix.message_sizes, k=count)
+    return [(method, messages[size]) for method, size in zip(levels, sizes)]
+
+
+def _message(thread_index: int, size: int) -> str:
+    prefix: str = f'load from thread {thread_index} '
+    return prefix + 'x' * (size - len(prefix)) if size > len(prefix) else prefix[:size]
+
+
+def _replay(plan: list[tuple[Callable, str]], mix: TrafficMix, start_barrier: threading.Barrier, latencies: list[float]):
+    perf_counter: Callable[[], float] = time.perf_counter
+    record: Callable[[float], None] = latencies.append
+    burst: int = mix.burst
+    start_barrier.wait()
+    for number, (method, message) in enumerate(plan, 1):
+        before: float = perf_counter()
+        method(message)
+        record(perf_counter() - before)
+        if burst and number % burst == 0:
+            time.sleep(mix.pause)
+
+
+def _dropped(outlets: Iterable[ReporterOutlet]) -> int:
+    dropped: int = 0
+    for outlet in outlets:
+        dropped += getattr(outlet, 'dropped', 0)
+        dropped += _dropped(getattr(outlet, 'outlets', ()))
+
+    return dropped
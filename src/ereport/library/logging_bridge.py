@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+from typing import Final
+
+from frozendict import frozendict
+
+from ereport.library._internal.date_util import timestamp_to_yyyy_mm_dd_hh_ii_ss_ffff
+from ereport.library.context import get_context, merge_fields
+from ereport.library.formatter import BaseFormatter
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+LEVEL_TO_STDLIB: Final[frozendict[Level, int]] = frozendict({
+    Levels.ALL: logging.NOTSET,
+    Levels.TRACE: 5,
+    Levels.DEBUG: logging.DEBUG,
+    Levels.SUCCESS: 15,
+    Levels.INFO: logging.INFO,
+    Levels.WARN: logging.WARNING,
+    Levels.ERROR: logging.ERROR,
+    Levels.SEVERE: logging.CRITICAL,
+    Levels.FATAL: logging.CRITICAL
+})
+
+_FORWARDED_ATTRIBUTE: Final[str] = '_ereport_forwarded'
+
+
+def _build_stdlib_to_level() -> tuple[Level, ...]:
+    thresholds: tuple[tuple[int, Level], ...] = (
+        (5, Levels.TRACE),
+        (logging.DEBUG, Levels.DEBUG),
+        (15, Levels.SUCCESS),
+        (logging.INFO, Levels.INFO),
+        (logging.WARNING, Levels.WARN),
+        (logging.ERROR, Levels.ERROR),
+        (logging.CRITICAL, Levels.FATAL)
+    )
+    table: list[Level] = []
+    for levelno in range(logging.CRITICAL + 1):
+        level: Level = Levels.TRACE
+        for threshold, candidate in thresholds:
+            if levelno >= threshold:
+                level = candidate
+        table.append(level)
+
+    return tuple(table)
+
+
+_STDLIB_TO_LEVEL: Final[tuple[Level, ...]] = _build_stdlib_to_level()
+
+
+def stdlib_to_level(levelno: int) -> Level:
+    """
+    Maps a stdlib ``logging`` level number to the closest :class:`Levels` at or below it
+    """
+    if levelno > logging.CRITICAL:
+        return Levels.FATAL
+
+    return _STDLIB_TO_LEVEL[levelno] if levelno > 0 else Levels.TRACE
+
+
+class ReporterHandler(logging.Handler):
+    """
+    A ``logging`` handler turning each ``LogRecord`` into a :class:`Report` logged by a reporter.
+
+    The record's module, funcName and lineno are reused, so no frame is inspected. Records go through the reporter's
+    level and level rules, matched against the record's module and function. The handler takes no lock: the reporter's
+    outlets are called directly, as if the reporter itself had been called.
+    """
+
+    def __init__(self, reporter: Reporter, level: int = logging.NOTSET, *, use_logger_name: bool = True):
+        """
+        :param reporter: The reporter whose level, level rules and outlets are used
+        :param level: The handler's own ``logging`` level
+        :param use_logger_name: When True, reports are named after the record's logger instead of the reporter
+        """
+        super().__init__(level)
+        self._reporter: Reporter = reporter
+        self._use_logger_name: bool = use_logger_name
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        if getattr(record, _FORWARDED_ATTRIBUTE, False):
+            return
+
+        level: Level = stdlib_to_level(record.levelno)
+        reporter: Reporter = self._reporter
+        function: str = record.funcName or ''
+        if not reporter.enabled_for(level, record.module, function):
+            return
+
+        try:
+            reporter.log_report(Report(
+                level=level,
+                module=record.module,
+                function=function,
+                line=record.lineno,
+                message=record.getMessage(),
+                reporter_name=record.name.upper() if self._use_logger_name else reporter.name,
+                date_time=timestamp_to_yyyy_mm_dd_hh_ii_ss_ffff(record.created),
+                exc_info=record.exc_info if record.exc_info and record.exc_info[0] else record.exc_text,
+                fields=merge_fields(get_context(), reporter.fields)
+            ))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
+class ReporterOutletLogging(ReporterOutlet):
+    """
+    Forwards reports to the stdlib ``logging`` module.
+
+    Records are made with the report's module, function and line and with the raw message: formatting is left to the
+    ``logging`` handlers. Bound fields are available on the record as ``ereport_fields``.
+    """
+    __slots__ = (
+        '_logger_name',
+        '_loggers'
+    )
+
+    def __init__(self, logger_name: str | None = None, formatter: BaseFormatter = None):
+        """
+        :param logger_name: The logger to forward to. When None, the logger named after the report's reporter is used.
+        """
+        super().__init__(formatter)
+        self._logger_name: str | None = logger_name
+        self._loggers: dict[str, logging.Logger] = {}
+
+    def emit(self, report: Report):
+        name: str = self._logger_name or report.reporter_name.lower()
+        logger: logging.Logger | None = self._loggers.get(name)
+        if logger is None:
+            logger = self._loggers[name] = logging.getLogger(name)
+
+        levelno: int = LEVEL_TO_STDLIB[report.level]
+        if not logger.isEnabledFor(levelno):
+            return
+
+        record: logging.LogRecord = logger.makeRecord(
+            logger.name,
+            levelno,
+            report.module,
+            report.line,
+            report.message,
+            (),
+            report.exc_info if isinstance(report.exc_info, tuple) else None,
+            report.function,
+            {_FORWARDED_ATTRIBUTE: True, 'ereport_fields': report.fields}
+        )
+        if isinstance(report.exc_info, str):
+            record.exc_text = report.exc_info
+
+        logger.handle(record)
+
+
+def capture_stdlib_logging(reporter: Reporter, logger_name: str | None = None) -> ReporterHandler:
+    """
+    Routes a stdlib logger (the root logger by default) into a reporter and aligns the logger's level on the lowest of
+    the reporter's level and of its level rules, which the handler then applies per record
+    """
+    handler: ReporterHandler = ReporterHandler(reporter)
+    logger: logging.Logger = logging.getLogger(logger_name)
+    logger.addHandler(handler)
+    logger.setLevel(LEVEL_TO_STDLIB[min([reporter.level, *(rule.level for rule in reporter.rules)])])
+    return handler
@@ -1,48 +1,146 @@
+import sys
+import threading
 from abc import ABC, abstractmethod
+from typing import TextIO
 
+from ereport.library.fork import child_path, discard_file, register_fork_handlers
 from ereport.library.formatter import DefaultFormatter, BaseFormatter
 from ereport.library.report import Report
 
 
 class ReporterOutlet(ABC):
-    __slots__ = ('formatter',)
+    __slots__ = ('formatter', '__weakref__')
 
     def __init__(self, formatter: BaseFormatter = None):
         self.formatter: BaseFormatter = formatter or DefaultFormatter()
+        self.formatter.set_stream(self.stream)
+        register_fork_handlers(self)
+
+    @property
+    def stream(self) -> TextIO | None:
+        """
+        The standard stream the outlet writes to, None when it writes elsewhere. Given to its formatter, see
+        :meth:`BaseFormatter.set_stream`.
+        """
+        return None
 
     def set_formatter(self, formatter):
         self.formatter = formatter
+        formatter.set_stream(self.stream)
 
     @abstractmethod
     def emit(self, report: Report):
         raise NotImplementedError()
 
+    def emit_many(self, reports: list[Report]):
+        """
+        Emits several reports at once. Outlets able to write a whole batch at once should override it.
+        """
+        emit = self.emit
+        for report in reports:
+            emit(report)
+
+    def pressure(self) -> tuple[float, float]:
+        """
+        Tells how far behind the outlet is. Outlets writing synchronously are never behind.
+
+        :return: The fraction of the outlet's queue in use and the number of seconds it has been lagging behind
+        """
+        return 0.0, 0.0
+
+    def flush(self):
+        """
+        Writes whatever the outlet has buffered
+        """
+
+    def close(self):
+        """
+        Flushes and releases the resources held by the outlet
+        """
+
 
 class ReporterOutletStdOut(ReporterOutlet):
     def __init__(self, formatter: BaseFormatter = None):
         super().__init__(formatter)
 
+    @property
+    def stream(self) -> TextIO:
+        return sys.stdout
+
     def emit(self, report: Report):
         print(self.formatter.format(report))
 
+    def emit_many(self, reports: list[Report]):
+        sys.stdout.write(''.join([f'{line}\n' for line in self.formatter.format_many(reports)]))
+
+    def flush(self):
+        sys.stdout.flush()
+
+    def _before_fork(self):
+        sys.stdout.flush()
+
 
 class ReporterOutletFile(ReporterOutlet):
+    """
+    Writes reports to a file.
+
+    The file is always written in append mode, so that processes forked from this one, which reopen it, add their
+    lines after those of the others instead of overwriting them. See :func:`ereport.library.fork.use_pid_suffix` to
+    give each forked process its own file instead.
+    """
     __slots__ = (
+        '_path',
         '_file',
-        '_file_opened'
+        '_file_opened',
+        '_lock'
     )
 
     def __init__(self, file: str, formatter: BaseFormatter = None, *, truncate: bool = True):
         super().__init__(formatter or DefaultFormatter())
-        self._file = open(file, 'w' if truncate else 'a', encoding='utf8', buffering=1)
+        self._path: str = file
+        self._file = open(file, 'a', encoding='utf8', buffering=1)
+        if truncate:
+            self._file.truncate(0)
         self._file_opened = True
+        self._lock: threading.Lock = threading.Lock()
 
     def close_file(self):
-        if self._file_opened:
-            self._file.close()
+        with self._lock:
+            if self._file_opened:
+                self._file.close()
+                self._file_opened = False
 
     def emit(self, report: Report):
-        self._file.write(f'{self.formatter.format(report)}\n')
+        line: str = f'{self.formatter.format(report)}\n'
+        with self._lock:
+            self._file.write(line)
+
+    def emit_many(self, reports: list[Report]):
+        lines: str = ''.join([f'{line}\n' for line in self.formatter.format_many(reports)])
+        with self._lock:
+            self._file.write(lines)
+
+    def flush(self):
+        with self._lock:
+            if self._file_opened:
+                self._file.flush()
+
+    def close(self):
+        self.close_file()
+
+    def _before_fork(self):
+        self._lock.acquire()  # pylint: disable=consider-using-with
+        if self._file_opened:
+            self._file.flush()
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+        if self._file_opened:
+            discard_file(self._file)
+            self._file = open(child_path(self._path), 'a', encoding='utf8', buffering=1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from typing import Final
+
+from ereport.library._internal.append_writer import AppendWriter, Segment
+from ereport.library.fork import child_path
+from ereport.library.formatter import BaseFormatter, DefaultFormatter
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+_NEWLINE: Final[bytes] = b'\n'
+
+
+class ReporterOutletAppendFile(ReporterOutlet):
+    """
+    Writes reports to a file through an :class:`AppendWriter`: each formatted line and its line feed are handed to the
+    kernel as separate segments of one :func:`os.writev` call, instead of being joined into a text buffer first.
+
+    Nothing is buffered in the process: a report is in the file once :meth:`emit` returns, and processes forked from
+    this one keep appending to the same file (or to ``<file>.<pid>``, see :func:`ereport.library.fork.use_pid_suffix`)
+    without interleaving their lines. Reports emitted once the outlet is closed are dropped and counted in ``dropped``.
+    """
+    __slots__ = (
+        '_path',
+        '_writer',
+        '_lock',
+        'dropped'
+    )
+
+    def __init__(self, file: str, formatter: BaseFormatter = None, *, truncate: bool = True):
+        """
+        :param file: Path of the file to write
+        :param truncate: Truncates the file when True, appends to it otherwise
+        """
+        super().__init__(formatter or DefaultFormatter())
+        self._path: str = file
+        self._writer: AppendWriter = AppendWriter(file, truncate=truncate)
+        self._lock: threading.Lock = threading.Lock()
+        self.dropped: int = 0
+
+    def emit(self, report: Report):
+        segments: tuple[Segment, ...] = (self.formatter.format(report).encode('utf8'), _NEWLINE)
+        with self._lock:
+            if self._writer.closed:
+                self.dropped += 1
+                return
+
+            self._writer.write(segments)
+
+    def emit_many(self, reports: list[Report]):
+        segments: list[Segment] = []
+        append = segments.append
+        for line in self.formatter.format_many(reports):
+            append(line.encode('utf8'))
+            append(_NEWLINE)
+
+        with self._lock:
+            if self._writer.closed:
+                self.dropped += len(reports)
+                return
+
+            self._writer.write(segments)
+
+    def close(self):
+        with self._lock:
+            self._writer.close()
+
+    def _before_fork(self):
+        # Not halfway through resuming a partial write in the child
+        self._lock.acquire()  # pylint: disable=consider-using-with
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        self._lock = threading.Lock()
+        path: str = child_path(self._path)
+        if not self._writer.closed and path != self._writer.path:
+            self._writer.reopen(path)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import heapq
+import sys
+import threading
+from collections import deque
+from operator import attrgetter
+from typing import Callable, Iterable
+from weakref import finalize
+
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+_DATE_TIME: Callable[[Report], str] = attrgetter('date_time')
+
+
+class _ThreadBuffer:
+    __slots__ = (
+        'reports',
+        'retired'
+    )
+
+    def __init__(self):
+        self.reports: deque[Report] = deque()
+        self.retired: bool = False
+
+
+class _Owner:
+    """
+    Kept in the thread's local storage only: it is collected when the thread ends
+    """
+    __slots__ = (
+        'buffer',
+        '__weakref__'
+    )
+
+    def __init__(self, buffer: _ThreadBuffer):
+        self.buffer: _ThreadBuffer = buffer
+
+
+class ReporterOutletThreadBuffered(ReporterOutlet):
+    """
+    Lets many threads log to the same outlets without contending on them.
+
+    Each thread appends its reports to its own buffer, without taking any lock. A single writer thread takes the reports
+    of every buffer, merges them by date and time and hands them to the downstream outlets with
+    :meth:`ReporterOutlet.emit_many`, so these outlets are only ever called from one thread.
+
+    Buffers are handed over every ``flush_interval`` seconds, as soon as one of them holds ``max_buffer`` reports,
+    and when their thread ends. Reports emitted once the outlet is closed, which happens at exit at the latest, are dropped
+    and counted.
+    """
+    __slots__ = (
+        '_outlets',
+        '_max_buffer',
+        '_flush_interval',
+        '_local',
+        '_buffers',
+        '_buffers_lock',
+        '_drain_lock',
+        '_wake',
+        '_closing',
+        '_thread',
+        'dropped',
+        'errors'
+    )
+
+    def __init__(self, outlets: Iterable[ReporterOutlet], *, max_buffer: int = 1024, flush_interval: float = 0.1):
+        """
+        :param outlets: The outlets the reports are handed to
+        :param max_buffer: Number of reports from which a thread's buffer is handed over without waiting
+        :param flush_interval: Maximum number of seconds a report waits in a buffer
+        """
+        super().__init__()
+        self._outlets: tuple[ReporterOutlet, ...] = tuple(outlets)
+        self._max_buffer: int = max_buffer
+        self._flush_interval: float = flush_interval
+        self._local: threading.local = threading.local()
+        self._buffers: list[_ThreadBuffer] = []
+        self._buffers_lock: threading.Lock = threading.Lock()
+        self._drain_lock: threading.Lock = threading.Lock()
+        self._wake: threading.Event = threading.Event()
+        self._closing: bool = False
+        self._thread: threading.Thread = threading.Thread(target=self._run, name='ereport-thread-buffered', daemon=True)
+        self._thread.start()
+        self.dropped: int = 0
+        self.errors: int = 0
+
+    @property
+    def outlets(self) -> tuple[ReporterOutlet, ...]:
+        return self._outlets
+
+    @property
+    def buffered(self) -> int:
+        return sum(len(buffer.reports) for buffer in tuple(self._buffers))
+
+    def emit(self, report: Report):
+        if self._closing:
+            self.dropped += 1
+            return
+
+        owner: _Owner | None = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = self._register()
+
+        reports: deque[Report] = owner.buffer.reports
+        reports.append(report)
+        if len(reports) >= self._max_buffer:
+            self._wake.set()
+
+    def emit_many(self, reports: list[Report]):
+        if self._closing:
+            self.dropped += len(reports)
+            return
+
+        owner: _Owner | None = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = self._register()
+
+        owner.buffer.reports.extend(reports)
+        if len(owner.buffer.reports) >= self._max_buffer:
+            self._wake.set()
+
+    def pressure(self) -> tuple[float, float]:
+        fill: float = 0.0
+        lag: float = 0.0
+        for outlet in self._outlets:
+            outlet_fill, outlet_lag = outlet.pressure()
+            fill = max(fill, outlet_fill)
+            lag = max(lag, outlet_lag)
+
+        return fill, lag
+
+    def flush(self):
+        self._drain()
+        for outlet in self._outlets:
+            outlet.flush()
+
+    def close(self):
+        if self._closing:
+            return
+
+        self._closing = True
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+        self._drain()
+        for outlet in self._outlets:
+            outlet.close()
+
+    def _at_exit(self):
+        self.close()
+
+    def _before_fork(self):
+        self._drain_lock.acquire()  # pylint: disable=consider-using-with
+        self._hand_over()
+
+    def _after_fork_in_parent(self):
+        self._drain_lock.release()
+
+    def _after_fork_in_child(self):
+        # Buffers belong to the parent's threads, which do not exist here: the parent hands them over
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        if not self._closing:
+            self._thread = threading.Thread(target=self._run, name='ereport-thread-buffered', daemon=True)
+            self._thread.start()
+
+    def _register(self) -> _Owner:
+        buffer: _ThreadBuffer = _ThreadBuffer()
+        owner: _Owner = _Owner(buffer)
+        finalize(owner, self._retire, buffer)
+        self._local.owner = owner
+        with self._buffers_lock:
+            self._buffers.append(buffer)
+
+        return owner
+
+    def _retire(self, buffer: _ThreadBuffer):
+        buffer.retired = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._closing:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self):
+        with self._drain_lock:
+            self._hand_over()
+
+    def _hand_over(self):
+        with self._buffers_lock:
+            buffers: tuple[_ThreadBuffer, ...] = tuple(self._buffers)
+            # Flagged before being drained: nothing is appended to a retired buffer
+            retired: list[_ThreadBuffer] = [buffer for buffer in buffers if buffer.retired]
+            for buffer in retired:
+                self._buffers.remove(buffer)
+
+        runs: list[list[Report]] = []
+        for buffer in buffers:
+            reports: deque[Report] = buffer.reports
+            # Only the reports present now are taken: the owner thread keeps appending on the right
+            run: list[Report] = [reports.popleft() for _ in range(len(reports))]
+            if run:
+                runs.append(run)
+
+        if not runs:
+            return
+
+        merged: list[Report] = runs[0] if len(runs) == 1 else list(heapq.merge(*runs, key=_DATE_TIME))
+        for outlet in self._outlets:
+            try:
+                outlet.emit_many(merged)
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors += 1
+                print(f'Outlet {type(outlet).__name__} could not write {len(merged)} buffered reports: {error!r}', file=sys.stderr)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import gzip
+from typing import Callable, Final
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from ereport.library._internal.worker import BatchingWorker
+from ereport.library.fork import child_path, discard_file
+from ereport.library.formatter import BaseFormatter, DefaultFormatter
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+CODECS: Final[tuple[str, ...]] = ('gzip', 'zstd')
+
+
+class ReporterOutletCompressedFile(ReporterOutlet):
+    """
+    Writes compressed reports to a file.
+
+    Reports are formatted and compressed on a background thread. Every ``flush_interval`` seconds (or every
+    ``max_frame_reports`` reports), the pending reports are written as one independent gzip member or zstd frame. The
+    file stays readable by ``zcat`` / ``zstdcat`` while being written, and a crash loses at most the pending frame.
+
+    The ``zstd`` codec requires the ``zstandard`` package.
+    """
+    __slots__ = (
+        '_path',
+        '_file',
+        '_compress',
+        '_worker',
+        'bytes_in',
+        'bytes_out',
+        'frames'
+    )
+
+    def __init__(
+            self,
+            file: str,
+            formatter: BaseFormatter = None,
+            *,
+            codec: str = 'gzip',
+            compression_level: int | None = None,
+            flush_interval: float = 1.0,
+            max_frame_reports: int = 10_000,
+            max_pending: int = 100_000,
+            truncate: bool = True
+    ):
+        """
+        :param file: Path of the file to write
+        :param codec: Either ``gzip`` or ``zstd``
+        :param compression_level: The codec's compression level. Defaults to 6 for gzip and 3 for zstd.
+        :param flush_interval: Maximum number of seconds a report waits before its frame is written
+        :param max_frame_reports: Maximum number of reports per frame
+        :param max_pending: Maximum number of reports waiting to be compressed. Further reports are dropped and counted.
+        :param truncate: Truncates the file when True, appends new frames to it otherwise
+        """
+        super().__init__(formatter or DefaultFormatter())
+        self._compress: Callable[[bytes], bytes] = _make_compressor(codec, compression_level)
+        self._path: str = file
+        # Always appending: processes forked from this one write their frames after those of the others
+        self._file = open(file, 'ab', buffering=0)  # pylint: disable=consider-using-with
+        if truncate:
+            self._file.truncate(0)
+        self._worker: BatchingWorker = BatchingWorker(
+            f'ereport-compressed-{file}',
+            self._write_frame,
+            max_batch=max_frame_reports,
+            flush_interval=flush_interval,
+            max_pending=max_pending
+        )
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+        self.frames: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """
+        Uncompressed size over compressed size of what was written so far
+        """
+        return self.bytes_in / self.bytes_out if self.bytes_out else 0.0
+
+    @property
+    def dropped(self) -> int:
+        return self._worker.dropped
+
+    def emit(self, report: Report):
+        self._worker.submit(report)
+
+    def emit_many(self, reports: list[Report]):
+        self._worker.submit_many(reports)
+
+    def pressure(self) -> tuple[float, float]:
+        return self._worker.fill, self._worker.lag
+
+    def flush(self):
+        self._worker.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._worker.close()
+            self._file.close()
+
+    def _after_fork_in_child(self):
+        if not self._file.closed:
+            discard_file(self._file)
+            self._file = open(child_path(self._path), 'ab', buffering=0)  # pylint: disable=consider-using-with
+
+    def _write_frame(self, reports: list[Report]):
+        data: bytes = ''.join([f'{line}\n' for line in self.formatter.format_many(reports)]).encode('utf8')
+        frame: bytes = self._compress(data)
+        self._file.write(frame)
+        self.bytes_in += len(data)
+        self.bytes_out += len(frame)
+        self.frames += 1
+
+
+def _make_compressor(codec: str, compression_level: int | None) -> Callable[[bytes], bytes]:
+    if codec == 'gzip':
+        level: int = 6 if compression_level is None else compression_level
+        return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError('The "zstd" codec requires the "zstandard" package')
+
+        compressor = zstandard.ZstdCompressor(level=3 if compression_level is None else compression_level)
+        return compressor.compress
+
+    raise ValueError(f'Unknown codec "{codec}". Expected one of: {", ".join(CODECS)}')
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import gzip
+import http.client
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Final
+from urllib.parse import urlsplit, SplitResult
+
+from ereport.library import clock
+from ereport.library._internal.worker import BatchingWorker
+from ereport.library.formatter import BaseFormatter, JSONFormatter
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+_RETRYABLE_STATUSES: Final[frozenset[int]] = frozenset({408, 425, 429, 500, 502, 503, 504})
+_QUEUE_POLL_INTERVAL: Final[float] = 0.05
+
+
+class ReporterOutletHTTP(ReporterOutlet):
+    """
+    Posts reports in bulk to an HTTP endpoint, as new-line delimited documents (NDJSON with the default formatter).
+
+    Reports are grouped in batches of at most ``max_batch_reports`` reports and ``max_batch_bytes`` bytes, or whatever
+    accumulated during ``flush_interval`` seconds. Batches are gzipped and posted by ``pool_size`` sender threads, each
+    keeping its own keep-alive connection. Failed posts are retried with an exponential backoff. Batches still failing
+    after ``max_retries`` retries are dropped and counted.
+
+    At exit, pending reports are still posted for up to ``exit_timeout`` seconds. What is left then is dropped and
+    counted.
+    """
+    __slots__ = (
+        '_url',
+        '_path',
+        '_headers',
+        '_compression_level',
+        '_max_batch_bytes',
+        '_max_retries',
+        '_min_backoff',
+        '_max_backoff',
+        '_timeout',
+        '_exit_timeout',
+        '_give_up_at',
+        '_forking',
+        '_worker',
+        '_bodies',
+        '_held',
+        '_senders',
+        '_counters_lock',
+        'sent_reports',
+        'sent_batches',
+        'dropped_reports',
+        'dropped_batches',
+        'retries'
+    )
+
+    def __init__(
+            self,
+            url: str,
+            formatter: BaseFormatter = None,
+            *,
+            headers: dict[str, str] | None = None,
+            compression_level: int | None = 6,
+            max_batch_reports: int = 1000,
+            max_batch_bytes: int = 1_000_000,
+            flush_interval: float = 1.0,
+            pool_size: int = 2,
+            max_retries: int = 3,
+            min_backoff: float = 0.5,
+            max_backoff: float = 10.0,
+            timeout: float = 10.0,
+            max_pending: int = 100_000,
+            exit_timeout: float = 5.0
+    ):
+        """
+        :param url: The bulk ingestion endpoint, ``http://`` or ``https://``
+        :param headers: Additional headers sent with each post, e.g. authorization
+        :param compression_level: The gzip compression level. None disables compression.
+        :param max_batch_reports: Maximum number of reports per post
+        :param max_batch_bytes: Maximum uncompressed size of a post, in bytes
+        :param flush_interval: Maximum number of seconds a report waits before being posted
+        :param pool_size: Number of sender threads and keep-alive connections
+        :param max_retries: Number of retries of a failed post before dropping it
+        :param min_backoff: Seconds to wait before the first retry. Doubled on each retry.
+        :param max_backoff: Maximum number of seconds to wait between retries
+        :param timeout: Socket timeout of the connections, in seconds
+        :param max_pending: Maximum number of reports waiting to be batched. Further reports are dropped and counted.
+        :param exit_timeout: Maximum number of seconds spent at exit posting the reports still pending
+        """
+        self._url: SplitResult = urlsplit(url)
+        if self._url.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported URL scheme "{self._url.scheme}". Expected http or https')
+
+        self._path: str = f'{self._url.path or "/"}{"?" + self._url.query if self._url.query else ""}'
+        self._headers: dict[str, str] = {'Content-Type': 'application/x-ndjson', **(headers or {})}
+        if compression_level is not None:
+            self._headers['Content-Encoding'] = 'gzip'
+
+        self._compression_level: int | None = compression_level
+        self._max_batch_bytes: int = max_batch_bytes
+        self._max_retries: int = max_retries
+        self._min_backoff: float = min_backoff
+        self._max_backoff: float = max_backoff
+        self._timeout: float = timeout
+        self._exit_timeout: float = exit_timeout
+        self._give_up_at: float = float('inf')
+        self._forking: bool = False
+        self._bodies: queue.Queue[tuple[bytes, int] | None] = queue.Queue(maxsize=pool_size * 2)
+        self._held: deque[tuple[bytes, int]] = deque()
+        self._worker: BatchingWorker = BatchingWorker(
+            f'ereport-http-{self._url.netloc}',
+            self._make_bodies,
+            max_batch=max_batch_reports,
+            flush_interval=flush_interval,
+            max_pending=max_pending,
+            on_interval=self._queue_held
+        )
+        # Registered for forks after the worker: the outlet's hooks run before the worker hands its reports over
+        super().__init__(formatter or JSONFormatter())
+        self._counters_lock: threading.Lock = threading.Lock()
+        self.sent_reports: int = 0
+        self.sent_batches: int = 0
+        self.dropped_reports: int = 0
+        self.dropped_batches: int = 0
+        self.retries: int = 0
+        self._senders: list[threading.Thread] = self._start_senders(pool_size)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Reports dropped, either because too many were pending or because their post failed
+        """
+        return self._worker.dropped + self.dropped_reports
+
+    def emit(self, report: Report):
+        self._worker.submit(report)
+
+    def emit_many(self, reports: list[Report]):
+        self._worker.submit_many(reports)
+
+    def pressure(self) -> tuple[float, float]:
+        return self._worker.fill, self._worker.lag
+
+    def flush(self):
+        """
+        Batches every pending report and waits until all the batches are posted or dropped
+        """
+        self._worker.flush()
+        self._queue_held()
+        self._bodies.join()
+
+    def close(self):
+        self._worker.close()
+        self._queue_held()
+        for _ in self._senders:
+            try:
+                self._bodies.put(None, timeout=self._time_left())
+            except queue.Full:
+                break
+        for sender in self._senders:
+            sender.join(self._time_left())
+
+        # Only left when giving up: nothing posts them anymore
+        while True:
+            try:
+                item: tuple[bytes, int] | None = self._bodies.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._drop(item[1])
+
+    def _at_exit(self):
+        # Senders are daemon threads: the interpreter would stop them with batches still queued
+        self._give_up_at = clock.monotonic() + self._exit_timeout
+        self.close()
+
+    def _before_fork(self):
+        # The worker hands its pending reports over next: their bodies are held instead of waiting for a sender, which
+        # may be retrying a post. Posts in progress are left to the parent's senders.
+        self._forking = True
+
+    def _after_fork_in_parent(self):
+        self._forking = False
+
+    def _after_fork_in_child(self):
+        self._forking = False
+        self._bodies = queue.Queue(maxsize=self._bodies.maxsize)
+        self._held = deque()
+        self._counters_lock = threading.Lock()
+        self.sent_reports = self.sent_batches = self.dropped_reports = self.dropped_batches = self.retries = 0
+        self._senders = self._start_senders(len(self._senders))
+
+    def _start_senders(self, pool_size: int) -> list[threading.Thread]:
+        senders: list[threading.Thread] = [
+            threading.Thread(target=self._send_bodies, name=f'ereport-http-sender-{index}', daemon=True) for index in range(pool_size)
+        ]
+        for sender in senders:
+            sender.start()
+
+        return senders
+
+    def _make_bodies(self, reports: list[Report]):
+        max_batch_bytes: int = self._max_batch_bytes
+        lines: list[bytes] = []
+        size: int = 0
+        for formatted in self.formatter.format_many(reports):
+            line: bytes = f'{formatted}\n'.encode('utf8')
+            if lines and size + len(line) > max_batch_bytes:
+                self._queue_body((self._encode(lines), len(lines)))
+                lines = []
+                size = 0
+
+            lines.append(line)
+            size += len(line)
+
+        if lines:
+            self._queue_body((self._encode(lines), len(lines)))
+
+    def _queue_body(self, body: tuple[bytes, int]):
+        """
+        Waits for room in the queue of the senders, but neither through a fork nor past the exit deadline
+        """
+        if self._held:
+            self._queue_held()
+
+        while not self._forking:
+            try:
+                self._bodies.put(body, timeout=_QUEUE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if clock.monotonic() >= self._give_up_at:
+                    self._drop(body[1])
+                    return
+
+        self._held.append(body)
+
+    def _queue_held(self):
+        held: deque[tuple[bytes, int]] = self._held
+        while held and not self._forking:
+            try:
+                body: tuple[bytes, int] = held.popleft()
+            except IndexError:
+                return
+            self._queue_body(body)
+
+    def _encode(self, lines: list[bytes]) -> bytes:
+        body: bytes = b''.join(lines)
+        if self._compression_level is None:
+            return body
+
+        return gzip.compress(body, compresslevel=self._compression_level, mtime=0)
+
+    def _send_bodies(self):
+        connection: http.client.HTTPConnection | None = None
+        while True:
+            item: tuple[bytes, int] | None = self._bodies.get()
+            try:
+                if item is None:
+                    if connection is not None:
+                        connection.close()
+                    return
+
+                connection = self._post(connection, *item)
+            finally:
+                self._bodies.task_done()
+
+    def _post(self, connection: http.client.HTTPConnection | None, body: bytes, count: int) -> http.client.HTTPConnection | None:
+        backoff: float = self._min_backoff
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                with self._counters_lock:
+                    self.retries += 1
+                if clock.monotonic() + backoff > self._give_up_at:
+                    break
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+
+            try:
+                if connection is None:
+                    connection = self._connect()
+
+                connection.request('POST', self._path, body, self._headers)
+                response: http.client.HTTPResponse = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                continue
+
+            if 200 <= response.status < 300:
+                with self._counters_lock:
+                    self.sent_reports += count
+                    self.sent_batches += 1
+                return connection
+
+            if response.status not in _RETRYABLE_STATUSES:
+                print(f'HTTP outlet: batch of {count} reports rejected with status {response.status}', file=sys.stderr)
+                break
+
+        self._drop(count)
+        return connection
+
+    def _drop(self, count: int):
+        with self._counters_lock:
+            self.dropped_reports += count
+            self.dropped_batches += 1
+
+    def _time_left(self) -> float | None:
+        if self._give_up_at == float('inf'):
+            return None
+
+        return max(self._give_up_at - clock.monotonic(), 0.0)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._url.scheme == 'https':
+            return http.client.HTTPSConnection(self._url.hostname, self._url.port, timeout=self._timeout)
+
+        return http.client.HTTPConnection(self._url.hostname, self._url.port, timeout=self._timeout)
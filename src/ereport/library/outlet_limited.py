@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import copy
+import os
+import tempfile
+from hashlib import blake2b
+from typing import Final, Iterator
+
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+_SPILL_CHUNK: Final[int] = 1 << 20
+
+
+class ReporterOutletLimited(ReporterOutlet):
+    """
+    Bounds the size of the messages handed to an outlet.
+
+    A message longer than ``max_message_size`` characters is cut, and a marker telling how many characters were left out
+    is appended. The outlet then only ever queues, formats and buffers the first ``max_message_size`` characters.
+
+    When ``spill_directory`` is provided, oversized messages are instead written in full to
+    ``<spill_directory>/<hash>.txt``, named after a hash of their content, and the outlet only gets a reference to that
+    file. A message reported many times is written once. Spilled messages are written on the caller's thread.
+    """
+    __slots__ = (
+        '_outlet',
+        '_max_message_size',
+        '_spill_directory',
+        'truncated',
+        'spilled'
+    )
+
+    def __init__(self, outlet: ReporterOutlet, max_message_size: int, *, spill_directory: str | None = None):
+        """
+        :param outlet: The outlet the reports are handed to
+        :param max_message_size: Maximum number of characters of a message
+        :param spill_directory: Directory where oversized messages are written, created if missing. They are truncated
+                                when None.
+        """
+        if max_message_size < 1:
+            raise ValueError(f'The maximum message size must be positive, not {max_message_size}')
+
+        super().__init__()
+        self._outlet: ReporterOutlet = outlet
+        self._max_message_size: int = max_message_size
+        self._spill_directory: str | None = spill_directory
+        if spill_directory is not None:
+            os.makedirs(spill_directory, exist_ok=True)
+        self.truncated: int = 0
+        self.spilled: int = 0
+
+    @property
+    def outlets(self) -> tuple[ReporterOutlet, ...]:
+        return self._outlet,
+
+    def emit(self, report: Report):
+        if len(report.message) > self._max_message_size:
+            report = self._limit(report)
+
+        self._outlet.emit(report)
+
+    def emit_many(self, reports: list[Report]):
+        max_message_size: int = self._max_message_size
+        self._outlet.emit_many([self._limit(report) if len(report.message) > max_message_size else report for report in reports])
+
+    def pressure(self) -> tuple[float, float]:
+        return self._outlet.pressure()
+
+    def flush(self):
+        self._outlet.flush()
+
+    def close(self):
+        self._outlet.close()
+
+    def _limit(self, report: Report) -> Report:
+        message: str = report.message
+        if self._spill_directory is not None:
+            try:
+                text: str = f'[message of {len(message)} characters written to {self._spill(message)}]'
+                self.spilled += 1
+            except OSError as error:
+                text = self._truncate(message, f'could not be written: {error}')
+        else:
+            text = self._truncate(message, 'left out')
+
+        # The caller's report may be given to other outlets: only this outlet gets the shortened one
+        limited: Report = copy.copy(report)
+        limited.message = text
+        limited.template = None
+        limited.args = ()
+        return limited
+
+    def _truncate(self, message: str, reason: str) -> str:
+        self.truncated += 1
+        return f'{message[:self._max_message_size]}... [{len(message) - self._max_message_size} more characters {reason}]'
+
+    def _spill(self, message: str) -> str:
+        # Hashed, then written, by chunks: a huge message is never encoded whole
+        digest = blake2b(digest_size=16)
+        for chunk in _encoded_chunks(message):
+            digest.update(chunk)
+
+        path: str = os.path.join(self._spill_directory, f'{digest.hexdigest()}.txt')
+        if os.path.exists(path):
+            return path
+
+        # Written aside then renamed: a spilled file is always complete, even when several processes spill it at once
+        descriptor, temporary_path = tempfile.mkstemp(dir=self._spill_directory, prefix='.spill-')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                for chunk in _encoded_chunks(message):
+                    file.write(chunk)
+            os.replace(temporary_path, path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        return path
+
+
+def _encoded_chunks(message: str) -> Iterator[bytes]:
+    for start in range(0, len(message), _SPILL_CHUNK):
+        yield message[start:start + _SPILL_CHUNK].encode('utf8', errors='replace')
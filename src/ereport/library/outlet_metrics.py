@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import struct
+import sys
+import threading
+from collections import deque
+from typing import BinaryIO, Callable, Final, Iterator
+
+from ereport.library import clock
+from ereport.library._internal.names import NAMES
+from ereport.library.fork import child_path, discard_file
+from ereport.library.formatter import BaseFormatter
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+OUTPUT_FORMATS: Final[tuple[str, ...]] = ('csv', 'json', 'binary')
+OTHER_MODULES: Final[str] = '<other>'
+
+_SNAPSHOT_HEADER: Final[struct.Struct] = struct.Struct('<ddI')
+_ENTRY_HEADER: Final[struct.Struct] = struct.Struct('<BIHH')
+_MAX_NAME_BYTES: Final[int] = 0xFFFF
+_LEVELS_BY_WEIGHT: Final[dict[int, Level]] = {
+    level.weight: level for level in vars(Levels).values() if isinstance(level, Level)
+}
+
+
+class MetricsSnapshot:
+    """
+    Number of reports per (reporter name, level, module) made during one interval
+    """
+    __slots__ = (
+        'start',
+        'interval',
+        'counts'
+    )
+
+    def __init__(self, start: float, interval: float, counts: dict[tuple[str, Level, str], int]):
+        """
+        :param start: Timestamp of the start of the interval
+        :param interval: Length of the interval, in seconds
+        """
+        self.start: float = start
+        self.interval: float = interval
+        self.counts: dict[tuple[str, Level, str], int] = counts
+
+    def count(self, reporter_name: str | None = None, level: Level | None = None, module: str | None = None) -> int:
+        """
+        Sums the counts matching every provided criterion. The level is a minimum level.
+        """
+        return sum(
+            count for (key_reporter, key_level, key_module), count in self.counts.items()
+            if (reporter_name is None or key_reporter == reporter_name)
+            and (level is None or key_level >= level)
+            and (module is None or key_module == module)
+        )
+
+
+class ReporterOutletMetrics(ReporterOutlet):
+    """
+    Counts reports instead of writing them, per interval of ``interval`` seconds and per (reporter name, level, module).
+
+    Intervals are aligned on the clock. Once an interval is over, its counts are kept in memory as a
+    :class:`MetricsSnapshot`, the last ``history`` ones being available through :meth:`snapshots` and :meth:`rate`, and
+    are appended to ``file`` when provided.
+
+    Memory is bounded: at most ``max_keys`` keys are counted per interval, further modules being counted as
+    :data:`OTHER_MODULES`. Snapshots that cannot be written are reported on stderr and counted in ``errors``.
+    """
+    __slots__ = (
+        '_interval',
+        '_max_keys',
+        '_counts',
+        '_interval_start',
+        '_history',
+        '_write',
+        '_path',
+        '_file',
+        '_lock',
+        '_stop',
+        '_thread',
+        'errors'
+    )
+
+    def __init__(
+            self,
+            file: str | None = None,
+            formatter: BaseFormatter = None,
+            *,
+            interval: float = 10.0,
+            history: int = 360,
+            max_keys: int = 1024,
+            output_format: str = 'csv',
+            truncate: bool = False
+    ):
+        """
+        :param file: Path of the file snapshots are appended to, or None to only keep them in memory
+        :param formatter: Unused, reports are only counted
+        :param interval: Length of an interval, in seconds
+        :param history: Number of snapshots kept in memory
+        :param max_keys: Maximum number of keys counted per interval
+        :param output_format: One of :data:`OUTPUT_FORMATS`
+        :param truncate: Truncates the file when True, appends to it otherwise
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f'Unknown output format "{output_format}". Expected one of: {", ".join(OUTPUT_FORMATS)}')
+
+        super().__init__(formatter)
+        self._interval: float = interval
+        self._max_keys: int = max_keys
+        self._counts: dict[tuple[int, int, int], int] = {}
+        self._interval_start: float = self._align(clock.time())
+        self._history: deque[MetricsSnapshot] = deque(maxlen=history)
+        self._write: Callable[[MetricsSnapshot], None] = getattr(self, f'_write_{output_format}')
+        self._path: str | None = file
+        self._file: BinaryIO | None = open(file, 'ab', buffering=0) if file else None  # pylint: disable=consider-using-with
+        if self._file is not None and truncate:
+            self._file.truncate(0)
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self.errors: int = 0
+        self._thread: threading.Thread = threading.Thread(target=self._run, name='ereport-metrics', daemon=True)
+        self._thread.start()
+
+    def emit(self, report: Report):
+        with self._lock:
+            self._count(report)
+
+    def emit_many(self, reports: list[Report]):
+        with self._lock:
+            for report in reports:
+                self._count(report)
+
+    def current(self) -> MetricsSnapshot:
+        """
+        The counts of the interval in progress
+        """
+        with self._lock:
+            return self._snapshot(self._interval_start, dict(self._counts))
+
+    def snapshots(self) -> tuple[MetricsSnapshot, ...]:
+        """
+        The snapshots of the last intervals, oldest first
+        """
+        return tuple(self._history)
+
+    def rate(self, reporter_name: str | None = None, level: Level | None = None, module: str | None = None, window: float = 60.0) -> float:
+        """
+        Number of matching reports per second during the intervals over in the last ``window`` seconds
+        """
+        since: float = self._interval_start - window
+        snapshots: list[MetricsSnapshot] = [snapshot for snapshot in tuple(self._history) if snapshot.start >= since]
+        if not snapshots:
+            return 0.0
+
+        return sum(snapshot.count(reporter_name, level, module) for snapshot in snapshots) / (len(snapshots) * self._interval)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._rotate(clock.time())
+        if self._file is not None:
+            self._file.close()
+
+    def _before_fork(self):
+        self._lock.acquire()  # pylint: disable=consider-using-with
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        # Counts of the interval in progress are the parent's. Past snapshots are kept.
+        self._counts = {}
+        self._lock = threading.Lock()
+        if self._file is not None and not self._file.closed:
+            discard_file(self._file)
+            self._file = open(child_path(self._path), 'ab', buffering=0)  # pylint: disable=consider-using-with
+        if not self._stop.is_set():
+            self._thread = threading.Thread(target=self._run, name='ereport-metrics', daemon=True)
+            self._thread.start()
+
+    def _count(self, report: Report):
+        key: tuple[int, int, int] = (report.reporter_id, report.level.weight, report.module_id)
+        counts: dict[tuple[int, int, int], int] = self._counts
+        if key not in counts and len(counts) >= self._max_keys:
+            key = (report.reporter_id, report.level.weight, NAMES.intern(OTHER_MODULES))
+        counts[key] = counts.get(key, 0) + 1
+
+    def _run(self):
+        while not self._stop.wait(max(self._interval_start + self._interval - clock.time(), 0.0)):
+            # Waits may end a little early: never close an interval before its end
+            try:
+                self._rotate(max(clock.time(), self._interval_start + self._interval))
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors += 1
+                print(f'Could not write the metrics of the last interval: {error!r}', file=sys.stderr)
+
+    def _rotate(self, now: float):
+        with self._lock:
+            counts: dict[tuple[int, int, int], int] = self._counts
+            start: float = self._interval_start
+            self._counts = {}
+            self._interval_start = self._align(now)
+
+        snapshot: MetricsSnapshot = self._snapshot(start, counts)
+        self._history.append(snapshot)
+        if self._file is not None and counts:
+            self._write(snapshot)
+
+    def _align(self, timestamp: float) -> float:
+        return timestamp - timestamp % self._interval
+
+    def _snapshot(self, start: float, counts: dict[tuple[int, int, int], int]) -> MetricsSnapshot:
+        return MetricsSnapshot(start, self._interval, {
+            (NAMES.name(reporter_id), _LEVELS_BY_WEIGHT[weight], NAMES.name(module_id)): count
+            for (reporter_id, weight, module_id), count in counts.items()
+        })
+
+    def _write_csv(self, snapshot: MetricsSnapshot):
+        text: io.StringIO = io.StringIO()
+        writer = csv.writer(text, lineterminator='\n')
+        writer.writerows(
+            (f'{snapshot.start:.3f}', f'{snapshot.interval:g}', reporter_name, level.name, module, count)
+            for (reporter_name, level, module), count in snapshot.counts.items()
+        )
+        self._file.write(text.getvalue().encode('utf8'))
+
+    def _write_json(self, snapshot: MetricsSnapshot):
+        document: dict = {
+            'start': snapshot.start,
+            'interval': snapshot.interval,
+            'counts': [[reporter_name, level.name, module, count] for (reporter_name, level, module), count in snapshot.counts.items()]
+        }
+        self._file.write(f'{json.dumps(document, ensure_ascii=False, separators=(",", ":"))}\n'.encode('utf8'))
+
+    def _write_binary(self, snapshot: MetricsSnapshot):
+        parts: list[bytes] = [_SNAPSHOT_HEADER.pack(snapshot.start, snapshot.interval, len(snapshot.counts))]
+        for (reporter_name, level, module), count in snapshot.counts.items():
+            reporter_bytes: bytes = _encode_name(reporter_name)
+            module_bytes: bytes = _encode_name(module)
+            parts.append(_ENTRY_HEADER.pack(level.weight, count, len(reporter_bytes), len(module_bytes)))
+            parts.append(reporter_bytes)
+            parts.append(module_bytes)
+        self._file.write(b''.join(parts))
+
+
+def _encode_name(name: str) -> bytes:
+    """
+    The name encoded in at most :data:`_MAX_NAME_BYTES` bytes, cut between two characters
+    """
+    encoded: bytes = name.encode('utf8')
+    if len(encoded) <= _MAX_NAME_BYTES:
+        return encoded
+
+    return encoded[:_MAX_NAME_BYTES].decode('utf8', errors='ignore').encode('utf8')
+
+
+def read_snapshots(path: str, output_format: str = 'csv') -> Iterator[MetricsSnapshot]:
+    """
+    Reads back the snapshots written by :class:`ReporterOutletMetrics`
+    """
+    if output_format == 'binary':
+        with open(path, 'rb') as file:
+            data: bytes = file.read()
+
+        offset: int = 0
+        while offset < len(data):
+            start, interval, entries = _SNAPSHOT_HEADER.unpack_from(data, offset)
+            offset += _SNAPSHOT_HEADER.size
+            counts: dict[tuple[str, Level, str], int] = {}
+            for _ in range(entries):
+                weight, count, reporter_length, module_length = _ENTRY_HEADER.unpack_from(data, offset)
+                offset += _ENTRY_HEADER.size
+                reporter_name: str = data[offset:offset + reporter_length].decode('utf8')
+                offset += reporter_length
+                counts[(reporter_name, _LEVELS_BY_WEIGHT[weight], data[offset:offset + module_length].decode('utf8'))] = count
+                offset += module_length
+            yield MetricsSnapshot(start, interval, counts)
+        return
+
+    with open(path, 'r', encoding='utf8', newline='') as file:
+        if output_format == 'json':
+            for line in file:
+                document: dict = json.loads(line)
+                yield MetricsSnapshot(document['start'], document['interval'], {
+                    (reporter_name, Levels.parse_from_string(level), module): count for reporter_name, level, module, count in document['counts']
+                })
+            return
+
+        snapshot: MetricsSnapshot | None = None
+        for start, interval, reporter_name, level, module, count in csv.reader(file):
+            if snapshot is None or snapshot.start != float(start):
+                if snapshot is not None:
+                    yield snapshot
+                snapshot = MetricsSnapshot(float(start), float(interval), {})
+            snapshot.counts[(reporter_name, Levels.parse_from_string(level), module)] = int(count)
+
+        if snapshot is not None:
+            yield snapshot
@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import os
+import socket
+import time
+from abc import abstractmethod
+from collections import deque
+from typing import Final
+
+from frozendict import frozendict
+
+from ereport.library import clock
+from ereport.library._internal.worker import BatchingWorker
+from ereport.library.formatter import BaseFormatter, DefaultFormatter, _traceback_suffix
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+SYSLOG_SEVERITIES: Final[frozendict[Level, int]] = frozendict({
+    Levels.ALL: 7,
+    Levels.TRACE: 7,
+    Levels.DEBUG: 7,
+    Levels.SUCCESS: 5,
+    Levels.INFO: 6,
+    Levels.WARN: 4,
+    Levels.ERROR: 3,
+    Levels.SEVERE: 2,
+    Levels.FATAL: 1
+})
+
+_SD_ESCAPES: Final[dict[int, str]] = str.maketrans({'"': '\\"', '\\': '\\\\', ']': '\\]'})
+_MAX_CACHED_SD_NAMES: Final[int] = 1024
+_SD_NAMES: dict[str, str] = {}
+_MAX_CACHED_UTC_OFFSETS: Final[int] = 1024
+
+
+class RFC5424Formatter(BaseFormatter):
+    """
+    Formats a report as a RFC 5424 syslog message. Bound fields are written as structured data.
+    """
+    __slots__ = (
+        '_facility',
+        '_hostname',
+        '_app_name',
+        '_utc_offsets'
+    )
+
+    def __init__(self, app_name: str | None = None, *, facility: int = 1, hostname: str | None = None):
+        """
+        :param app_name: The APP-NAME field. When None, the report's reporter name is used.
+        :param facility: The syslog facility, 1 (user-level messages) by default
+        :param hostname: The HOSTNAME field. Defaults to the machine's host name.
+        """
+        self._facility: int = facility * 8
+        self._app_name: str | None = app_name
+        self._hostname: str = (hostname or socket.gethostname() or '-')[:255]
+        # Per hour of the reports' local date and time: the offset changes with daylight saving time
+        self._utc_offsets: dict[str, str] = {}
+
+    def format(self, report: Report) -> str:
+        date_time: str = report.date_time
+        utc_offset: str | None = self._utc_offsets.get(date_time[:13])
+        if utc_offset is None:
+            if len(self._utc_offsets) >= _MAX_CACHED_UTC_OFFSETS:
+                self._utc_offsets.clear()
+
+            utc_offset = self._utc_offsets[date_time[:13]] = _local_utc_offset(date_time)
+
+        timestamp: str = f'{date_time[:10]}T{date_time[11:19]}.{date_time[20:26]}{utc_offset}'
+        structured_data: str = '-'
+        if report.fields:
+            parameters: str = ' '.join([
+                f'{_sd_name(key)}="{str(value).translate(_SD_ESCAPES)}"' for key, value in report.fields.items()
+            ])
+            structured_data = f'[ereport@32473 {parameters}]'
+
+        return f'<{self._facility + SYSLOG_SEVERITIES[report.level]}>1 ' \
+               f'{timestamp} ' \
+               f'{self._hostname} ' \
+               f'{(self._app_name or report.reporter_name)[:48]} ' \
+               f'{os.getpid()} ' \
+               f'- ' \
+               f'{structured_data} ' \
+               f'{report.module}::{report.function}({report.line}) {report.message}{_traceback_suffix(report)}'
+
+
+class _ReporterOutletNetwork(ReporterOutlet):
+    """
+    Base of the network outlets: reports are formatted, encoded and sent in batches from a background thread
+    """
+    __slots__ = (
+        '_address',
+        '_worker',
+        'sent'
+    )
+
+    def __init__(self, host: str, port: int, formatter: BaseFormatter, flush_interval: float, max_batch: int, max_pending: int):
+        super().__init__(formatter)
+        self._address: tuple[str, int] = (host, port)
+        self._worker: BatchingWorker = BatchingWorker(
+            f'ereport-{type(self).__name__}-{host}:{port}',
+            self._send_reports,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            max_pending=max_pending,
+            on_interval=self._on_interval
+        )
+        self.sent: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._worker.dropped
+
+    def emit(self, report: Report):
+        self._worker.submit(report)
+
+    def emit_many(self, reports: list[Report]):
+        self._worker.submit_many(reports)
+
+    def pressure(self) -> tuple[float, float]:
+        return self._worker.fill, self._worker.lag
+
+    def flush(self):
+        self._worker.flush()
+
+    def close(self):
+        self._worker.close()
+        self._disconnect()
+
+    def _send_reports(self, reports: list[Report]):
+        self._send_messages([line.encode('utf8') for line in self.formatter.format_many(reports)])
+
+    @abstractmethod
+    def _send_messages(self, messages: list[bytes]):
+        raise NotImplementedError()
+
+    def _on_interval(self):
+        pass
+
+    def _disconnect(self):
+        pass
+
+
+class ReporterOutletUDP(_ReporterOutletNetwork):
+    """
+    Sends reports over UDP. As many new-line separated reports as fit in ``max_datagram`` bytes are sent per datagram.
+    Reports larger than a datagram are truncated.
+    """
+    __slots__ = (
+        '_socket',
+        '_max_datagram'
+    )
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            formatter: BaseFormatter = None,
+            *,
+            max_datagram: int = 1400,
+            flush_interval: float = 0.2,
+            max_batch: int = 1000,
+            max_pending: int = 100_000
+    ):
+        super().__init__(host, port, formatter or DefaultFormatter(), flush_interval, max_batch, max_pending)
+        self._max_datagram: int = max_datagram
+        self._socket: socket.socket = socket.socket(_address_family(host), socket.SOCK_DGRAM)
+
+    def _send_messages(self, messages: list[bytes]):
+        for datagram, count in self._pack_datagrams(messages):
+            try:
+                self._socket.sendto(datagram, self._address)
+            except OSError:
+                self._worker.dropped += count
+            else:
+                self.sent += count
+
+    def _pack_datagrams(self, messages: list[bytes]) -> list[tuple[bytes, int]]:
+        """
+        :return: The datagrams to send with the number of reports they hold
+        """
+        max_datagram: int = self._max_datagram
+        datagrams: list[tuple[bytes, int]] = []
+        current: list[bytes] = []
+        size: int = -1
+        for message in messages:
+            message = message[:max_datagram]
+            if current and size + 1 + len(message) > max_datagram:
+                datagrams.append((b'\n'.join(current), len(current)))
+                current = []
+                size = -1
+
+            current.append(message)
+            size += 1 + len(message)
+
+        if current:
+            datagrams.append((b'\n'.join(current), len(current)))
+
+        return datagrams
+
+    def _disconnect(self):
+        self._socket.close()
+
+
+class ReporterOutletTCP(_ReporterOutletNetwork):
+    """
+    Sends new-line terminated reports over one persistent TCP connection, each batch with a single write.
+
+    When the peer is unreachable, the connection is retried with an exponential backoff and encoded reports are kept in
+    a spill buffer of ``max_spill`` reports, sent first once the connection is back (the connection is retried every
+    ``flush_interval`` seconds). When the spill buffer is full, the oldest reports are dropped and counted, and so are
+    the reports still spilled when the outlet is closed.
+
+    When a connection breaks during a write, the reports written in full are not sent again: only the one the connection
+    broke in and those after it are.
+    """
+    __slots__ = (
+        '_socket',
+        '_connect_timeout',
+        '_min_backoff',
+        '_max_backoff',
+        '_backoff',
+        '_next_attempt',
+        '_spill',
+        '_max_spill',
+        'reconnections'
+    )
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            formatter: BaseFormatter = None,
+            *,
+            flush_interval: float = 0.2,
+            max_batch: int = 1000,
+            max_pending: int = 100_000,
+            max_spill: int = 100_000,
+            connect_timeout: float = 2.0,
+            min_backoff: float = 0.1,
+            max_backoff: float = 30.0
+    ):
+        super().__init__(host, port, formatter or DefaultFormatter(), flush_interval, max_batch, max_pending)
+        self._socket: socket.socket | None = None
+        self._connect_timeout: float = connect_timeout
+        self._min_backoff: float = min_backoff
+        self._max_backoff: float = max_backoff
+        self._backoff: float = min_backoff
+        self._next_attempt: float = 0.0
+        self._spill: deque[bytes] = deque()
+        self._max_spill: int = max_spill
+        self.reconnections: int = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    @property
+    def spilled(self) -> int:
+        return len(self._spill)
+
+    def _frame(self, message: bytes) -> bytes:
+        return message + b'\n'
+
+    def close(self):
+        super().close()
+        # Nothing sends them anymore
+        self._worker.dropped += len(self._spill)
+        self._spill.clear()
+
+    def _send_messages(self, messages: list[bytes]):
+        frame = self._frame
+        spill: deque[bytes] = self._spill
+        spill.extend([frame(message) for message in messages])
+        overflow: int = len(spill) - self._max_spill
+        for _ in range(overflow):
+            spill.popleft()
+        if overflow > 0:
+            self._worker.dropped += overflow
+
+        self._send_spill()
+
+    def _on_interval(self):
+        if self._spill:
+            self._send_spill()
+
+    def _send_spill(self):
+        if self._socket is None and not self._connect():
+            return
+
+        spill: deque[bytes] = self._spill
+        data: memoryview = memoryview(b''.join(spill))
+        written: int = 0
+        try:
+            while written < len(data):
+                written += self._socket.send(data[written:])
+        except OSError:
+            self._disconnect()
+            self._schedule_reconnection()
+            # The frames written in full reached the peer: only the others are sent again
+            while spill and len(spill[0]) <= written:
+                written -= len(spill.popleft())
+                self.sent += 1
+            return
+
+        self.sent += len(spill)
+        spill.clear()
+
+    def _connect(self) -> bool:
+        if clock.monotonic() < self._next_attempt:
+            return False
+
+        try:
+            connection: socket.socket = socket.create_connection(self._address, timeout=self._connect_timeout)
+        except OSError:
+            self._schedule_reconnection()
+            return False
+
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._socket = connection
+        self._backoff = self._min_backoff
+        self.reconnections += 1
+        return True
+
+    def _schedule_reconnection(self):
+        self._next_attempt = clock.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self._max_backoff)
+
+    def _disconnect(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            finally:
+                self._socket = None
+
+    def _after_fork_in_child(self):
+        # The connection and the spilled reports stay with the parent: the child opens its own connection
+        self._disconnect()
+        self._spill = deque()
+        self._backoff = self._min_backoff
+        self._next_attempt = 0.0
+
+
+class ReporterOutletSyslogUDP(ReporterOutletUDP):
+    """
+    Sends RFC 5424 messages over UDP. As RFC 5426 requires, each message is sent in its own datagram: only the sending is
+    batched, on the background thread.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 514, formatter: BaseFormatter = None, **kwargs):
+        super().__init__(host, port, formatter or RFC5424Formatter(), **kwargs)
+
+    def _pack_datagrams(self, messages: list[bytes]) -> list[tuple[bytes, int]]:
+        return [(message[:self._max_datagram], 1) for message in messages]
+
+
+class ReporterOutletSyslogTCP(ReporterOutletTCP):
+    """
+    Sends RFC 5424 messages over TCP, framed with octet counting (RFC 6587)
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 601, formatter: BaseFormatter = None, **kwargs):
+        super().__init__(host, port, formatter or RFC5424Formatter(), **kwargs)
+
+    def _frame(self, message: bytes) -> bytes:
+        return b'%d %b' % (len(message), message)
+
+
+def _sd_name(name: str) -> str:
+    """
+    A valid RFC 5424 PARAM-NAME: up to 32 printable ASCII characters, other than ``=``, space, ``]`` and ``"``
+    """
+    sanitized: str | None = _SD_NAMES.get(name)
+    if sanitized is None:
+        if len(_SD_NAMES) >= _MAX_CACHED_SD_NAMES:
+            _SD_NAMES.clear()
+
+        sanitized = _SD_NAMES[name] = ''.join([
+            character if '!' <= character <= '~' and character not in '= ]"' else '_' for character in name[:32]
+        ]) or '_'
+
+    return sanitized
+
+
+def _address_family(host: str) -> socket.AddressFamily:
+    return socket.AF_INET6 if ':' in host else socket.AF_INET
+
+
+def _local_utc_offset(date_time: str) -> str:
+    """
+    The offset from UTC of the local time zone at the start of the hour of a ``YYYY-MM-DD HH...`` local date and time
+    """
+    try:
+        seconds: int | None = time.localtime(
+            time.mktime((int(date_time[:4]), int(date_time[5:7]), int(date_time[8:10]), int(date_time[11:13]), 0, 0, 0, 0, -1))
+        ).tm_gmtoff
+    except (ValueError, OverflowError):
+        seconds = None
+    if seconds is None:
+        return 'Z'
+
+    minutes: int = abs(seconds) // 60
+    return f'{"-" if seconds < 0 else "+"}{minutes // 60:02d}:{minutes % 60:02d}'
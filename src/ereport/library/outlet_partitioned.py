@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Callable, Final, TextIO
+
+from frozendict import frozendict
+
+from ereport.library import clock
+from ereport.library.fork import child_path, discard_file
+from ereport.library.formatter import BaseFormatter, DefaultFormatter
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+
+PLACEHOLDERS: Final[frozendict[str, Callable[[Report], str]]] = frozendict({
+    'reporter_name': lambda report: report.reporter_name,
+    'level': lambda report: report.level.name,
+    'module': lambda report: report.module,
+    'function': lambda report: report.function,
+    'date': lambda report: report.date_time[:10],
+    'year': lambda report: report.date_time[:4],
+    'month': lambda report: report.date_time[5:7],
+    'day': lambda report: report.date_time[8:10],
+    'hour': lambda report: report.date_time[11:13]
+})
+
+_MAX_CACHED_PATHS: Final[int] = 4096
+_PATH_ESCAPES: Final[dict[int, str]] = str.maketrans({'/': '_', '\\': '_', ':': '_'})
+
+
+class _Partition:
+    __slots__ = (
+        'file',
+        'last_used'
+    )
+
+    def __init__(self, file: TextIO, last_used: float):
+        self.file: TextIO = file
+        self.last_used: float = last_used
+
+
+class ReporterOutletPartitionedFile(ReporterOutlet):
+    """
+    Writes each report to a file whose path is expanded from a template and the report, e.g.
+    ``logs/{reporter_name}/{date}.log``. See :data:`PLACEHOLDERS` for the available placeholders.
+
+    At most ``max_handles`` buffered files are kept open, the least recently used one being closed first. Every
+    ``flush_interval`` seconds, open files are flushed and those unused for ``idle_timeout`` seconds are closed.
+    Files are always opened in append mode, their directories are created as needed, and they are closed at exit.
+    Reports emitted once the outlet is closed are dropped and counted in ``dropped``.
+
+    Placeholder values never leave their path component: separators are replaced with underscores, and so are values
+    made only of dots (``.``, ``..``) and empty values, which would change the directory the file is written to.
+    """
+    __slots__ = (
+        '_template',
+        '_getters',
+        '_paths',
+        '_partitions',
+        '_max_handles',
+        '_buffer_size',
+        '_idle_timeout',
+        '_flush_interval',
+        '_lock',
+        '_stop',
+        '_sweeper',
+        '_closed',
+        'dropped'
+    )
+
+    def __init__(
+            self,
+            path_template: str,
+            formatter: BaseFormatter = None,
+            *,
+            max_handles: int = 64,
+            buffer_size: int = 64 * 1024,
+            idle_timeout: float = 300.0,
+            flush_interval: float = 1.0
+    ):
+        """
+        :param path_template: The path of the files, with placeholders between braces
+        :param max_handles: Maximum number of files kept open at the same time
+        :param buffer_size: Size of the write buffer of each open file, in bytes
+        :param idle_timeout: Seconds after which an unused file is closed
+        :param flush_interval: Seconds between two flushes of the open files
+        """
+        super().__init__(formatter or DefaultFormatter())
+        names: list[str] = [name for _, name, _, _ in Formatter().parse(path_template) if name is not None]
+        unknown: set[str] = set(names) - set(PLACEHOLDERS)
+        if unknown:
+            raise ValueError(f'Unknown placeholders in "{path_template}": {", ".join(sorted(unknown))}')
+
+        self._template: str = path_template
+        self._getters: tuple[tuple[str, Callable[[Report], str]], ...] = tuple((name, PLACEHOLDERS[name]) for name in dict.fromkeys(names))
+        self._paths: dict[tuple[str, ...], str] = {}
+        self._partitions: OrderedDict[str, _Partition] = OrderedDict()
+        self._max_handles: int = max_handles
+        self._buffer_size: int = buffer_size
+        self._idle_timeout: float = idle_timeout
+        self._flush_interval: float = flush_interval
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._sweeper: threading.Thread = threading.Thread(target=self._sweep, name='ereport-partitioned-sweeper', daemon=True)
+        self._sweeper.start()
+        self._closed: bool = False
+        self.dropped: int = 0
+
+    @property
+    def open_partitions(self) -> tuple[str, ...]:
+        return tuple(self._partitions)
+
+    def emit(self, report: Report):
+        line: str = f'{self.formatter.format(report)}\n'
+        path: str = self._path_of(report)
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return
+
+            partition: _Partition | None = self._partitions.get(path)
+            if partition is None:
+                partition = self._open(path)
+            else:
+                self._partitions.move_to_end(path)
+
+            partition.file.write(line)
+            partition.last_used = clock.monotonic()
+
+    def emit_many(self, reports: list[Report]):
+        lines_by_path: dict[str, list[str]] = {}
+        path_of = self._path_of
+        for report, line in zip(reports, self.formatter.format_many(reports)):
+            path: str = path_of(report)
+            lines: list[str] | None = lines_by_path.get(path)
+            if lines is None:
+                lines = lines_by_path[path] = []
+            lines.append(f'{line}\n')
+
+        with self._lock:
+            if self._closed:
+                self.dropped += len(reports)
+                return
+
+            now: float = clock.monotonic()
+            for path, lines in lines_by_path.items():
+                partition: _Partition | None = self._partitions.get(path)
+                if partition is None:
+                    partition = self._open(path)
+                else:
+                    self._partitions.move_to_end(path)
+
+                partition.file.write(''.join(lines))
+                partition.last_used = now
+
+    def flush(self):
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.file.flush()
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            self._closed = True
+            while self._partitions:
+                self._partitions.popitem(last=False)[1].file.close()
+
+    def _at_exit(self):
+        self.close()
+
+    def _before_fork(self):
+        self._lock.acquire()  # pylint: disable=consider-using-with
+        for partition in self._partitions.values():
+            partition.file.flush()
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        for partition in self._partitions.values():
+            discard_file(partition.file)
+        self._partitions = OrderedDict()
+        self._lock = threading.Lock()
+        if not self._stop.is_set():
+            self._sweeper = threading.Thread(target=self._sweep, name='ereport-partitioned-sweeper', daemon=True)
+            self._sweeper.start()
+
+    def _path_of(self, report: Report) -> str:
+        key: tuple[str, ...] = tuple([getter(report) for _, getter in self._getters])
+        path: str | None = self._paths.get(key)
+        if path is None:
+            if len(self._paths) >= _MAX_CACHED_PATHS:
+                self._paths.clear()
+
+            path = self._paths[key] = self._template.format(**{
+                name: _escape(value) for (name, _), value in zip(self._getters, key)
+            })
+
+        return path
+
+    def _open(self, path: str) -> _Partition:
+        while len(self._partitions) >= self._max_handles:
+            self._partitions.popitem(last=False)[1].file.close()
+
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        partition: _Partition = _Partition(
+            open(child_path(path), 'a', encoding='utf8', buffering=self._buffer_size),  # pylint: disable=consider-using-with
+            clock.monotonic()
+        )
+        self._partitions[path] = partition
+        return partition
+
+    def _sweep(self):
+        while not self._stop.wait(self._flush_interval):
+            deadline: float = clock.monotonic() - self._idle_timeout
+            with self._lock:
+                for path, partition in list(self._partitions.items()):
+                    if partition.last_used < deadline:
+                        partition.file.close()
+                        del self._partitions[path]
+                    else:
+                        partition.file.flush()
+
+
+def _escape(value: str) -> str:
+    """
+    The value as a single path component
+    """
+    value = value.translate(_PATH_ESCAPES)
+    if not value.strip('.'):
+        return '_' * max(len(value), 1)
+
+    return value
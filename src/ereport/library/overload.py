@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Final
+
+from ereport.library import clock
+from ereport.library.fork import register_fork_handlers
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+NORMAL: Final[int] = 0
+SHEDDING_DEBUG: Final[int] = 1
+SAMPLING_INFO: Final[int] = 2
+
+STAGE_NAMES: Final[tuple[str, ...]] = ('normal', 'shedding debug', 'sampling info')
+
+
+class OverloadController:
+    """
+    Sheds reports when the outlets of a reporter cannot keep up, instead of queueing them until memory runs out or
+    dropping them without notice.
+
+    The pressure is checked every ``check_interval`` seconds, from a daemon thread, as the highest value among the
+    outlets of the fraction of their queue in use and of their lag over ``max_lag``. Shedding goes through stages:
+
+    * from ``shed_debug_at``, TRACE and DEBUG reports are dropped;
+    * from ``sample_info_at``, only one SUCCESS and INFO report out of ``info_sample_every`` is kept as well.
+
+    WARN reports and above are never dropped. A stage is left once the pressure is ``hysteresis`` below the stage's
+    threshold. When shedding stops, a WARN report tells how many reports of each level were shed.
+
+    Failures to measure the pressure are reported on stderr and counted in ``errors``. Nothing is shed until the
+    pressure can be measured again.
+
+    Counters are updated without a lock, they may miss a few reports when many threads log at once.
+    """
+    __slots__ = (
+        '_reporter',
+        '_check_interval',
+        '_max_lag',
+        '_thresholds',
+        '_hysteresis',
+        '_info_sample_every',
+        '_stage',
+        '_pressure',
+        '_peak_pressure',
+        '_sample_counter',
+        '_shed',
+        '_shedding_since',
+        '_stop',
+        '_thread',
+        'errors',
+        '__weakref__'
+    )
+
+    def __init__(
+            self,
+            reporter: Reporter,
+            *,
+            check_interval: float = 0.1,
+            max_lag: float = 5.0,
+            shed_debug_at: float = 0.5,
+            sample_info_at: float = 0.8,
+            hysteresis: float = 0.2,
+            info_sample_every: int = 10
+    ):
+        """
+        :param reporter: The reporter to protect. Reporters bound from it are protected as well.
+        :param check_interval: Seconds between two measures of the pressure
+        :param max_lag: Lag, in seconds, considered as a full queue
+        :param shed_debug_at: Pressure from which TRACE and DEBUG reports are dropped
+        :param sample_info_at: Pressure from which SUCCESS and INFO reports are sampled
+        :param hysteresis: How far below its threshold the pressure must go for a stage to be left
+        :param info_sample_every: One SUCCESS or INFO report out of this many is kept while sampling
+        """
+        self._reporter: Reporter = reporter
+        self._check_interval: float = check_interval
+        self._max_lag: float = max_lag
+        self._thresholds: tuple[float, ...] = (shed_debug_at, sample_info_at)
+        self._hysteresis: float = hysteresis
+        self._info_sample_every: int = info_sample_every
+        self._stage: int = NORMAL
+        self._pressure: float = 0.0
+        self._peak_pressure: float = 0.0
+        self._sample_counter: int = 0
+        self._shed: dict[Level, int] = {}
+        self._shedding_since: float = 0.0
+        self._stop: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.errors: int = 0
+        register_fork_handlers(self)
+
+    @property
+    def stage(self) -> int:
+        """
+        One of :data:`NORMAL`, :data:`SHEDDING_DEBUG` and :data:`SAMPLING_INFO`
+        """
+        return self._stage
+
+    @property
+    def pressure(self) -> float:
+        """
+        The pressure last measured, from 0 (idle) to 1 (a queue is full or lags by ``max_lag``)
+        """
+        return self._pressure
+
+    @property
+    def shed(self) -> dict[Level, int]:
+        """
+        Reports shed per level since shedding started. Emptied once the summary is reported.
+        """
+        return dict(self._shed)
+
+    def start(self) -> OverloadController:
+        """
+        Starts measuring the pressure and plugs the controller into the reporter
+        """
+        self._reporter.set_overload_controller(self)
+        self._thread = threading.Thread(target=self._run, name='ereport-overload', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Unplugs the controller from the reporter, reporting what was shed if anything was
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._reporter.set_overload_controller(None)
+        self._stage = NORMAL
+        self._report_summary()
+
+    def admit(self, level: Level) -> bool:
+        """
+        Tells whether a report of the provided level may go to the outlets. Called by the reporter for each report.
+        """
+        stage: int = self._stage
+        if stage == NORMAL or level.weight >= Levels.WARN.weight:
+            return True
+
+        if level.weight >= Levels.SUCCESS.weight:
+            if stage < SAMPLING_INFO:
+                return True
+
+            self._sample_counter += 1
+            if self._sample_counter % self._info_sample_every == 0:
+                return True
+
+        self._shed[level] = self._shed.get(level, 0) + 1
+        return False
+
+    def measure(self) -> float:
+        """
+        Measures the pressure on the reporter's outlets and updates the stage
+        """
+        pressure: float = 0.0
+        outlet: ReporterOutlet
+        for outlet in self._reporter.get_all_outlets():
+            fill, lag = outlet.pressure()
+            pressure = max(pressure, fill, lag / self._max_lag)
+
+        self._pressure = pressure = min(pressure, 1.0)
+        stage: int = self._stage
+        while stage < len(self._thresholds) and pressure >= self._thresholds[stage]:
+            stage += 1
+        while stage > NORMAL and pressure < self._thresholds[stage - 1] - self._hysteresis:
+            stage -= 1
+
+        if stage != NORMAL:
+            if self._stage == NORMAL:
+                self._shedding_since = clock.monotonic()
+                self._peak_pressure = 0.0
+            self._peak_pressure = max(self._peak_pressure, pressure)
+
+        was_shedding: bool = self._stage != NORMAL
+        self._stage = stage
+        if was_shedding and stage == NORMAL:
+            self._report_summary()
+
+        return pressure
+
+    def _after_fork_in_child(self):
+        self._shed = {}
+        if self._thread is not None and not self._stop.is_set():
+            self._thread = threading.Thread(target=self._run, name='ereport-overload', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self._check_interval):
+            try:
+                self.measure()
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors += 1
+                self._stage = NORMAL
+                print(f'Could not measure the pressure on the outlets of reporter {self._reporter.name}: {error!r}', file=sys.stderr)
+
+    def _report_summary(self):
+        shed: dict[Level, int] = self._shed
+        if not shed:
+            return
+
+        self._shed = {}
+        counts: str = ', '.join(f'{level.name}: {count}' for level, count in sorted(shed.items(), key=lambda item: item[0].weight))
+        self._reporter.log_report(Report(
+            level=Levels.WARN,
+            module='overload',
+            function='summary',
+            line=0,
+            message=f'Shed {sum(shed.values())} reports over {clock.monotonic() - self._shedding_since:.1f}s '
+                    f'({counts}), peak pressure {self._peak_pressure:.2f}',
+            reporter_name=self._reporter.name
+        ))
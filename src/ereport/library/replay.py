@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import gzip
+import json
+import mmap
+import os
+import re
+import time
+from fnmatch import fnmatchcase
+from typing import BinaryIO, Callable, Final, Iterable, Iterator
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from frozendict import frozendict
+
+from ereport.library.level import _STRING_TO_LEVEL, Level, Levels
+from ereport.library.report import Report
+
+CHUNK_SIZE: Final[int] = 1 << 20
+
+_ANSI_ESCAPE: Final[re.Pattern] = re.compile(r'\x1b\[[0-9;]*m')
+_TEXT_HEADER: Final[re.Pattern] = re.compile(
+    r'\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{6})] '
+    r'\[ *([A-Z]+) *] '
+    r'\[ *(.*?) *] '
+    r'\[\((\d+)\) (.*?) *::(.*?) *] '
+    r'(.*)'
+)
+
+
+def iter_lines(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields the lines of a file, without their line terminator, reading at most ``chunk_size`` bytes at a time.
+
+    Plain files are memory mapped. ``.gz`` files, and ``.zst`` files when ``zstandard`` is installed, are decompressed
+    as a stream.
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as file:
+            yield from _split_chunks(lambda: file.read(chunk_size))
+        return
+
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError('Reading ".zst" files requires the "zstandard" package')
+
+        with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True) as file:
+            yield from _split_chunks(lambda: file.read(chunk_size))
+        return
+
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position: list[int] = [0]
+
+            def read() -> bytes:
+                chunk: bytes = mapped[position[0]:position[0] + chunk_size]
+                position[0] += len(chunk)
+                return chunk
+
+            yield from _split_chunks(read)
+
+
+def follow_lines(path: str, *, from_start: bool = False, poll_interval: float = 0.25, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | None]:
+    """
+    Yields the lines appended to a file, like ``tail -f``. ``None`` is yielded each time no new data is available.
+
+    When the file is truncated or replaced (e.g. rotated), it is read again from its start.
+    """
+    file: BinaryIO = open(path, 'rb')  # pylint: disable=consider-using-with
+    try:
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+
+        pending: bytes = b''
+        while True:
+            chunk: bytes = file.read(chunk_size)
+            if chunk:
+                lines: list[bytes] = (pending + chunk).split(b'\n')
+                pending = lines.pop()
+                yield from lines
+                continue
+
+            yield None
+            time.sleep(poll_interval)
+            if _was_replaced(path, file):
+                file.close()
+                file = open(path, 'rb')  # pylint: disable=consider-using-with
+                pending = b''
+    finally:
+        file.close()
+
+
+def parse_reports(lines: Iterable[bytes | None], minimum_level: Level | None = None) -> Iterator[Report]:
+    """
+    Parses lines written by the text formatters (colored or not) or by :class:`JSONFormatter` back to reports.
+
+    Lines following a text report that do not start a new one are considered to be its traceback. A report is yielded
+    once the next one starts, at the end of the lines, or when ``None`` is met (meaning no more lines are available yet).
+    Lines that cannot be parsed and do not follow a report are skipped.
+
+    :param minimum_level: When provided, the lines of :class:`DefaultFormatter` reports below this level are skipped
+                          before being decoded or parsed
+    """
+    current: Report | None = None
+    continuation: list[str] = []
+    skipped_levels: frozenset[bytes] = frozenset(
+        name.upper().encode() for name, level in _STRING_TO_LEVEL.items() if minimum_level is not None and level < minimum_level
+    )
+
+    for raw in lines:
+        if raw is None:
+            if current is not None:
+                yield _complete(current, continuation)
+                current, continuation = None, []
+            continue
+
+        if skipped_levels and raw[27:30] == b'] [' and raw[30:39].split(b']', 1)[0].strip() in skipped_levels:
+            if current is not None:
+                yield _complete(current, continuation)
+                current, continuation = None, []
+            continue
+
+        line: str = raw.decode('utf8', errors='replace').rstrip('\r')
+        if '\x1b' in line:
+            line = _ANSI_ESCAPE.sub('', line)
+
+        report: Report | None = _parse_line(line)
+        if report is None:
+            if current is not None:
+                continuation.append(line)
+            continue
+
+        if current is not None:
+            yield _complete(current, continuation)
+            continuation = []
+        current = report
+
+    if current is not None:
+        yield _complete(current, continuation)
+
+
+def make_filter(
+        *,
+        level: Level | None = None,
+        reporters: Iterable[str] | None = None,
+        modules: Iterable[str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        pattern: str | None = None
+) -> Callable[[Report], bool]:
+    """
+    Builds a predicate keeping the reports matching every provided criterion.
+
+    :param level: Minimum level
+    :param reporters: Reporter names, case-insensitive
+    :param modules: Module names, shell-style wildcards accepted
+    :param since: Inclusive lower bound of the report's date and time, e.g. ``2023-06-01`` or ``2023-06-01 13:30``
+    :param until: Exclusive upper bound of the report's date and time
+    :param pattern: Regular expression searched in the message
+    """
+    checks: list[Callable[[Report], bool]] = []
+    if level is not None:
+        checks.append(lambda report: report.level >= level)
+    if reporters:
+        names: frozenset[str] = frozenset(name.upper() for name in reporters)
+        checks.append(lambda report: report.reporter_name.upper() in names)
+    if modules:
+        module_patterns: tuple[str, ...] = tuple(modules)
+        checks.append(lambda report: any(fnmatchcase(report.module, module_pattern) for module_pattern in module_patterns))
+    if since:
+        lower: str = since.replace('T', ' ')
+        checks.append(lambda report: report.date_time >= lower)
+    if until:
+        upper: str = until.replace('T', ' ')
+        checks.append(lambda report: report.date_time < upper)
+    if pattern:
+        search = re.compile(pattern).search
+        checks.append(lambda report: search(report.message) is not None)
+
+    if not checks:
+        return lambda report: True
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda report: all(check(report) for check in checks)
+
+
+def _split_chunks(read: Callable[[], bytes]) -> Iterator[bytes]:
+    pending: bytes = b''
+    while True:
+        chunk: bytes = read()
+        if not chunk:
+            break
+
+        lines: list[bytes] = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+
+    if pending:
+        yield pending
+
+
+def _parse_line(line: str) -> Report | None:
+    if line.startswith('{'):
+        return _parse_json_line(line)
+
+    match: re.Match | None = _TEXT_HEADER.match(line)
+    if match is None:
+        return None
+
+    date_time, level, reporter_name, line_number, module, function, message = match.groups()
+    try:
+        parsed_level: Level = Levels.parse_from_string(level)
+    except KeyError:
+        return None
+
+    return Report(parsed_level, module, function, int(line_number), message, reporter_name, date_time)
+
+
+def _parse_json_line(line: str) -> Report | None:
+    try:
+        document: dict = json.loads(line)
+        return Report(
+            level=Levels.parse_from_string(document['level']),
+            module=document.get('module', ''),
+            function=document.get('function', ''),
+            line=document.get('line', 0),
+            message=document.get('message', ''),
+            reporter_name=document.get('reporter_name', ''),
+            date_time=document['date_time'],
+            exc_info=document.get('exc_info'),
+            fields=frozendict(document.get('fields') or {})
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _complete(report: Report, continuation: list[str]) -> Report:
+    if continuation:
+        report.exc_info = '\n'.join(continuation)
+
+    return report
+
+
+def _was_replaced(path: str, file: BinaryIO) -> bool:
+    try:
+        status: os.stat_result = os.stat(path)
+    except FileNotFoundError:
+        return False
+
+    opened: os.stat_result = os.fstat(file.fileno())
+    return status.st_ino != opened.st_ino or status.st_size < file.tell()
@@ -1,16 +1,45 @@
+from typing import Any, Final, Mapping
+
 from ereport.library._internal.date_util import current_yyyy_mm_dd_hh_ii_ss_ffff
+from ereport.library._internal.names import NAMES
+from ereport.library._internal.traceback_cache import ExcInfo
+from ereport.library.context import EMPTY_FIELDS
 from ereport.library.level import Level
 
 
 class Report:
+    """
+    A report made by a reporter.
+
+    Module, function and reporter names are kept as IDs of :data:`ereport.library._internal.names.NAMES`, so reports
+    buffered by the thousands share a single copy of each name. They are read and written as strings.
+
+    When made with ``args``, the message is a template: its text is only built on first access of :attr:`message`.
+    """
     __slots__ = (
+        'date_time',
+        'level',
+        'module_id',
+        'function_id',
+        'line',
+        '_message',
+        'reporter_id',
+        'exc_info',
+        'fields',
+        'template',
+        'args'
+    )
+
+    ATTRIBUTES: Final[tuple[str, ...]] = (
         'date_time',
         'level',
         'module',
         'function',
         'line',
         'message',
-        'reporter_name'
+        'reporter_name',
+        'exc_info',
+        'fields'
     )
 
     def __init__(
@@ -21,12 +50,57 @@ class Report:
             line: int,
             message: str,
             reporter_name: str,
-            date_time: str = None
+            date_time: str = None,
+            exc_info: ExcInfo = None,
+            fields: Mapping[str, Any] = EMPTY_FIELDS,
+            args: tuple = ()
     ):
         self.date_time: str = date_time if date_time else current_yyyy_mm_dd_hh_ii_ss_ffff()
         self.level: Level = level
-        self.module: str = module
-        self.function: str = function
+        self.module_id: int = NAMES.intern(module)
+        self.function_id: int = NAMES.intern(function)
         self.line: int = line
-        self.message: str = message
-        self.reporter_name: str = reporter_name
+        self._message: str | None = None if args else message
+        self.template: str | None = message if args else None
+        self.args: tuple = args
+        self.reporter_id: int = NAMES.intern(reporter_name)
+        self.exc_info: ExcInfo = exc_info
+        self.fields: Mapping[str, Any] = fields
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            try:
+                self._message = self.template.format(*self.args)
+            except (IndexError, KeyError, ValueError, TypeError, AttributeError):
+                self._message = f'{self.template} {self.args!r}'
+
+        return self._message
+
+    @message.setter
+    def message(self, value: str):
+        self._message = value
+
+    @property
+    def module(self) -> str:
+        return NAMES.name(self.module_id)
+
+    @module.setter
+    def module(self, value: str):
+        self.module_id = NAMES.intern(value)
+
+    @property
+    def function(self) -> str:
+        return NAMES.name(self.function_id)
+
+    @function.setter
+    def function(self, value: str):
+        self.function_id = NAMES.intern(value)
+
+    @property
+    def reporter_name(self) -> str:
+        return NAMES.name(self.reporter_id)
+
+    @reporter_name.setter
+    def reporter_name(self, value: str):
+        self.reporter_id = NAMES.intern(value)
@@ -1,22 +1,49 @@
 from __future__ import annotations
 
 import os
-from inspect import currentframe
+from sys import _getframe
+from types import CodeType, FrameType
+from typing import TYPE_CHECKING, Any, Final, Iterable
+from weakref import WeakSet
 
+from frozendict import frozendict
+
+from ereport.library._internal import callsite
+from ereport.library._internal.traceback_cache import ExcInfo, capture_exc_info
+from ereport.library.context import EMPTY_FIELDS, get_context, merge_fields
 from ereport.library.formatter import AdaptativeColoredFormatter
 from ereport.library.outlet import ReporterOutlet, ReporterOutletStdOut
-from ereport.library.level import Level, Levels
+from ereport.library.level import Level, LevelRule, Levels
 from ereport.library.report import Report
 
+if TYPE_CHECKING:
+    from ereport.library.overload import OverloadController
+
+_MAX_CACHED_CODES: Final[int] = 4096
+_MAX_CACHED_CALL_SITES: Final[int] = 4096
+
+# Keyed by the code object's id, kept alive by the value so that the id is not reused while cached
+_CODE_NAMES: dict[int, tuple[CodeType, tuple[str, str]]] = {}
+
 
 class Reporter:
     """
     Reporter class
+
+    A message given with ``args`` is a template, only formatted with :meth:`str.format` when an outlet needs its text,
+    e.g. ``reporter.info('User {} logged in from {}', args=(user, address))``.
     """
     __slots__ = (
         '_outlets',
         '_level',
-        '_reporter_name'
+        '_reporter_name',
+        '_fields',
+        '_children',
+        '_rules',
+        '_call_sites',
+        '_call_sites_generation',
+        '_overload',
+        '__weakref__'
     )
 
     _instances: dict[str, Reporter] = {}
@@ -29,6 +56,14 @@ class Reporter:
         ]
         self._level: Level = level
         self._reporter_name: str = name.upper()
+        self._fields: frozendict = EMPTY_FIELDS
+        self._children: WeakSet[Reporter] = WeakSet()
+        self._rules: tuple[LevelRule, ...] = ()
+        # Keyed by the code object's id, cheaper to hash than the code object. The value keeps the code object alive, so
+        # its id is not reused while cached. Emptied when full, as code made on the fly would make it grow for ever.
+        self._call_sites: dict[tuple[int, int, int], tuple[CodeType, bool]] = {}
+        self._call_sites_generation: int = callsite.generation
+        self._overload: OverloadController | None = None
         Reporter._instances[name.upper()] = self
 
     @classmethod
@@ -51,11 +86,67 @@ class Reporter:
 
     @level.setter
     def level(self, value: Level):
-        self.level = value
+        """
+        Changes the level of this reporter and of the reporters bound from it
+        """
+        self._level = value
+        for child in tuple(self._children):
+            child.level = value
+        callsite.invalidate_call_sites()
+
+    @property
+    def rules(self) -> tuple[LevelRule, ...]:
+        return self._rules
+
+    def add_level_rule(self, level: Level, module: str | None = None, function: str | None = None) -> Reporter:
+        """
+        Overrides the level of this reporter for the call sites of the matching modules and/or functions. When several
+        rules match a call site, the last one added wins.
+
+        Whether a call site is enabled is decided once, then cached until a level or a rule changes.
+        """
+        return self.set_level_rules(self._rules + (LevelRule(level, module, function),))
+
+    def set_level_rules(self, rules: Iterable[LevelRule]) -> Reporter:
+        """
+        Replaces all the level rules of this reporter and of the reporters bound from it
+        """
+        self._replace_rules(tuple(rules))
+        callsite.invalidate_call_sites()
+        return self
+
+    def _replace_rules(self, rules: tuple[LevelRule, ...]):
+        self._rules = rules
+        for child in tuple(self._children):
+            child._replace_rules(rules)
 
     @property
     def name(self) -> str:
-        return self.name
+        return self._reporter_name
+
+    @property
+    def fields(self) -> frozendict:
+        return self._fields
+
+    def bind(self, **fields: Any) -> Reporter:
+        """
+        Makes a child reporter which adds the provided fields to each of its reports.
+
+        The child shares the outlets of this reporter and is not registered as a named instance. Fields are kept in an
+        immutable mapping shared by every report of the child.
+        """
+        child: Reporter = object.__new__(type(self))
+        child._outlets = self._outlets
+        child._level = self._level
+        child._reporter_name = self._reporter_name
+        child._fields = merge_fields(self._fields, fields)
+        child._children = WeakSet()
+        child._rules = self._rules
+        child._call_sites = {}
+        child._call_sites_generation = callsite.generation
+        child._overload = self._overload
+        self._children.add(child)
+        return child
 
     def add_outlet(self, outlet: ReporterOutlet) -> Reporter:
         self._outlets.append(outlet)
@@ -68,7 +159,67 @@ class Reporter:
     def get_all_outlets(self) -> tuple[ReporterOutlet]:
         return tuple(self._outlets)
 
-    def _log(self, report: Report):
+    def set_outlets(self, outlets: Iterable[ReporterOutlet]) -> Reporter:
+        """
+        Replaces all the outlets of this reporter and of the reporters bound from it at once. Reports being logged while
+        the outlets are replaced go entirely to either the previous or the new outlets.
+        """
+        self._replace_outlets(list(outlets))
+        return self
+
+    def _replace_outlets(self, outlets: list[ReporterOutlet]):
+        self._outlets = outlets
+        for child in tuple(self._children):
+            child._replace_outlets(outlets)
+
+    def configure(
+            self,
+            level: Level | None = None,
+            rules: Iterable[LevelRule] | None = None,
+            outlets: Iterable[ReporterOutlet] | None = None
+    ) -> Reporter:
+        """
+        Replaces the level, the level rules and the outlets of this reporter and of the reporters bound from it together,
+        in a single pass over them, then invalidates the cached call sites once. Those left to None are kept.
+        """
+        self._replace_settings(level, tuple(rules) if rules is not None else None, list(outlets) if outlets is not None else None)
+        callsite.invalidate_call_sites()
+        return self
+
+    def _replace_settings(self, level: Level | None, rules: tuple[LevelRule, ...] | None, outlets: list[ReporterOutlet] | None):
+        if outlets is not None:
+            self._outlets = outlets
+        if rules is not None:
+            self._rules = rules
+        if level is not None:
+            self._level = level
+        for child in tuple(self._children):
+            child._replace_settings(level, rules, outlets)
+
+    def set_overload_controller(self, controller: OverloadController | None) -> Reporter:
+        """
+        Lets a controller drop reports of this reporter and of the reporters bound from it, see :meth:`OverloadController.start`
+        """
+        self._overload = controller
+        for child in tuple(self._children):
+            child.set_overload_controller(controller)
+        return self
+
+    def enabled_for(self, level: Level, module: str, function: str) -> bool:
+        """
+        Tells whether a report of the provided level, logged from the provided module and function, passes the level
+        of this reporter and its level rules. Nothing is cached, see the level methods for call sites.
+        """
+        return self._threshold(module, function).can_log(level)
+
+    def log_report(self, report: Report):
+        """
+        Logs a report built outside of the level methods, e.g. from another logging library, unless the overload
+        controller sheds it. The level and the level rules are not checked, see :meth:`enabled_for`.
+        """
+        if self._overload is not None and not self._overload.admit(report.level):
+            return
+
         [outlet.emit(report) for outlet in self._outlets]
 
     def trace(
@@ -77,17 +228,15 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.TRACE):
-            self._log(Report(
-                level=Levels.TRACE,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if (
+            (self._call_site_enabled(Levels.TRACE, stack_level) if self._rules else self._level.can_log(Levels.TRACE))
+            and (self._overload is None or self._overload.admit(Levels.TRACE))
+        ):
+            self._report(Levels.TRACE, message, module, function, line, stack_level, exc_info, args)
 
     def debug(
             self,
@@ -95,17 +244,15 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.DEBUG):
-            self._log(Report(
-                level=Levels.DEBUG,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if (
+            (self._call_site_enabled(Levels.DEBUG, stack_level) if self._rules else self._level.can_log(Levels.DEBUG))
+            and (self._overload is None or self._overload.admit(Levels.DEBUG))
+        ):
+            self._report(Levels.DEBUG, message, module, function, line, stack_level, exc_info, args)
 
     def success(
             self,
@@ -113,17 +260,15 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.SUCCESS):
-            self._log(Report(
-                level=Levels.SUCCESS,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if (
+            (self._call_site_enabled(Levels.SUCCESS, stack_level) if self._rules else self._level.can_log(Levels.SUCCESS))
+            and (self._overload is None or self._overload.admit(Levels.SUCCESS))
+        ):
+            self._report(Levels.SUCCESS, message, module, function, line, stack_level, exc_info, args)
 
     def info(
             self,
@@ -131,17 +276,15 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.INFO):
-            self._log(Report(
-                level=Levels.INFO,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if (
+            (self._call_site_enabled(Levels.INFO, stack_level) if self._rules else self._level.can_log(Levels.INFO))
+            and (self._overload is None or self._overload.admit(Levels.INFO))
+        ):
+            self._report(Levels.INFO, message, module, function, line, stack_level, exc_info, args)
 
     def warn(
             self,
@@ -149,17 +292,12 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.WARN):
-            self._log(Report(
-                level=Levels.WARN,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if self._call_site_enabled(Levels.WARN, stack_level) if self._rules else self._level.can_log(Levels.WARN):
+            self._report(Levels.WARN, message, module, function, line, stack_level, exc_info, args)
 
     def error(
             self,
@@ -167,17 +305,12 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.ERROR):
-            self._log(Report(
-                level=Levels.ERROR,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if self._call_site_enabled(Levels.ERROR, stack_level) if self._rules else self._level.can_log(Levels.ERROR):
+            self._report(Levels.ERROR, message, module, function, line, stack_level, exc_info, args)
 
     def severe(
             self,
@@ -185,17 +318,12 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.SEVERE):
-            self._log(Report(
-                level=Levels.SEVERE,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
+        if self._call_site_enabled(Levels.SEVERE, stack_level) if self._rules else self._level.can_log(Levels.SEVERE):
+            self._report(Levels.SEVERE, message, module, function, line, stack_level, exc_info, args)
 
     def fatal(
             self,
@@ -203,52 +331,119 @@ class Reporter:
             module: str | None = None,
             function: str | None = None,
             line: int | None = None,
-            stack_level: int = 0
+            stack_level: int = 0,
+            exc_info: BaseException | ExcInfo | bool = None,
+            args: tuple = ()
     ):
-        if self._level.can_log(Levels.FATAL):
-            self._log(Report(
-                level=Levels.FATAL,
-                module=module or self._find_module(),
-                function=function or self._find_function(stack_level),
-                line=line or self._find_line_number(),
-                message=message,
-                reporter_name=self._reporter_name
-            ))
-
-    def _find_module(self, stack_level: int) -> str:
-        name: str = ''
+        if self._call_site_enabled(Levels.FATAL, stack_level) if self._rules else self._level.can_log(Levels.FATAL):
+            self._report(Levels.FATAL, message, module, function, line, stack_level, exc_info, args)
+
+    def _call_site_enabled(self, level: Level, stack_level: int) -> bool:
+        """
+        Tells whether the caller of the level method may log at the provided level, considering the level rules.
+        Must be called directly from the level method.
+        """
+        frame: FrameType = _getframe(2 + stack_level)
+        if self._call_sites_generation != callsite.generation:
+            self._call_sites = {}
+            self._call_sites_generation = callsite.generation
+
+        code: CodeType = frame.f_code
+        # The instruction offset identifies the call site: unlike the line number, it is read without scanning the code
+        key: tuple[int, int, int] = (id(code), frame.f_lasti, level.weight)
+        cached: tuple[CodeType, bool] | None = self._call_sites.get(key)
+        if cached is not None:
+            return cached[1]
+
+        enabled: bool = self._threshold(*Reporter._names_of(frame)).can_log(level)
+        if len(self._call_sites) >= _MAX_CACHED_CALL_SITES:
+            self._call_sites = {}
+        self._call_sites[key] = (code, enabled)
+        return enabled
+
+    def _threshold(self, module: str, function: str) -> Level:
+        """
+        The level required from a module and function: that of the last matching rule, the reporter's otherwise
+        """
+        threshold: Level = self._level
+        for rule in self._rules:
+            if rule.matches(module, function):
+                threshold = rule.level
+        return threshold
+
+    def _report(
+            self,
+            level: Level,
+            message: str,
+            module: str | None,
+            function: str | None,
+            line: int | None,
+            stack_level: int,
+            exc_info: BaseException | ExcInfo | bool,
+            args: tuple = ()
+    ):
+        """
+        Builds the report of a level method and logs it. Must be called directly from the level method, as the caller is
+        found two frames above this one. The level method already asked the overload controller, if any.
+        """
         try:
-            frame = currentframe().f_back
-            for level in range(stack_level):
-                frame = frame.f_back
+            frame = _getframe(2 + stack_level)
+        except ValueError:
+            print(f'Could not find frame at level {2 + stack_level}')
+            frame = None
+
+        frame_module, frame_function = Reporter._names_of(frame)
+        report: Report = Report(
+            level=level,
+            module=module or frame_module,
+            function=function or frame_function,
+            line=line or (frame.f_lineno if frame else 0),
+            message=message,
+            reporter_name=self._reporter_name,
+            exc_info=capture_exc_info(exc_info),
+            fields=merge_fields(get_context(), self._fields),
+            args=args
+        )
+        [outlet.emit(report) for outlet in self._outlets]
 
-            name = frame.f_code.co_filename
-        except AttributeError:
-            print(f'Could not find frame at level {1 + stack_level}')
-            return name
+    @staticmethod
+    def _names_of(frame: FrameType | None) -> tuple[str, str]:
+        """
+        The module and function names of a frame, computed once per code object
+        """
+        if frame is None:
+            return '', ''
 
-        return os.path.normcase(name).replace('\\', '/').split('/')[-1].split('.')[0]
+        code: CodeType = frame.f_code
+        cached: tuple[CodeType, tuple[str, str]] | None = _CODE_NAMES.get(id(code))
+        if cached is not None:
+            return cached[1]
 
-    def _find_function(self, stack_level: int) -> str:
-        name: str = ''
-        try:
-            frame = currentframe().f_back.f_back
-            for level in range(stack_level):
-                frame = frame.f_back
+        if len(_CODE_NAMES) >= _MAX_CACHED_CODES:
+            _CODE_NAMES.clear()
 
-            name = frame.f_code.co_name
-        except AttributeError:
-            print(f'Could not find frame at level {2 + stack_level}')
+        names: tuple[str, str] = (Reporter._find_module(frame), Reporter._find_function(frame))
+        _CODE_NAMES[id(code)] = (code, names)
+        return names
+
+    @staticmethod
+    def _find_module(frame: FrameType | None) -> str:
+        if frame is None:
+            return ''
 
+        return os.path.normcase(frame.f_code.co_filename).replace('\\', '/').split('/')[-1].split('.')[0]
+
+    @staticmethod
+    def _find_function(frame: FrameType | None) -> str:
+        if frame is None:
+            return ''
+
+        name: str = frame.f_code.co_name
         if name == '<module>':
             return '<module-level>'
 
         return name
 
-    def _find_line_number(self) -> int:
-        return currentframe().f_back.f_back.f_lineno
-
-
 if __name__ == '__main__':
     r = Reporter('test', Levels.TRACE)
     r.trace('Ceci est un test')
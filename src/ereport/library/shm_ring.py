@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import threading
+from multiprocessing import shared_memory
+from typing import Final, Iterable
+
+from frozendict import frozendict
+
+from ereport.library._internal.traceback_cache import render_exc_info
+from ereport.library.context import EMPTY_FIELDS
+from ereport.library.formatter import BaseFormatter
+from ereport.library.level import Level, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+_POSITION: Final[struct.Struct] = struct.Struct('<Q')
+_LENGTH: Final[struct.Struct] = struct.Struct('<I')
+_RECORD_HEADER: Final[struct.Struct] = struct.Struct('<26sBIHHHIII')
+_HEAD_OFFSET: Final[int] = 0
+_TAIL_OFFSET: Final[int] = 64
+_DATA_OFFSET: Final[int] = 128
+_MAX_NAME_BYTES: Final[int] = 0xFFFF
+
+_LEVELS_BY_WEIGHT: Final[dict[int, Level]] = {
+    level.weight: level for level in vars(Levels).values() if isinstance(level, Level)
+}
+
+
+class SharedMemoryRing:
+    """
+    A single-producer, single-consumer ring buffer of variable-size records in shared memory.
+
+    The producer only writes the head position and the consumer only writes the tail position, each on its own cache
+    line, so neither side takes a lock. Positions only grow, the offset in the buffer being the position modulo the
+    capacity. Records wrap around the end of the buffer.
+    """
+    __slots__ = (
+        '_memory',
+        '_buffer',
+        '_capacity',
+        '_owner',
+        '_head',
+        '_tail',
+        'dropped'
+    )
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory: shared_memory.SharedMemory = memory
+        self._buffer: memoryview = memory.buf
+        self._capacity: int = memory.size - _DATA_OFFSET
+        self._owner: bool = owner
+        self._head: int = _POSITION.unpack_from(self._buffer, _HEAD_OFFSET)[0]
+        self._tail: int = _POSITION.unpack_from(self._buffer, _TAIL_OFFSET)[0]
+        self.dropped: int = 0
+
+    @classmethod
+    def create(cls, size: int = 4 * 1024 * 1024, name: str | None = None) -> SharedMemoryRing:
+        """
+        Creates a ring. The creating process owns it and unlinks it on :meth:`close`.
+        """
+        memory: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, create=True, size=_DATA_OFFSET + size)
+        memory.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        return cls(memory, True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedMemoryRing:
+        """
+        Attaches to a ring created by another process
+        """
+        if sys.version_info >= (3, 13):
+            memory: shared_memory.SharedMemory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Processes started by multiprocessing share the creator's resource tracker, which unlinks the segment only
+            # once the creator is gone
+            memory = shared_memory.SharedMemory(name=name)
+
+        return cls(memory, False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def used(self) -> int:
+        """
+        Number of bytes written and not yet read
+        """
+        return _POSITION.unpack_from(self._buffer, _HEAD_OFFSET)[0] - _POSITION.unpack_from(self._buffer, _TAIL_OFFSET)[0]
+
+    def write(self, payload: bytes) -> bool:
+        """
+        Producer side. Appends a record without blocking.
+
+        :return: False when the ring does not have enough free space, the record being dropped and counted
+        """
+        size: int = _LENGTH.size + len(payload)
+        tail: int = _POSITION.unpack_from(self._buffer, _TAIL_OFFSET)[0]
+        if size > self._capacity - (self._head - tail):
+            self.dropped += 1
+            return False
+
+        offset: int = self._copy_in(self._head, _LENGTH.pack(len(payload)))
+        self._copy_in(offset, payload)
+        self._head += size
+        _POSITION.pack_into(self._buffer, _HEAD_OFFSET, self._head)
+        return True
+
+    def read_all(self, limit: int = 10_000) -> list[bytes]:
+        """
+        Consumer side. Takes at most ``limit`` records, releasing their space at once.
+        """
+        head: int = _POSITION.unpack_from(self._buffer, _HEAD_OFFSET)[0]
+        tail: int = self._tail
+        records: list[bytes] = []
+        while tail < head and len(records) < limit:
+            length: int = _LENGTH.unpack(self._copy_out(tail, _LENGTH.size))[0]
+            records.append(self._copy_out(tail + _LENGTH.size, length))
+            tail += _LENGTH.size + length
+
+        if tail != self._tail:
+            self._tail = tail
+            _POSITION.pack_into(self._buffer, _TAIL_OFFSET, tail)
+
+        return records
+
+    def close(self):
+        self._buffer = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def _copy_in(self, position: int, data: bytes) -> int:
+        offset: int = position % self._capacity
+        first: int = min(len(data), self._capacity - offset)
+        self._buffer[_DATA_OFFSET + offset:_DATA_OFFSET + offset + first] = data[:first]
+        if first < len(data):
+            self._buffer[_DATA_OFFSET:_DATA_OFFSET + len(data) - first] = data[first:]
+
+        return position + len(data)
+
+    def _copy_out(self, position: int, length: int) -> bytes:
+        offset: int = position % self._capacity
+        first: int = min(length, self._capacity - offset)
+        data: bytes = bytes(self._buffer[_DATA_OFFSET + offset:_DATA_OFFSET + offset + first])
+        if first < length:
+            data += bytes(self._buffer[_DATA_OFFSET:_DATA_OFFSET + length - first])
+
+        return data
+
+
+def encode_report(report: Report) -> bytes:
+    """
+    Encodes a report as a compact binary record. The traceback is rendered, fields are encoded as JSON.
+    """
+    module: bytes = _encode_name(report.module)
+    function: bytes = _encode_name(report.function)
+    reporter_name: bytes = _encode_name(report.reporter_name)
+    message: bytes = report.message.encode('utf8')
+    exc_text: bytes = render_exc_info(report.exc_info).encode('utf8') if report.exc_info else b''
+    fields: bytes = json.dumps(dict(report.fields), default=str).encode('utf8') if report.fields else b''
+    return _RECORD_HEADER.pack(
+        report.date_time.encode('ascii'),
+        report.level.weight,
+        report.line,
+        len(module),
+        len(function),
+        len(reporter_name),
+        len(message),
+        len(exc_text),
+        len(fields)
+    ) + module + function + reporter_name + message + exc_text + fields
+
+
+def _encode_name(name: str) -> bytes:
+    """
+    The name encoded in at most :data:`_MAX_NAME_BYTES` bytes, cut between two characters
+    """
+    encoded: bytes = name.encode('utf8')
+    if len(encoded) <= _MAX_NAME_BYTES:
+        return encoded
+
+    # Continuation bytes of a character cut in the middle are left out
+    return encoded[:_MAX_NAME_BYTES].decode('utf8', errors='ignore').encode('utf8')
+
+
+def decode_report(record: bytes) -> Report:
+    date_time, weight, line, module_length, function_length, reporter_length, message_length, exc_length, fields_length = \
+        _RECORD_HEADER.unpack_from(record)
+    module_end: int = _RECORD_HEADER.size + module_length
+    function_end: int = module_end + function_length
+    reporter_end: int = function_end + reporter_length
+    message_end: int = reporter_end + message_length
+    exc_end: int = message_end + exc_length
+    exc_text: str | None = record[message_end:exc_end].decode('utf8') if exc_length else None
+    fields: bytes = record[exc_end:exc_end + fields_length]
+    return Report(
+        level=_LEVELS_BY_WEIGHT[weight],
+        module=record[_RECORD_HEADER.size:module_end].decode('utf8'),
+        function=record[module_end:function_end].decode('utf8'),
+        line=line,
+        message=record[reporter_end:message_end].decode('utf8'),
+        reporter_name=record[function_end:reporter_end].decode('utf8'),
+        date_time=date_time.decode('ascii'),
+        exc_info=exc_text,
+        fields=frozendict(json.loads(fields)) if fields else EMPTY_FIELDS
+    )
+
+
+class ReporterOutletSharedMemory(ReporterOutlet):
+    """
+    Producer side of the transport: encodes each report into a ring read by a :class:`SharedMemoryCollector` in another
+    process. Never blocks: reports not fitting in the ring are dropped and counted by the ring.
+
+    Only one process may write to a ring, its threads taking turns: in processes forked from the writing one, reports
+    are ignored.
+    """
+    __slots__ = (
+        '_ring',
+        '_lock'
+    )
+
+    def __init__(self, ring: SharedMemoryRing | str, formatter: BaseFormatter = None):
+        """
+        :param ring: A ring, or the name of a ring to attach to
+        """
+        super().__init__(formatter)
+        self._ring: SharedMemoryRing | None = SharedMemoryRing.attach(ring) if isinstance(ring, str) else ring
+        # The ring has a single producer: the threads of this process write one at a time
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def ring(self) -> SharedMemoryRing:
+        return self._ring
+
+    def emit(self, report: Report):
+        with self._lock:
+            if self._ring is not None:
+                self._ring.write(encode_report(report))
+
+    def pressure(self) -> tuple[float, float]:
+        return (self._ring.used / self._ring.capacity if self._ring is not None else 0.0), 0.0
+
+    def close(self):
+        with self._lock:
+            if self._ring is not None:
+                self._ring.close()
+                self._ring = None
+
+    def _before_fork(self):
+        self._lock.acquire()  # pylint: disable=consider-using-with
+
+    def _after_fork_in_parent(self):
+        self._lock.release()
+
+    def _after_fork_in_child(self):
+        # A ring has a single producer, the parent. The forked process makes its own outlet on a ring of its own.
+        self._ring = None
+        self._lock = threading.Lock()
+
+
+class SharedMemoryCollector:
+    """
+    Consumer side of the transport: drains rings into the outlets of a reporter, from a daemon thread.
+
+    Rings are polled every ``poll_interval`` seconds while they are empty, continuously otherwise. Records that cannot
+    be decoded are skipped and counted in ``invalid``, failures of the outlets are reported on stderr and counted in
+    ``errors``.
+    """
+    __slots__ = (
+        '_reporter',
+        '_rings',
+        '_poll_interval',
+        '_stop',
+        '_thread',
+        'received',
+        'invalid',
+        'errors'
+    )
+
+    def __init__(self, reporter: Reporter, rings: Iterable[SharedMemoryRing] = (), *, poll_interval: float = 0.01):
+        self._reporter: Reporter = reporter
+        self._rings: tuple[SharedMemoryRing, ...] = tuple(rings)
+        self._poll_interval: float = poll_interval
+        self._stop: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.received: int = 0
+        self.invalid: int = 0
+        self.errors: int = 0
+
+    @property
+    def rings(self) -> tuple[SharedMemoryRing, ...]:
+        return self._rings
+
+    def add_ring(self, size: int = 4 * 1024 * 1024) -> SharedMemoryRing:
+        """
+        Creates a new ring, drained by this collector. Give its name to the producer process.
+        """
+        ring: SharedMemoryRing = SharedMemoryRing.create(size)
+        self._rings = self._rings + (ring,)
+        return ring
+
+    def start(self) -> SharedMemoryCollector:
+        self._thread = threading.Thread(target=self._run, name='ereport-shm-collector', daemon=True)
+        self._thread.start()
+        return self
+
+    def drain(self) -> int:
+        """
+        Drains every ring once, from the calling thread
+
+        :return: Number of reports collected
+        """
+        return self._drain()[0]
+
+    def stop(self, close_rings: bool = True):
+        """
+        Stops the thread, drains what the rings still hold, then closes (and unlinks) the rings
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        # Each pass reads a limited number of records per ring
+        while self._drain()[1]:
+            pass
+        if close_rings:
+            for ring in self._rings:
+                ring.close()
+
+    def _drain(self) -> tuple[int, int]:
+        """
+        :return: Number of reports collected, number of records read including the invalid ones
+        """
+        collected: int = 0
+        read: int = 0
+        for ring in self._rings:
+            records: list[bytes] = ring.read_all()
+            if not records:
+                continue
+
+            read += len(records)
+
+            reports: list[Report] = []
+            for record in records:
+                try:
+                    reports.append(decode_report(record))
+                except (struct.error, KeyError, ValueError):
+                    self.invalid += 1
+            if not reports:
+                continue
+
+            for outlet in self._reporter.get_all_outlets():
+                try:
+                    if len(reports) > 1:
+                        outlet.emit_many(reports)
+                    else:
+                        outlet.emit(reports[0])
+                except Exception as error:  # pylint: disable=broad-except
+                    self.errors += 1
+                    print(f'Outlet {type(outlet).__name__} could not write {len(reports)} collected reports: {error!r}', file=sys.stderr)
+            collected += len(reports)
+
+        self.received += collected
+        return collected, read
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                read: int = self._drain()[1]
+            except Exception as error:  # pylint: disable=broad-except
+                self.errors += 1
+                print(f'Could not drain the shared memory rings: {error!r}', file=sys.stderr)
+                read = 0
+            if not read:
+                self._stop.wait(self._poll_interval)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ereport.library._internal import append_writer
+from ereport.library._internal.append_writer import AppendWriter
+from ereport.library.level import Levels
+from ereport.library.outlet_append import ReporterOutletAppendFile
+from ereport.library.report import Report
+
+_SEGMENTS: list = [b'first line', b'\n', b'', 'é€ 😀'.encode('utf8'), memoryview(b'\n'), b'x' * 100, b'', b'\n']
+
+
+class _ShortWrites:
+    """
+    Makes the kernel accept at most 7 bytes per os.writev call and 3 per os.write call on the files of the writers made
+    """
+
+    def __init__(self):
+        self.writev_calls: list[int] = []
+        self._fds: set[int] = set()
+
+    def writer(self, path) -> AppendWriter:
+        writer = AppendWriter(str(path))
+        self._fds.add(writer.fileno())
+        return writer
+
+    def patch(self, monkeypatch):
+        writev, write = os.writev, os.write
+
+        def short_writev(fd: int, buffers) -> int:
+            if fd not in self._fds:
+                return writev(fd, buffers)
+            self.writev_calls.append(len(buffers))
+            return write(fd, b''.join(bytes(buffer) for buffer in buffers)[:7])
+
+        def short_write(fd: int, data) -> int:
+            return write(fd, bytes(data)[:3]) if fd in self._fds else write(fd, data)
+
+        monkeypatch.setattr(os, 'writev', short_writev)
+        monkeypatch.setattr(os, 'write', short_write)
+        monkeypatch.setattr(append_writer, '_HAS_WRITEV', True)
+
+
+@pytest.fixture
+def short_writes(monkeypatch) -> _ShortWrites:
+    short_writes = _ShortWrites()
+    short_writes.patch(monkeypatch)
+    return short_writes
+
+
+def test_partial_writes_are_resumed(tmp_path, short_writes):
+    writer: AppendWriter = short_writes.writer(tmp_path / 'app.log')
+    written: int = writer.write(_SEGMENTS)
+    writer.close()
+
+    expected: bytes = b''.join(bytes(segment) for segment in _SEGMENTS)
+    assert (tmp_path / 'app.log').read_bytes() == expected
+    assert written == len(expected)
+    assert len(short_writes.writev_calls) > 1
+
+
+def test_partial_writes_are_resumed_across_iov_max_chunks(tmp_path, short_writes, monkeypatch):
+    monkeypatch.setattr(append_writer, '_IOV_MAX', 4)
+    segments: list[bytes] = [f'{index}\n'.encode('utf8') for index in range(50)]
+    writer: AppendWriter = short_writes.writer(tmp_path / 'app.log')
+    writer.write(segments)
+    writer.close()
+
+    assert (tmp_path / 'app.log').read_bytes() == b''.join(segments)
+    assert max(short_writes.writev_calls) <= 4
+
+
+def test_closed_writers_refuse_writes(tmp_path):
+    writer = AppendWriter(str(tmp_path / 'app.log'))
+    writer.close()
+
+    with pytest.raises(ValueError):
+        writer.write([b'line\n'])
+
+
+def test_reports_emitted_after_close_are_dropped_and_counted(tmp_path):
+    outlet = ReporterOutletAppendFile(str(tmp_path / 'app.log'))
+    outlet.emit(Report(Levels.INFO, 'module', 'function', 1, 'before', 'TEST'))
+    outlet.close()
+
+    outlet.emit(Report(Levels.INFO, 'module', 'function', 1, 'after', 'TEST'))
+    outlet.emit_many([Report(Levels.INFO, 'module', 'function', 1, 'after', 'TEST')] * 2)
+
+    assert outlet.dropped == 3
+    assert (tmp_path / 'app.log').read_text('utf8').splitlines()[0].endswith('before')
+    assert len((tmp_path / 'app.log').read_text('utf8').splitlines()) == 1
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import sys
+from typing import Any, Callable
+
+import pytest
+
+from ereport.library.catalog import ReporterOutletCatalog
+from ereport.library.formatter import BaseFormatter, ColoredFormatter, DefaultFormatter, DictFormatter, JSONFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet, ReporterOutletFile, ReporterOutletStdOut
+from ereport.library.outlet_append import ReporterOutletAppendFile
+from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+from ereport.library.outlet_compressed import ReporterOutletCompressedFile
+from ereport.library.outlet_limited import ReporterOutletLimited
+from ereport.library.outlet_metrics import ReporterOutletMetrics
+from ereport.library.outlet_network import RFC5424Formatter
+from ereport.library.outlet_partitioned import ReporterOutletPartitionedFile
+from ereport.library.report import Report
+
+_REPORTS: list[Report] = [
+    Report(Levels.DEBUG, 'db', 'connect', 10, 'connecting to {}', 'APP', '2023-06-01 12:59:59,000000', args=('primary',)),
+    Report(Levels.INFO, 'web', 'handle', 20, 'GET /users answered', 'APP', '2023-06-01 13:00:00,000000', fields={'request': '1'}),
+    Report(Levels.WARN, 'db', 'acquire', 30, 'pool almost full é€ 😀', 'DB', '2023-06-01 13:30:00,000000'),
+    Report(Levels.ERROR, 'web', 'handle', 40, 'x' * 300, 'APP', '2023-06-02 08:00:00,000000', fields={'request': '2'}),
+    Report(Levels.INFO, 'db', 'connect', 10, 'connecting to {}', 'APP', '2023-06-02 08:00:01,000000', args=('replica',))
+] * 5
+
+# Uneven batches, so that batch boundaries fall anywhere
+_BATCH_SIZES: tuple[int, ...] = (1, 3, 7, 14)
+
+
+def _files(directory) -> dict[str, bytes]:
+    """
+    The content of every file under the directory, its path left out of it (spilled messages are referred to by path)
+    """
+    files: dict[str, bytes] = {}
+    for parent, _, names in os.walk(directory):
+        for name in names:
+            with open(os.path.join(parent, name), 'rb') as file:
+                files[os.path.relpath(os.path.join(parent, name), directory)] = file.read().replace(os.fsencode(directory), b'')
+
+    return files
+
+
+def _file_outlet(directory, formatter: BaseFormatter | None = None) -> tuple[ReporterOutlet, Callable[[], Any]]:
+    return ReporterOutletFile(str(directory / 'app.log'), formatter), lambda: (directory / 'app.log').read_bytes()
+
+
+def _stdout_outlet(directory) -> tuple[ReporterOutlet, Callable[[], Any]]:
+    stream = io.StringIO()
+    sys.stdout = stream
+    return ReporterOutletStdOut(), stream.getvalue
+
+
+def _compressed_outlet(directory) -> tuple[ReporterOutlet, Callable[[], Any]]:
+    outlet = ReporterOutletCompressedFile(str(directory / 'app.log.gz'), flush_interval=60.0, max_frame_reports=4)
+    return outlet, lambda: gzip.decompress((directory / 'app.log.gz').read_bytes())
+
+
+def _metrics_outlet(directory) -> tuple[ReporterOutlet, Callable[[], Any]]:
+    outlet = ReporterOutletMetrics(interval=3600.0)
+    return outlet, lambda: outlet.current().counts
+
+
+_OUTLETS: dict[str, Callable[[Any], tuple[ReporterOutlet, Callable[[], Any]]]] = {
+    'stdout': _stdout_outlet,
+    'file': _file_outlet,
+    'append': lambda directory: (ReporterOutletAppendFile(str(directory / 'app.log')), lambda: (directory / 'app.log').read_bytes()),
+    'compressed': _compressed_outlet,
+    'partitioned': lambda directory: (
+        ReporterOutletPartitionedFile(str(directory / '{reporter_name}' / '{date}' / '{module}.log'), max_handles=2),
+        lambda: _files(directory)
+    ),
+    'catalog': lambda directory: (ReporterOutletCatalog(str(directory / 'app.catalog')), lambda: (directory / 'app.catalog').read_bytes()),
+    'limited': lambda directory: (
+        ReporterOutletLimited(_file_outlet(directory)[0], 100, spill_directory=str(directory / 'spill')),
+        lambda: _files(directory)
+    ),
+    'buffered': lambda directory: (ReporterOutletThreadBuffered([_file_outlet(directory)[0]], max_buffer=4), lambda: _files(directory)),
+    'metrics': _metrics_outlet
+}
+
+
+def _output(make_outlet, directory, batched: bool) -> Any:
+    stdout = sys.stdout
+    try:
+        directory.mkdir()
+        outlet, read = make_outlet(directory)
+        if batched:
+            start: int = 0
+            while start < len(_REPORTS):
+                for size in _BATCH_SIZES:
+                    outlet.emit_many(_REPORTS[start:start + size])
+                    start += size
+        else:
+            for report in _REPORTS:
+                outlet.emit(report)
+        outlet.flush()
+        output: Any = read()
+        outlet.close()
+    finally:
+        sys.stdout = stdout
+
+    return output
+
+
+@pytest.mark.parametrize('name', list(_OUTLETS))
+def test_batches_are_written_like_single_reports(tmp_path, name):
+    expected: Any = _output(_OUTLETS[name], tmp_path / 'single', batched=False)
+
+    assert expected
+    assert _output(_OUTLETS[name], tmp_path / 'batched', batched=True) == expected
+
+
+@pytest.mark.parametrize(
+    'formatter',
+    [DefaultFormatter(), ColoredFormatter(enabled=True), JSONFormatter(), RFC5424Formatter('app', hostname='host')],
+    ids=['default', 'colored', 'json', 'rfc5424']
+)
+def test_batches_are_formatted_like_single_reports(tmp_path, formatter):
+    assert formatter.format_many(_REPORTS) == [formatter.format(report) for report in _REPORTS]
+    assert _output(lambda directory: _file_outlet(directory, formatter), tmp_path / 'batched', batched=True) == \
+           _output(lambda directory: _file_outlet(directory, formatter), tmp_path / 'single', batched=False)
+
+
+def test_batches_are_formatted_as_the_same_dictionaries():
+    formatter = DictFormatter()
+
+    assert formatter.format_many(iter(_REPORTS)) == [formatter.format(report) for report in _REPORTS]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+from ereport.library.catalog import CatalogReader, ReporterOutletCatalog, fingerprint
+from ereport.library.level import Levels
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+_TEMPLATE: str = 'User {} logged in from {}'
+
+
+class _Formatted:
+    def __init__(self):
+        self.calls: int = 0
+
+    def __format__(self, format_spec: str) -> str:
+        self.calls += 1
+        return 'formatted'
+
+
+def _records(path) -> list[list]:
+    return [json.loads(line) for line in path.read_text('utf8').splitlines()]
+
+
+def _log_twice(reporter: Reporter, user: str):
+    reporter.info(_TEMPLATE, args=(user, '10.0.0.1'))
+    reporter.warn(_TEMPLATE, args=(user, '10.0.0.2'))
+
+
+def test_fingerprints_are_the_same_in_every_process():
+    process: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, '-c', f'from ereport.library.catalog import fingerprint; print(fingerprint({_TEMPLATE!r}))'],
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path), 'PYTHONHASHSEED': '123'},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert process.stdout.strip() == fingerprint(_TEMPLATE)
+    assert len(fingerprint(_TEMPLATE)) == 16
+    assert fingerprint(_TEMPLATE) != fingerprint(f'{_TEMPLATE}.')
+
+
+def test_templates_and_call_sites_are_written_once(tmp_path):
+    path = tmp_path / 'app.catalog'
+    reporter: Reporter = Reporter('CATALOG_TEST', Levels.INFO).set_outlets([ReporterOutletCatalog(str(path))])
+    for user in ('alice', 'bob', 'carol'):
+        _log_twice(reporter, user)
+    reporter.info('Plain message')
+    reporter.get_all_outlets()[0].close()
+
+    records: list[list] = _records(path)
+    assert [record[0] for record in records].count('T') == 1
+    assert [record[0] for record in records].count('S') == 2
+    assert [record[0] for record in records].count('R') == 6
+    assert [record[:3] for record in records if record[0] == 'T'] == [['T', fingerprint(_TEMPLATE), _TEMPLATE]]
+    assert [record[3] for record in records if record[0] == 'R'][:2] == [['alice', '10.0.0.1'], ['alice', '10.0.0.2']]
+    assert records[-1][0] == 'M' and records[-1][7] == 'Plain message'
+
+
+def test_catalogs_read_back_as_the_logged_reports(tmp_path):
+    path = tmp_path / 'app.catalog'
+    outlet = ReporterOutletCatalog(str(path))
+    reports: list[Report] = [
+        Report(Levels.INFO, 'module', 'function', 3, _TEMPLATE, 'TEST', args=('alice', '10.0.0.1'), fields={'request': '1'}),
+        Report(Levels.ERROR, 'module', 'other', 7, 'Plain message', 'TEST'),
+        Report(Levels.INFO, 'module', 'function', 3, _TEMPLATE, 'TEST', args=('bob', '10.0.0.2'))
+    ]
+    outlet.emit_many(reports)
+    outlet.close()
+
+    read: list[Report] = list(CatalogReader(str(path)).reports())
+    assert [(report.level, report.function, report.line, report.message, dict(report.fields)) for report in read] == [
+        (report.level, report.function, report.line, report.message, dict(report.fields)) for report in reports
+    ]
+    assert [(entry.template, entry.count) for entry in CatalogReader(str(path)).statistics()] == [(_TEMPLATE, 2)]
+
+
+def test_messages_are_formatted_once_on_first_access():
+    argument = _Formatted()
+    report = Report(Levels.INFO, 'module', 'function', 1, 'value: {}', 'TEST', args=(argument,))
+
+    assert (report.template, argument.calls) == ('value: {}', 0)
+    assert report.message == 'value: formatted'
+    assert report.message == 'value: formatted'
+    assert argument.calls == 1
+
+
+def test_messages_not_matching_their_arguments_are_kept_readable():
+    report = Report(Levels.INFO, 'module', 'function', 1, 'values: {} {}', 'TEST', args=('only one',))
+
+    assert report.message == "values: {} {} ('only one',)"
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import itertools
+import time
+
+import pytest
+
+from ereport.library import config
+from ereport.library.config import ConfigurationError, apply_config
+from ereport.library.level import Levels
+from ereport.library.reporter import Reporter
+
+_NAMES = itertools.count()
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(config, '_RETIRE_DELAY', 0.0)
+    monkeypatch.setattr(config, '_ACTIVE_OUTLETS', {})
+
+
+def _name() -> str:
+    return f'CONFIG_TEST_{next(_NAMES)}'
+
+
+def _file_outlet(path) -> dict:
+    return {'type': 'file', 'file': str(path), 'formatter': 'default'}
+
+
+def _wait_closed(outlet):
+    deadline: float = time.monotonic() + 2.0
+    while outlet._file_opened and time.monotonic() < deadline:  # pylint: disable=protected-access
+        time.sleep(0.01)
+
+
+def test_level_rules_and_outlets_are_applied(tmp_path):
+    name: str = _name()
+    apply_config({
+        'reporters': {name: {'level': 'debug', 'outlets': ['app'], 'rules': [{'module': 'db_*', 'level': 'error'}]}},
+        'outlets': {'app': _file_outlet(tmp_path / 'app.log')}
+    })
+    reporter: Reporter = Reporter.get_or_make(name)
+
+    assert reporter.level == Levels.DEBUG
+    assert [(rule.level, rule.module, rule.function) for rule in reporter.rules] == [(Levels.ERROR, 'db_*', None)]
+    assert [type(outlet).__name__ for outlet in reporter.get_all_outlets()] == ['ReporterOutletFile']
+
+
+def test_unchanged_outlets_are_kept_and_replaced_ones_closed(tmp_path):
+    name: str = _name()
+    outlets: dict = {'kept': _file_outlet(tmp_path / 'kept.log'), 'replaced': _file_outlet(tmp_path / 'replaced.log')}
+    apply_config({'reporters': {name: {'outlets': ['kept', 'replaced']}}, 'outlets': outlets})
+    kept, replaced = Reporter.get_or_make(name).get_all_outlets()
+
+    apply_config({
+        'reporters': {name: {'outlets': ['kept', 'replaced']}},
+        'outlets': {**outlets, 'replaced': _file_outlet(tmp_path / 'other.log')}
+    })
+    new_kept, new_replaced = Reporter.get_or_make(name).get_all_outlets()
+    _wait_closed(replaced)
+
+    assert new_kept is kept
+    assert new_replaced is not replaced
+    assert not replaced._file_opened  # pylint: disable=protected-access
+    assert kept._file_opened  # pylint: disable=protected-access
+
+
+def test_files_of_rebuilt_outlets_are_not_truncated(tmp_path):
+    name: str = _name()
+    path = tmp_path / 'app.log'
+    apply_config({'reporters': {name: {'outlets': ['app']}}, 'outlets': {'app': _file_outlet(path)}})
+    Reporter.get_or_make(name).info('before reload')
+
+    apply_config({'reporters': {name: {'outlets': ['app']}}, 'outlets': {'app': {**_file_outlet(path), 'formatter': 'json'}}})
+    Reporter.get_or_make(name).info('after reload')
+    apply_config({'reporters': {name: {'outlets': ['renamed']}}, 'outlets': {'renamed': _file_outlet(path)}})
+    Reporter.get_or_make(name).info('after rename')
+
+    lines: list[str] = path.read_text('utf8').splitlines()
+    assert ['before reload' in lines[0], 'after reload' in lines[1], 'after rename' in lines[2]] == [True] * 3
+
+
+def test_outlets_of_reporters_left_out_stay_open(tmp_path):
+    first, second = _name(), _name()
+    shared: dict = _file_outlet(tmp_path / 'shared.log')
+    apply_config({'reporters': {first: {'outlets': ['shared']}, second: {'outlets': ['shared']}}, 'outlets': {'shared': shared}})
+    outlet = Reporter.get_or_make(second).get_all_outlets()[0]
+
+    apply_config({'reporters': {first: {'outlets': ['other']}}, 'outlets': {'other': _file_outlet(tmp_path / 'other.log')}})
+    time.sleep(0.1)
+    Reporter.get_or_make(second).info('still logged')
+
+    assert outlet._file_opened  # pylint: disable=protected-access
+    assert 'still logged' in (tmp_path / 'shared.log').read_text('utf8')
+
+    # Defined again: the outlet still in use is reused, not opened a second time
+    apply_config({'reporters': {first: {'outlets': ['shared']}}, 'outlets': {'shared': shared}})
+    assert Reporter.get_or_make(first).get_all_outlets()[0] is outlet
+
+
+def test_outlets_of_reporters_only_changing_their_level_stay_open(tmp_path):
+    name: str = _name()
+    apply_config({'reporters': {name: {'outlets': ['app']}}, 'outlets': {'app': _file_outlet(tmp_path / 'app.log')}})
+    outlet = Reporter.get_or_make(name).get_all_outlets()[0]
+
+    apply_config({'reporters': {name: {'level': 'debug'}}})
+    time.sleep(0.1)
+
+    assert Reporter.get_or_make(name).get_all_outlets() == (outlet,)
+    assert outlet._file_opened  # pylint: disable=protected-access
+
+
+def test_bound_reporters_follow_the_configuration(tmp_path):
+    name: str = _name()
+    child: Reporter = Reporter.get_or_make(name).bind(request='1')
+    apply_config({'reporters': {name: {'level': 'warn', 'outlets': ['app']}}, 'outlets': {'app': _file_outlet(tmp_path / 'app.log')}})
+
+    assert child.level == Levels.WARN
+    assert child.get_all_outlets() == Reporter.get_or_make(name).get_all_outlets()
+
+
+@pytest.mark.parametrize('formatter', [{'type': 'colored', 'theme': 'unknown'}, {'type': 'default', 'unknown': 1}, 'unknown'])
+def test_invalid_formatters_raise_configuration_errors(tmp_path, formatter):
+    name: str = _name()
+    apply_config({'reporters': {name: {'level': 'warn', 'outlets': ['app']}}, 'outlets': {'app': _file_outlet(tmp_path / 'app.log')}})
+    outlets = Reporter.get_or_make(name).get_all_outlets()
+
+    with pytest.raises(ConfigurationError):
+        apply_config({
+            'reporters': {name: {'level': 'debug', 'outlets': ['app']}},
+            'outlets': {'app': {**_file_outlet(tmp_path / 'app.log'), 'formatter': formatter}}
+        })
+
+    assert Reporter.get_or_make(name).level == Levels.WARN
+    assert Reporter.get_or_make(name).get_all_outlets() == outlets
+
+
+def test_max_message_size_wraps_the_outlet(tmp_path):
+    name: str = _name()
+    apply_config({
+        'reporters': {name: {'outlets': ['app']}},
+        'outlets': {'app': {**_file_outlet(tmp_path / 'app.log'), 'max_message_size': 10, 'spill_directory': str(tmp_path / 'spill')}}
+    })
+    outlet = Reporter.get_or_make(name).get_all_outlets()[0]
+
+    assert type(outlet).__name__ == 'ReporterOutletLimited'
+    assert type(outlet.outlets[0]).__name__ == 'ReporterOutletFile'
+
+
+def test_spill_directory_requires_max_message_size(tmp_path):
+    with pytest.raises(ConfigurationError, match='max_message_size'):
+        apply_config({
+            'reporters': {_name(): {'outlets': ['app']}},
+            'outlets': {'app': {**_file_outlet(tmp_path / 'app.log'), 'spill_directory': str(tmp_path / 'spill')}}
+        })
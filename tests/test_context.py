@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ereport.library.context import bind_context, context, get_context, merge_fields, reset_context, with_current_context
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+_NAMES = itertools.count()
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+    @property
+    def fields(self) -> list[dict]:
+        return [dict(report.fields) for report in self.reports]
+
+
+def _reporter() -> tuple[Reporter, _ListOutlet]:
+    outlet = _ListOutlet()
+    return Reporter(f'CONTEXT_TEST_{next(_NAMES)}', Levels.INFO).set_outlets([outlet]), outlet
+
+
+def test_bound_fields_are_merged_with_the_parent_ones():
+    reporter, outlet = _reporter()
+    parent: Reporter = reporter.bind(service='api', request='1')
+    child: Reporter = parent.bind(request='2', user='alice')
+
+    child.info('child')
+    parent.info('parent')
+    reporter.info('root')
+
+    assert outlet.fields == [{'service': 'api', 'request': '2', 'user': 'alice'}, {'service': 'api', 'request': '1'}, {}]
+    assert parent.bind().fields is parent.fields
+
+
+def test_reporter_fields_override_context_fields():
+    reporter, outlet = _reporter()
+
+    with context(request='context', tenant='acme'):
+        reporter.bind(request='bound').info('message')
+
+    assert outlet.fields == [{'request': 'bound', 'tenant': 'acme'}]
+
+
+def test_context_fields_are_restored():
+    token = bind_context(request='1')
+    with context(user='alice') as fields:
+        assert dict(fields) == {'request': '1', 'user': 'alice'}
+        with context(user='bob'):
+            assert dict(get_context()) == {'request': '1', 'user': 'bob'}
+        assert dict(get_context()) == {'request': '1', 'user': 'alice'}
+    reset_context(token)
+
+    assert dict(get_context()) == {}
+
+
+def test_merging_an_empty_mapping_does_not_copy():
+    fields = get_context() | {'request': '1'}
+
+    assert merge_fields(fields, {}) is fields
+    assert merge_fields(get_context(), fields) is fields
+
+
+def test_threads_start_without_the_caller_context():
+    reporter, outlet = _reporter()
+
+    with context(request='1'):
+        thread = threading.Thread(target=reporter.info, args=('plain thread',))
+        thread.start()
+        thread.join()
+        thread = threading.Thread(target=with_current_context(reporter.info), args=('wrapped thread',))
+        thread.start()
+        thread.join()
+        with ThreadPoolExecutor(2) as executor:
+            executor.submit(with_current_context(bind_context), user='alice').result()
+            executor.submit(with_current_context(reporter.info), 'executor').result()
+
+    assert outlet.fields == [{}, {'request': '1'}, {'request': '1'}]
+
+
+def test_asyncio_tasks_inherit_the_context_they_were_created_from():
+    reporter, outlet = _reporter()
+
+    async def handle(request: str):
+        with context(request=request):
+            await asyncio.sleep(0)
+            reporter.info('handling')
+            await asyncio.gather(*[asyncio.create_task(step(name)) for name in ('parse', 'store')])
+
+    async def step(name: str):
+        bind_context(step=name)
+        await asyncio.sleep(0)
+        reporter.info(name)
+
+    async def serve():
+        with context(server='main'):
+            await asyncio.gather(handle('1'), handle('2'))
+        reporter.info('stopped')
+
+    asyncio.run(serve())
+
+    assert sorted(map(repr, outlet.fields)) == sorted(map(repr, [
+        {'server': 'main', 'request': '1'},
+        {'server': 'main', 'request': '2'},
+        {'server': 'main', 'request': '1', 'step': 'parse'},
+        {'server': 'main', 'request': '1', 'step': 'store'},
+        {'server': 'main', 'request': '2', 'step': 'parse'},
+        {'server': 'main', 'request': '2', 'step': 'store'},
+        {}
+    ]))
+    assert outlet.fields[-1] == {}
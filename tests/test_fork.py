@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork is not available')
+
+_PRELUDE: str = '''
+import os
+import sys
+
+from ereport.library.fork import register_fork_handlers, use_pid_suffix
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutletFile
+from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+from ereport.library.report import Report
+
+
+def report(message):
+    return Report(Levels.INFO, 'module', 'function', 1, message, 'TEST')
+
+
+def fork(child):
+    pid = os.fork()
+    if pid == 0:
+        child()
+        sys.exit(0)
+    assert os.waitpid(pid, 0)[1] == 0
+    return pid
+'''
+
+
+def _run(tmp_path: Path, script: str) -> subprocess.CompletedProcess:
+    process: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, '-c', _PRELUDE + textwrap.dedent(script)],
+        cwd=tmp_path,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
+        timeout=30.0,
+        check=False
+    )
+    assert process.returncode == 0, process.stderr
+    return process
+
+
+def _messages(path: Path) -> list[str]:
+    return [line.rsplit(' ', 1)[-1] for line in path.read_text('utf8').splitlines()]
+
+
+def test_forked_processes_append_to_the_file_of_their_parent(tmp_path):
+    _run(tmp_path, '''
+        outlet = ReporterOutletFile('app.log')
+        outlet.emit(report('before'))
+        fork(lambda: outlet.emit(report('child')))
+        outlet.emit(report('parent'))
+    ''')
+
+    assert _messages(tmp_path / 'app.log') == ['before', 'child', 'parent']
+
+
+def test_forked_processes_write_to_their_own_file_with_pid_suffixes(tmp_path):
+    process: subprocess.CompletedProcess = _run(tmp_path, '''
+        use_pid_suffix()
+        outlet = ReporterOutletFile('app.log')
+        outlet.emit(report('before'))
+        print(fork(lambda: outlet.emit(report('child'))))
+        outlet.emit(report('parent'))
+    ''')
+
+    assert _messages(tmp_path / 'app.log') == ['before', 'parent']
+    assert _messages(tmp_path / f'app.log.{process.stdout.strip()}') == ['child']
+
+
+def test_reports_buffered_before_a_fork_are_written_once(tmp_path):
+    _run(tmp_path, '''
+        outlet = ReporterOutletThreadBuffered([ReporterOutletFile('app.log')], flush_interval=60.0)
+        for index in range(100):
+            outlet.emit(report(f'before-{index}'))
+        fork(lambda: outlet.emit(report('child')))
+        outlet.emit(report('parent'))
+    ''')
+
+    messages: list[str] = _messages(tmp_path / 'app.log')
+    assert messages[:101] == [f'before-{index}' for index in range(100)] + ['child']
+    assert messages[101:] == ['parent']
+
+
+def test_handlers_run_around_forks_in_order_and_failures_are_reported(tmp_path):
+    process: subprocess.CompletedProcess = _run(tmp_path, '''
+        calls = []
+
+
+        class Handlers:
+            def __init__(self, name):
+                self.name = name
+                register_fork_handlers(self)
+
+            def _before_fork(self):
+                calls.append(f'before-{self.name}')
+                if self.name == 'second':
+                    raise RuntimeError('unavailable')
+
+            def _after_fork_in_parent(self):
+                calls.append(f'parent-{self.name}')
+
+            def _after_fork_in_child(self):
+                calls.append(f'child-{self.name}')
+
+            def _at_exit(self):
+                print(f'exit-{self.name}')
+
+
+        handlers = [Handlers('first'), Handlers('second')]
+        fork(lambda: print(' '.join(calls), flush=True))
+        print(' '.join(calls))
+    ''')
+
+    assert process.stdout.splitlines() == [
+        'before-second before-first child-first child-second',
+        'exit-second',
+        'exit-first',
+        'before-second before-first parent-first parent-second',
+        'exit-second',
+        'exit-first'
+    ]
+    assert process.stderr.count('Handlers._before_fork failed') == 1
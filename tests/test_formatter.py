@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import io
+import re
+import sys
+
+import pytest
+
+from ereport.library.formatter import AdaptativeColoredFormatter, ColoredFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutletFile, ReporterOutletStdOut
+from ereport.library.outlet_network import ReporterOutletUDP
+from ereport.library.report import Report
+
+
+_ESCAPE_CODES = re.compile('\x1b\\[[0-9;]*m')
+
+
+class _Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.delenv('NO_COLOR', raising=False)
+    monkeypatch.delenv('FORCE_COLOR', raising=False)
+
+
+def _terminal(monkeypatch) -> _Terminal:
+    # Set from the test itself: the output capture of pytest restores its own stdout after the fixtures ran
+    stream = _Terminal()
+    monkeypatch.setattr(sys, 'stdout', stream)
+    return stream
+
+
+def _report() -> Report:
+    return Report(Levels.WARN, 'module', 'function', 1, 'message', 'TEST', fields={'user': 'alice'})
+
+
+@pytest.mark.parametrize('formatter_class', [ColoredFormatter, AdaptativeColoredFormatter])
+def test_colors_are_written_to_terminals(monkeypatch, formatter_class):
+    terminal: _Terminal = _terminal(monkeypatch)
+    ReporterOutletStdOut(formatter_class()).emit(_report())
+
+    assert '\x1b[' in terminal.getvalue()
+
+
+@pytest.mark.parametrize('formatter_class', [ColoredFormatter, AdaptativeColoredFormatter])
+def test_colors_are_not_written_to_files(monkeypatch, tmp_path, formatter_class):
+    _terminal(monkeypatch)
+    monkeypatch.setenv('FORCE_COLOR', '1')
+    outlet = ReporterOutletFile(str(tmp_path / 'app.log'), formatter_class())
+    outlet.emit(_report())
+    outlet.close()
+
+    assert '\x1b[' not in (tmp_path / 'app.log').read_text('utf8')
+
+
+def test_colors_are_not_written_to_sockets(monkeypatch):
+    _terminal(monkeypatch)
+    formatter = ColoredFormatter()
+    outlet = ReporterOutletUDP('127.0.0.1', 9, formatter)
+    outlet.close()
+
+    assert '\x1b[' not in formatter.format(_report())
+
+
+def test_colors_can_be_forced_on_files(tmp_path):
+    outlet = ReporterOutletFile(str(tmp_path / 'app.log'), ColoredFormatter(enabled=True))
+    outlet.emit(_report())
+    outlet.close()
+
+    assert '\x1b[' in (tmp_path / 'app.log').read_text('utf8')
+
+
+def test_formatters_shared_with_a_file_outlet_write_no_colors(monkeypatch, tmp_path):
+    _terminal(monkeypatch)
+    formatter = ColoredFormatter()
+    ReporterOutletStdOut(formatter)
+    ReporterOutletFile(str(tmp_path / 'app.log'), formatter).close()
+
+    assert '\x1b[' not in formatter.format(_report())
+
+
+def test_no_color_disables_colors_on_terminals(monkeypatch):
+    terminal: _Terminal = _terminal(monkeypatch)
+    monkeypatch.setenv('NO_COLOR', '1')
+    ReporterOutletStdOut(ColoredFormatter()).emit(_report())
+
+    assert '\x1b[' not in terminal.getvalue()
+
+
+@pytest.mark.parametrize('formatter_class', [ColoredFormatter, AdaptativeColoredFormatter])
+def test_lines_without_colors_are_the_colored_lines_without_escape_codes(formatter_class):
+    report: Report = _report()
+    colored: str = formatter_class(enabled=True).format(report)
+    plain: str = formatter_class(enabled=False).format(report)
+
+    assert '\x1b[' not in plain
+    assert plain == _ESCAPE_CODES.sub('', colored)
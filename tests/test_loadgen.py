@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from ereport.library.level import Levels
+from ereport.library.loadgen import LoadResult, TrafficMix, parse_levels, run_load
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+
+def test_levels_are_parsed_with_their_weights():
+    assert parse_levels('info=8, debug,warn=2') == {Levels.INFO: 8, Levels.DEBUG: 1, Levels.WARN: 2}
+
+
+def test_the_all_level_is_rejected():
+    with pytest.raises(ValueError):
+        parse_levels('info=8,all=1')
+    with pytest.raises(ValueError):
+        TrafficMix(levels={Levels.INFO: 1, Levels.ALL: 1})
+
+
+@pytest.mark.parametrize('arguments', [
+    {'levels': {}},
+    {'levels': {Levels.INFO: 0, Levels.DEBUG: 0}},
+    {'levels': {Levels.INFO: 2, Levels.DEBUG: -1}},
+    {'message_sizes': ()},
+    {'message_sizes': (80, -1)}
+])
+def test_mixes_that_cannot_be_replayed_are_rejected(arguments):
+    with pytest.raises(ValueError, match='A traffic mix needs'):
+        TrafficMix(**arguments)
+
+
+def test_runs_log_every_report_of_the_mix():
+    outlet = _ListOutlet()
+    reporter: Reporter = Reporter('LOADGEN_TEST', Levels.ALL).set_outlets([outlet])
+    levels: dict = {Levels.TRACE: 1, Levels.SUCCESS: 1, Levels.SEVERE: 1}
+    result: LoadResult = run_load(reporter, TrafficMix(levels=levels, message_sizes=(10, 200), threads=3, reports=1000))
+
+    assert result.reports == len(outlet.reports) == len(result.latencies) == 1000
+    assert {report.level for report in outlet.reports} == set(levels)
+    assert {len(report.message) for report in outlet.reports} == {10, 200}
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import itertools
+import logging
+
+import pytest
+
+from ereport.library.level import Levels
+from ereport.library.logging_bridge import ReporterHandler, ReporterOutletLogging, capture_stdlib_logging
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+_NAMES = itertools.count()
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+    @property
+    def messages(self) -> list[str]:
+        return [report.message for report in self.reports]
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    logger: logging.Logger = logging.getLogger(f'bridge_test_{next(_NAMES)}')
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+
+def _reporter(level=Levels.INFO) -> tuple[Reporter, _ListOutlet]:
+    outlet = _ListOutlet()
+    return Reporter(f'BRIDGE_TEST_{next(_NAMES)}', level).set_outlets([outlet]), outlet
+
+
+def _log_debug_from_stdlib(logger: logging.Logger, message: str):
+    logger.debug(message)
+
+
+def test_stdlib_records_are_reported(logger):
+    reporter, outlet = _reporter()
+    logger.addHandler(ReporterHandler(reporter.bind(request='1')))
+    logger.setLevel(logging.DEBUG)
+
+    logger.info('user %s logged in', 'alice')
+    logger.debug('below the level')
+
+    assert outlet.messages == ['user alice logged in']
+    report: Report = outlet.reports[0]
+    assert (report.level, report.module, report.function, report.reporter_name) == (
+        Levels.INFO, 'test_logging_bridge', 'test_stdlib_records_are_reported', logger.name.upper()
+    )
+    assert dict(report.fields) == {'request': '1'}
+
+
+def test_stdlib_records_follow_the_level_rules(logger):
+    reporter, outlet = _reporter(Levels.WARN)
+    reporter.add_level_rule(Levels.DEBUG, function='_log_debug_from_stdlib')
+    reporter.add_level_rule(Levels.ERROR, module='test_logging_bridge', function='test_*')
+    capture_stdlib_logging(reporter, logger.name)
+
+    _log_debug_from_stdlib(logger, 'enabled by a rule')
+    logger.debug('disabled')
+    logger.warning('disabled by a rule')
+    logger.error('enabled')
+
+    assert logger.level == logging.DEBUG
+    assert outlet.messages == ['enabled by a rule', 'enabled']
+
+
+def test_reports_are_forwarded_to_stdlib_loggers(logger):
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    reporter, _ = _reporter(Levels.DEBUG)
+    reporter.set_outlets([ReporterOutletLogging(logger.name)])
+
+    reporter.bind(user='alice').warn('disk almost full')
+    reporter.debug('below the logger level')
+
+    assert [(record.levelno, record.getMessage(), record.funcName) for record in handler.records] == [
+        (logging.WARNING, 'disk almost full', 'test_reports_are_forwarded_to_stdlib_loggers')
+    ]
+    assert dict(handler.records[0].ereport_fields) == {'user': 'alice'}
+
+
+def test_records_are_not_bridged_back_and_forth(logger):
+    reporter, outlet = _reporter()
+    reporter.add_outlet(ReporterOutletLogging(logger.name))
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    logger.addHandler(ReporterHandler(reporter))
+    logger.setLevel(logging.INFO)
+
+    reporter.info('from the reporter')
+    logger.info('from the logger')
+
+    assert outlet.messages == ['from the reporter', 'from the logger']
+    assert [record.getMessage() for record in handler.records] == ['from the reporter', 'from the logger', 'from the logger']
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+from ereport.library.report import Report
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+
+def _report(message: str) -> Report:
+    return Report(Levels.INFO, 'module', 'function', 1, message, 'TEST')
+
+
+def test_reports_of_every_thread_are_handed_over():
+    inner = _ListOutlet()
+    outlet = ReporterOutletThreadBuffered([inner], flush_interval=60.0)
+
+    def produce(thread_index: int):
+        for index in range(500):
+            outlet.emit(_report(f'{thread_index} {index}'))
+
+    threads: list[threading.Thread] = [threading.Thread(target=produce, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    outlet.close()
+
+    assert sorted(report.message for report in inner.reports) == sorted(f'{thread} {index}' for thread in range(4) for index in range(500))
+
+
+def test_reports_emitted_after_close_are_dropped_and_counted():
+    inner = _ListOutlet()
+    outlet = ReporterOutletThreadBuffered([inner])
+    outlet.emit(_report('before'))
+    outlet.close()
+
+    outlet.emit(_report('after'))
+    outlet.emit_many([_report('after'), _report('after')])
+
+    assert [report.message for report in inner.reports] == ['before']
+    assert outlet.dropped == 3
+    assert outlet.buffered == 0
+
+
+def test_buffered_reports_reach_a_wrapped_network_outlet_at_exit():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    server.settimeout(10.0)
+    script: str = textwrap.dedent(f'''
+        from ereport.library.formatter import DefaultFormatter
+        from ereport.library.level import Levels
+        from ereport.library.outlet_buffered import ReporterOutletThreadBuffered
+        from ereport.library.outlet_network import ReporterOutletTCP
+        from ereport.library.report import Report
+
+        tcp = ReporterOutletTCP('127.0.0.1', {server.getsockname()[1]}, DefaultFormatter(), flush_interval=60.0)
+        outlet = ReporterOutletThreadBuffered([tcp], flush_interval=60.0)
+        for index in range(100):
+            outlet.emit(Report(Levels.INFO, 'module', 'function', 1, f'message {{index}}', 'TEST'))
+    ''')
+    process = subprocess.Popen([sys.executable, '-c', script], env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)})
+    try:
+        connection, _ = server.accept()
+        connection.settimeout(10.0)
+        received: bytes = b''
+        while chunk := connection.recv(65536):
+            received += chunk
+        connection.close()
+    finally:
+        assert process.wait(10.0) == 0
+        server.close()
+
+    assert [line.rsplit(' ', 1)[-1] for line in received.decode('utf8').splitlines()] == [str(index) for index in range(100)]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import gzip
+import io
+import zlib
+
+import pytest
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet_compressed import ReporterOutletCompressedFile
+from ereport.library.report import Report
+
+
+def _reports(start: int, stop: int) -> list[Report]:
+    return [Report(Levels.INFO, 'module', 'function', 1, f'message-{index}', 'TEST') for index in range(start, stop)]
+
+
+def _gzip_members(data: bytes) -> list[list[str]]:
+    members: list[list[str]] = []
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        members.append([line.rsplit(' ', 1)[-1] for line in decompressor.decompress(data).decode('utf8').splitlines()])
+        data = decompressor.unused_data
+
+    return members
+
+
+def test_each_frame_is_an_independent_gzip_member(tmp_path):
+    outlet = ReporterOutletCompressedFile(str(tmp_path / 'app.log.gz'), DefaultFormatter(), flush_interval=60.0, max_frame_reports=3)
+    outlet.emit_many(_reports(0, 7))
+    outlet.flush()
+    outlet.emit(_reports(7, 8)[0])
+    outlet.close()
+
+    assert _gzip_members((tmp_path / 'app.log.gz').read_bytes()) == [
+        ['message-0', 'message-1', 'message-2'], ['message-3', 'message-4', 'message-5'], ['message-6'], ['message-7']
+    ]
+    assert (outlet.frames, outlet.dropped) == (4, 0)
+    assert outlet.ratio > 0
+
+
+def test_gzip_files_read_back_as_the_formatted_lines(tmp_path):
+    formatter = DefaultFormatter()
+    reports: list[Report] = _reports(0, 1000)
+    outlet = ReporterOutletCompressedFile(str(tmp_path / 'app.log.gz'), formatter, flush_interval=60.0, compression_level=1)
+    outlet.emit_many(reports)
+    outlet.close()
+
+    assert gzip.decompress((tmp_path / 'app.log.gz').read_bytes()).decode('utf8') == ''.join(f'{formatter.format(report)}\n' for report in reports)
+    assert outlet.bytes_in == len(gzip.decompress((tmp_path / 'app.log.gz').read_bytes()))
+
+
+def test_zstd_files_read_back_as_the_formatted_lines(tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    outlet = ReporterOutletCompressedFile(str(tmp_path / 'app.log.zst'), DefaultFormatter(), codec='zstd', max_frame_reports=10)
+    outlet.emit_many(_reports(0, 25))
+    outlet.close()
+
+    with zstandard.ZstdDecompressor().stream_reader(io.BytesIO((tmp_path / 'app.log.zst').read_bytes()), read_across_frames=True) as reader:
+        lines: list[str] = reader.read().decode('utf8').splitlines()
+    assert [line.rsplit(' ', 1)[-1] for line in lines] == [f'message-{index}' for index in range(25)]
+    assert outlet.frames == 3
+
+
+def test_reopened_files_get_new_frames_after_the_previous_ones(tmp_path):
+    path: str = str(tmp_path / 'app.log.gz')
+    first = ReporterOutletCompressedFile(path, DefaultFormatter())
+    first.emit_many(_reports(0, 2))
+    first.close()
+    second = ReporterOutletCompressedFile(path, DefaultFormatter(), truncate=False)
+    second.emit_many(_reports(2, 4))
+    second.close()
+
+    assert _gzip_members((tmp_path / 'app.log.gz').read_bytes()) == [['message-0', 'message-1'], ['message-2', 'message-3']]
+
+
+def test_unknown_codecs_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ReporterOutletCompressedFile(str(tmp_path / 'app.log'), codec='lzma')
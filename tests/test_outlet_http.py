@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import gzip
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet_http import ReporterOutletHTTP
+from ereport.library.report import Report
+
+
+class _Server(ThreadingHTTPServer):
+    """
+    Records the lines of each post, and answers with the queued statuses, then 200
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.posts: list[list[str]] = []
+        self.statuses: list[int] = []
+        self.release: threading.Event = threading.Event()
+        self.release.set()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/bulk'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body: bytes = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        self.server.release.wait()
+        status: int = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.posts.append(body.decode('utf8').splitlines())
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[_Server]:
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _report(message: str) -> Report:
+    return Report(Levels.INFO, 'module', 'function', 1, message, 'TEST')
+
+
+def _outlet(server: _Server, **kwargs) -> ReporterOutletHTTP:
+    return ReporterOutletHTTP(server.url, DefaultFormatter(), flush_interval=60.0, min_backoff=0.01, **kwargs)
+
+
+def test_reports_are_posted_in_batches(server):
+    outlet = _outlet(server, max_batch_reports=10)
+    outlet.emit_many([_report(f'message {index}') for index in range(35)])
+    outlet.flush()
+    outlet.close()
+
+    assert sorted(len(post) for post in server.posts) == [5, 10, 10, 10]
+    assert outlet.sent_reports == 35
+    assert outlet.sent_batches == 4
+
+
+def test_batches_are_posted_like_single_reports(server):
+    reports: list[Report] = [_report(f'message {index} é€') for index in range(30)]
+    lines: list[list[str]] = []
+    for batched in (False, True):
+        server.posts.clear()
+        outlet = _outlet(server, max_batch_reports=4, pool_size=1)
+        if batched:
+            for start in range(0, len(reports), 7):
+                outlet.emit_many(reports[start:start + 7])
+        else:
+            for report in reports:
+                outlet.emit(report)
+        outlet.flush()
+        outlet.close()
+        lines.append([line for post in server.posts for line in post])
+
+    assert len(lines[0]) == 30
+    assert lines[1] == lines[0]
+
+
+def test_batches_are_cut_at_max_batch_bytes(server):
+    outlet = _outlet(server, max_batch_bytes=200, compression_level=None)
+    outlet.emit_many([_report(f'message {index}') for index in range(20)])
+    outlet.flush()
+    outlet.close()
+
+    assert len(server.posts) > 1
+    assert sum(len(post) for post in server.posts) == 20
+
+
+def test_failed_posts_are_retried(server):
+    server.statuses = [503, 429]
+    outlet = _outlet(server)
+    outlet.emit(_report('message'))
+    outlet.flush()
+    outlet.close()
+
+    assert outlet.retries == 2
+    assert outlet.sent_reports == 1
+    assert outlet.dropped == 0
+
+
+def test_posts_still_failing_after_the_retries_are_dropped(server):
+    server.statuses = [500] * 3
+    outlet = _outlet(server, max_retries=2)
+    outlet.emit_many([_report('message'), _report('message')])
+    outlet.flush()
+    outlet.close()
+
+    assert outlet.retries == 2
+    assert outlet.dropped_batches == 1
+    assert outlet.dropped == 2
+    assert not server.posts
+
+
+def test_rejected_posts_are_not_retried(server):
+    server.statuses = [400]
+    outlet = _outlet(server)
+    outlet.emit(_report('message'))
+    outlet.flush()
+    outlet.close()
+
+    assert outlet.retries == 0
+    assert outlet.dropped == 1
+
+
+def test_reports_beyond_max_pending_are_shed(server):
+    outlet = _outlet(server, max_pending=10)
+    for index in range(25):
+        outlet.emit(_report(f'message {index}'))
+    outlet.flush()
+    outlet.close()
+
+    assert outlet.dropped == 15
+    assert outlet.sent_reports == 10
+
+
+def test_pending_reports_are_posted_at_exit(server):
+    script: str = textwrap.dedent(f'''
+        from ereport.library.level import Levels
+        from ereport.library.outlet_http import ReporterOutletHTTP
+        from ereport.library.report import Report
+
+        outlet = ReporterOutletHTTP({server.url!r}, flush_interval=60.0, max_batch_reports=20)
+        for index in range(50):
+            outlet.emit(Report(Levels.INFO, 'module', 'function', 1, f'message {{index}}', 'TEST'))
+    ''')
+    subprocess.run([sys.executable, '-c', script], env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}, check=True, timeout=10.0)
+
+    assert sum(len(post) for post in server.posts) == 50
+
+
+def test_exit_gives_up_after_exit_timeout(server):
+    server.release.clear()
+    outlet = _outlet(server, pool_size=1, max_batch_reports=1, exit_timeout=0.2)
+    outlet.emit_many([_report(f'message {index}') for index in range(10)])
+    started: float = time.monotonic()
+    outlet._at_exit()  # pylint: disable=protected-access
+
+    assert time.monotonic() - started < 2.0
+    assert outlet.dropped > 0
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires os.fork')
+def test_fork_does_not_wait_for_busy_senders(server):
+    server.release.clear()
+    outlet = _outlet(server, pool_size=1, max_batch_reports=1)
+    outlet.emit_many([_report(f'message {index}') for index in range(10)])
+    time.sleep(0.2)
+
+    def fork():
+        pid: int = os.fork()
+        if not pid:
+            os._exit(0)  # pylint: disable=protected-access
+        os.waitpid(pid, 0)
+
+    # Forked from another thread: a fork waiting for the senders fails the test instead of hanging it
+    forking = threading.Thread(target=fork)
+    forking.start()
+    forking.join(2.0)
+    blocked: bool = forking.is_alive()
+
+    server.release.set()
+    forking.join()
+    outlet.flush()
+    outlet.close()
+    assert not blocked
+    assert outlet.sent_reports == 10
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.outlet_limited import ReporterOutletLimited
+from ereport.library.report import Report
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+    @property
+    def messages(self) -> list[str]:
+        return [report.message for report in self.reports]
+
+
+def _report(message: str, *args) -> Report:
+    return Report(Levels.INFO, 'module', 'function', 1, message, 'TEST', args=args)
+
+
+def _spilled_files(directory) -> list[str]:
+    return sorted(os.listdir(directory))
+
+
+def test_long_messages_are_truncated_with_a_marker():
+    outlet = _ListOutlet()
+    limited = ReporterOutletLimited(outlet, 10)
+    original: Report = _report('{} and the rest', 'x' * 20)
+
+    limited.emit(_report('0123456789'))
+    limited.emit_many([original, _report('short')])
+
+    assert outlet.messages == ['0123456789', f'{"x" * 10}... [23 more characters left out]', 'short']
+    assert limited.truncated == 1
+    assert (original.message, original.args) == (f'{"x" * 20} and the rest', ('x' * 20,))
+    assert (outlet.reports[1].template, outlet.reports[1].args) == (None, ())
+
+
+def test_the_maximum_size_must_be_positive():
+    with pytest.raises(ValueError):
+        ReporterOutletLimited(_ListOutlet(), 0)
+
+
+def test_messages_are_spilled_once_per_content(tmp_path):
+    outlet = _ListOutlet()
+    limited = ReporterOutletLimited(outlet, 10, spill_directory=str(tmp_path / 'spill'))
+    message: str = 'é€ 😀 ' * 1000
+
+    limited.emit(_report(message))
+    limited.emit_many([_report(message), _report(f'{message}.')])
+
+    files: list[str] = _spilled_files(tmp_path / 'spill')
+    assert len(files) == 2
+    assert limited.spilled == 3 and limited.truncated == 0
+    assert outlet.messages[0] == outlet.messages[1] != outlet.messages[2]
+    path: str = outlet.messages[0].rsplit(' ', 1)[-1][:-1]
+    assert outlet.messages[0] == f'[message of {len(message)} characters written to {path}]'
+    with open(path, encoding='utf8') as file:
+        assert file.read() == message
+
+
+def test_messages_are_truncated_when_they_cannot_be_spilled(tmp_path):
+    outlet = _ListOutlet()
+    limited = ReporterOutletLimited(outlet, 10, spill_directory=str(tmp_path / 'spill'))
+    os.rmdir(tmp_path / 'spill')
+    (tmp_path / 'spill').write_bytes(b'')
+
+    limited.emit(_report('x' * 30))
+
+    assert outlet.messages[0].startswith(f'{"x" * 10}... [20 more characters could not be written: ')
+    assert (limited.spilled, limited.truncated) == (0, 1)
+
+
+def test_partially_spilled_messages_are_removed(tmp_path, monkeypatch):
+    outlet = _ListOutlet()
+    limited = ReporterOutletLimited(outlet, 10, spill_directory=str(tmp_path / 'spill'))
+
+    def replace(source: str, destination: str):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(os, 'replace', replace)
+    limited.emit(_report('x' * 30))
+
+    assert outlet.messages == [f'{"x" * 10}... [20 more characters could not be written: No space left on device]']
+    assert _spilled_files(tmp_path / 'spill') == []
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from ereport.library import clock
+from ereport.library.clock import ManualClock
+from ereport.library.level import Levels
+from ereport.library.outlet_metrics import OUTPUT_FORMATS, MetricsSnapshot, ReporterOutletMetrics, read_snapshots
+from ereport.library.report import Report
+
+
+class _FailingFile:
+    def __init__(self):
+        self.failing: bool = True
+        self.written: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if self.failing:
+            raise OSError('No space left on device')
+        self.written.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _report(level=Levels.INFO, module: str = 'module', reporter_name: str = 'TEST') -> Report:
+    return Report(level, module, 'function', 1, 'message', reporter_name)
+
+
+def _wait(condition, timeout: float = 5.0):
+    deadline: float = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_intervals_are_aligned_on_the_clock():
+    with clock.use_clock(ManualClock(1003.7)):
+        outlet = ReporterOutletMetrics(interval=0.5)
+        try:
+            assert outlet.current().start == 1003.5
+            for _ in range(3):
+                outlet.emit(_report())
+            clock.get_clock().advance(0.5)
+            _wait(lambda: outlet.snapshots())
+
+            snapshot: MetricsSnapshot = outlet.snapshots()[0]
+            assert (snapshot.start, snapshot.interval, snapshot.count()) == (1003.5, 0.5, 3)
+            assert outlet.current().start == 1004.0
+        finally:
+            outlet.close()
+
+
+@pytest.mark.parametrize('output_format', OUTPUT_FORMATS)
+def test_snapshots_are_read_back(tmp_path, output_format):
+    path: str = str(tmp_path / f'metrics.{output_format}')
+    with clock.use_clock(ManualClock(1000.0)):
+        outlet = ReporterOutletMetrics(path, interval=10.0, output_format=output_format)
+        outlet.emit_many([_report(), _report(), _report(Levels.WARN, 'réseau', 'ÉQUIPE')])
+        outlet.close()
+
+    snapshots: list[MetricsSnapshot] = list(read_snapshots(path, output_format))
+    assert [(snapshot.start, snapshot.interval) for snapshot in snapshots] == [(1000.0, 10.0)]
+    assert snapshots[0].counts == {('TEST', Levels.INFO, 'module'): 2, ('ÉQUIPE', Levels.WARN, 'réseau'): 1}
+
+
+def test_long_names_are_cut_between_characters_in_binary_files(tmp_path):
+    path: str = str(tmp_path / 'metrics.binary')
+    outlet = ReporterOutletMetrics(path, output_format='binary')
+    outlet.emit(_report(module='é' * 40_000))
+    outlet.close()
+
+    assert list(list(read_snapshots(path, 'binary'))[0].counts) == [('TEST', Levels.INFO, 'é' * (0xFFFF // 2))]
+
+
+def test_write_failures_do_not_stop_the_intervals(tmp_path):
+    outlet = ReporterOutletMetrics(str(tmp_path / 'metrics.csv'), interval=0.05)
+    failing = _FailingFile()
+    outlet._file.close()  # pylint: disable=protected-access
+    outlet._file = failing  # pylint: disable=protected-access
+    try:
+        _wait(lambda: outlet.emit(_report()) or outlet.errors >= 2)
+        failing.failing = False
+        _wait(lambda: outlet.emit(_report()) or failing.written)
+
+        assert outlet.errors >= 2
+        assert failing.written
+        assert outlet._thread.is_alive()  # pylint: disable=protected-access
+    finally:
+        outlet.close()
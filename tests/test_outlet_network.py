@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import socket
+import time
+
+import pytest
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet_network import (
+    ReporterOutletSyslogTCP, ReporterOutletSyslogUDP, ReporterOutletTCP, ReporterOutletUDP, RFC5424Formatter, _ReporterOutletNetwork
+)
+from ereport.library.report import Report
+
+
+def _report(message: str, **fields) -> Report:
+    return Report(Levels.INFO, 'module', 'function', 1, message, 'TEST', fields=fields)
+
+
+def _unused_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+class _BrokenSocket:
+    """
+    Accepts ``budget`` bytes, then fails
+    """
+
+    def __init__(self, budget: int):
+        self.budget: int = budget
+        self.received: bytes = b''
+
+    def send(self, data) -> int:
+        if not self.budget:
+            raise ConnectionResetError()
+
+        accepted: bytes = bytes(data[:self.budget])
+        self.budget -= len(accepted)
+        self.received += accepted
+        return len(accepted)
+
+    def close(self):
+        pass
+
+
+_REPORTS: list[Report] = [
+    Report(Levels.INFO, 'module', 'function', 1, f'message {index} é€', 'TEST', '2023-06-01 13:00:00,000000', fields={'request': str(index % 3)})
+    for index in range(30)
+]
+
+
+def _sent(outlet_class: type[_ReporterOutletNetwork], batched: bool) -> list[bytes]:
+    """
+    The messages an outlet of the class sends, each one framed as it would be on the wire
+    """
+    sent: list[bytes] = []
+    recording: type = type(f'_Recording{outlet_class.__name__}', (outlet_class,), {
+        '_send_messages': lambda self, messages: sent.extend([self._frame(message) if hasattr(self, '_frame') else message for message in messages])
+    })
+    outlet = recording('127.0.0.1', _unused_port(), flush_interval=0.01, max_batch=4)
+    if batched:
+        for start in range(0, len(_REPORTS), 7):
+            outlet.emit_many(_REPORTS[start:start + 7])
+    else:
+        for report in _REPORTS:
+            outlet.emit(report)
+    outlet.close()
+    return sent
+
+
+@pytest.mark.parametrize('outlet_class', [ReporterOutletUDP, ReporterOutletTCP, ReporterOutletSyslogUDP, ReporterOutletSyslogTCP])
+def test_batches_are_sent_like_single_reports(outlet_class):
+    single: list[bytes] = _sent(outlet_class, batched=False)
+
+    assert len(single) == 30
+    assert _sent(outlet_class, batched=True) == single
+
+
+def test_structured_data_names_are_sanitized():
+    line: str = RFC5424Formatter('app', hostname='host').format(_report('message', **{'a b=c]"d': 1, 'ok': 2}))
+
+    assert '[ereport@32473 a_b_c__d="1" ok="2"]' in line
+
+
+def test_utc_offsets_follow_daylight_saving_time(monkeypatch):
+    monkeypatch.setenv('TZ', 'CET-1CEST,M3.5.0,M10.5.0/3')
+    time.tzset()
+    try:
+        formatter = RFC5424Formatter('app', hostname='host')
+        timestamps: list[str] = [
+            formatter.format(Report(Levels.INFO, 'module', 'function', 1, 'message', 'TEST', date_time)).split(' ')[1]
+            for date_time in ('2023-03-26 01:59:59,000000', '2023-03-26 03:00:00,000000', '2023-10-29 03:30:00,000000')
+        ]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert timestamps == ['2023-03-26T01:59:59.000000+01:00', '2023-03-26T03:00:00.000000+02:00', '2023-10-29T03:30:00.000000+01:00']
+
+
+def test_frames_written_before_a_broken_connection_are_not_sent_again():
+    outlet = ReporterOutletTCP('127.0.0.1', _unused_port(), DefaultFormatter(), min_backoff=60.0)
+    broken = _BrokenSocket(budget=7)
+    outlet._socket = broken  # pylint: disable=protected-access
+
+    outlet._send_messages([b'aaaa', b'bbbb', b'cccc'])  # pylint: disable=protected-access
+
+    assert broken.received == b'aaaa\nbb'
+    assert outlet.sent == 1
+    assert list(outlet._spill) == [b'bbbb\n', b'cccc\n']  # pylint: disable=protected-access
+    outlet.close()
+
+
+def test_spill_is_retried_without_new_reports():
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    outlet = ReporterOutletTCP('127.0.0.1', server.getsockname()[1], DefaultFormatter(), flush_interval=0.05, min_backoff=0.01)
+    try:
+        for index in range(10):
+            outlet.emit(_report(f'message {index}'))
+        deadline: float = time.monotonic() + 2.0
+        while outlet.spilled < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert outlet.spilled == 10
+
+        # Not listening until now: connections were refused
+        server.listen()
+        server.settimeout(2.0)
+        connection, _ = server.accept()
+        connection.settimeout(2.0)
+        received: bytes = b''
+        while received.count(b'\n') < 10:
+            received += connection.recv(65536)
+        connection.close()
+        outlet.flush()
+        assert outlet.sent == 10
+    finally:
+        outlet.close()
+        server.close()
+
+
+def test_close_counts_spilled_reports_as_dropped():
+    outlet = ReporterOutletTCP('127.0.0.1', _unused_port(), DefaultFormatter(), min_backoff=60.0)
+    for index in range(50):
+        outlet.emit(_report(f'message {index}'))
+    outlet.close()
+
+    assert outlet.sent == 0
+    assert outlet.dropped == 50
+    assert outlet.spilled == 0
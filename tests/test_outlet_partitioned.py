@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from ereport.library.formatter import DefaultFormatter
+from ereport.library.level import Levels
+from ereport.library.outlet_partitioned import ReporterOutletPartitionedFile
+from ereport.library.report import Report
+
+
+def _report(module: str, message: str = 'message') -> Report:
+    return Report(Levels.INFO, module, 'function', 1, message, 'TEST')
+
+
+@pytest.mark.parametrize(('module', 'file_name'), [
+    ('billing', 'billing.log'),
+    ('a/b', 'a_b.log'),
+    ('..\\..', '.._...log'),
+    ('c:d', 'c_d.log'),
+    ('.', '_.log'),
+    ('..', '__.log'),
+    ('', '_.log'),
+    ('.hidden', '.hidden.log')
+])
+def test_placeholder_values_stay_in_their_path_component(tmp_path, module, file_name):
+    outlet = ReporterOutletPartitionedFile(str(tmp_path / 'logs' / '{module}.log'), DefaultFormatter())
+    outlet.emit(_report(module))
+    outlet.close()
+
+    assert os.listdir(tmp_path / 'logs') == [file_name]
+
+
+def test_dots_only_directories_are_escaped(tmp_path):
+    outlet = ReporterOutletPartitionedFile(str(tmp_path / 'logs' / '{module}' / 'app.log'), DefaultFormatter())
+    outlet.emit_many([_report('..'), _report('')])
+    outlet.close()
+
+    assert sorted(os.listdir(tmp_path / 'logs')) == ['_', '__']
+    assert not (tmp_path / 'app.log').exists()
+
+
+def test_reports_are_split_by_placeholder(tmp_path):
+    outlet = ReporterOutletPartitionedFile(str(tmp_path / '{module}.log'), DefaultFormatter())
+    outlet.emit_many([_report('first', 'one'), _report('second', 'two'), _report('first', 'three')])
+    outlet.close()
+
+    assert [line.rsplit(' ', 1)[-1] for line in (tmp_path / 'first.log').read_text('utf8').splitlines()] == ['one', 'three']
+    assert [line.rsplit(' ', 1)[-1] for line in (tmp_path / 'second.log').read_text('utf8').splitlines()] == ['two']
+
+
+def test_reports_emitted_after_close_are_dropped_and_counted(tmp_path):
+    outlet = ReporterOutletPartitionedFile(str(tmp_path / '{module}.log'), DefaultFormatter())
+    outlet.emit(_report('first'))
+    outlet.close()
+
+    outlet.emit(_report('second'))
+    outlet.emit_many([_report('first'), _report('third')])
+
+    assert os.listdir(tmp_path) == ['first.log']
+    assert len((tmp_path / 'first.log').read_text('utf8').splitlines()) == 1
+    assert outlet.dropped == 3
+    assert outlet.open_partitions == ()
+
+
+def test_buffered_lines_are_written_at_exit(tmp_path):
+    script: str = textwrap.dedent(f'''
+        from ereport.library.level import Levels
+        from ereport.library.outlet_partitioned import ReporterOutletPartitionedFile
+        from ereport.library.report import Report
+
+        outlet = ReporterOutletPartitionedFile({str(tmp_path / '{module}.log')!r}, flush_interval=60.0)
+        for index in range(100):
+            outlet.emit(Report(Levels.INFO, f'module_{{index % 2}}', 'function', 1, f'message {{index}}', 'TEST'))
+    ''')
+    subprocess.run([sys.executable, '-c', script], env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}, check=True, timeout=10.0)
+
+    assert len((tmp_path / 'module_0.log').read_text('utf8').splitlines()) == 50
+    assert len((tmp_path / 'module_1.log').read_text('utf8').splitlines()) == 50
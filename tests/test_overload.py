@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import itertools
+import time
+
+import pytest
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.overload import NORMAL, SAMPLING_INFO, SHEDDING_DEBUG, OverloadController
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+
+_NAMES = itertools.count()
+
+
+class _PressuredOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+        'fill',
+        'lag',
+        'failure'
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+        self.fill: float = 0.0
+        self.lag: float = 0.0
+        self.failure: Exception | None = None
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+    def pressure(self) -> tuple[float, float]:
+        if self.failure is not None:
+            raise self.failure
+        return self.fill, self.lag
+
+    @property
+    def messages(self) -> list[str]:
+        return [report.message for report in self.reports]
+
+
+@pytest.fixture
+def controlled() -> tuple[Reporter, _PressuredOutlet, OverloadController]:
+    outlet = _PressuredOutlet()
+    reporter: Reporter = Reporter(f'OVERLOAD_TEST_{next(_NAMES)}', Levels.TRACE).set_outlets([outlet])
+    controller = OverloadController(reporter, max_lag=10.0, info_sample_every=5)
+    reporter.set_overload_controller(controller)
+    return reporter, outlet, controller
+
+
+def _stages(outlet: _PressuredOutlet, controller: OverloadController, fills: list[float]) -> list[int]:
+    stages: list[int] = []
+    for fill in fills:
+        outlet.fill = fill
+        controller.measure()
+        stages.append(controller.stage)
+
+    return stages
+
+
+def test_stages_follow_the_pressure(controlled):
+    _, outlet, controller = controlled
+
+    assert _stages(outlet, controller, [0.3, 0.5, 0.79, 0.8]) == [NORMAL, SHEDDING_DEBUG, SHEDDING_DEBUG, SAMPLING_INFO]
+    assert _stages(outlet, controller, [0.1, 0.95]) == [NORMAL, SAMPLING_INFO]
+
+
+def test_the_lag_counts_as_pressure(controlled):
+    _, outlet, controller = controlled
+    outlet.lag = 6.0
+
+    assert controller.measure() == pytest.approx(0.6)
+    assert controller.stage == SHEDDING_DEBUG
+
+
+def test_stages_are_left_below_their_threshold_minus_the_hysteresis(controlled):
+    _, outlet, controller = controlled
+
+    assert _stages(outlet, controller, [0.9, 0.7, 0.61, 0.59]) == [SAMPLING_INFO, SAMPLING_INFO, SAMPLING_INFO, SHEDDING_DEBUG]
+    assert _stages(outlet, controller, [0.45, 0.31, 0.29]) == [SHEDDING_DEBUG, SHEDDING_DEBUG, NORMAL]
+
+
+def test_reports_are_shed_per_stage_and_summarized(controlled):
+    reporter, outlet, controller = controlled
+    _stages(outlet, controller, [0.6])
+    reporter.debug('shed')
+    reporter.info('kept')
+    _stages(outlet, controller, [0.9])
+    for index in range(10):
+        reporter.info(f'sampled {index}')
+    reporter.trace('shed')
+    reporter.warn('never shed')
+
+    assert controller.shed == {Levels.TRACE: 1, Levels.DEBUG: 1, Levels.INFO: 8}
+    _stages(outlet, controller, [0.0])
+
+    assert outlet.messages[:-1] == ['kept', 'sampled 4', 'sampled 9', 'never shed']
+    assert outlet.reports[-1].level == Levels.WARN
+    assert outlet.messages[-1].startswith('Shed 10 reports over ')
+    assert controller.shed == {}
+
+
+def test_shed_reports_are_not_built(controlled, monkeypatch):
+    reporter, outlet, controller = controlled
+    built: list[str] = []
+    report = Reporter._report  # pylint: disable=protected-access
+    monkeypatch.setattr(Reporter, '_report', lambda self, level, message, *args: built.append(message) or report(self, level, message, *args))
+    _stages(outlet, controller, [0.6])
+
+    reporter.debug('shed')
+    reporter.bind(request='1').trace('shed')
+    reporter.info('kept')
+
+    assert built == ['kept']
+
+
+def test_failures_to_measure_stop_shedding_without_stopping_the_thread(controlled):
+    _, outlet, controller = controlled
+    _stages(outlet, controller, [0.9])
+    controller._check_interval = 0.01  # pylint: disable=protected-access
+    outlet.failure = RuntimeError('unavailable')
+    controller.start()
+    try:
+        deadline: float = time.monotonic() + 5.0
+        while controller.errors < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert controller.stage == NORMAL
+
+        outlet.failure = None
+        outlet.fill = 0.6
+        while controller.stage != SHEDDING_DEBUG and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert controller.stage == SHEDDING_DEBUG
+    finally:
+        controller.stop()
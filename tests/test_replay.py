@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+from ereport.library.cli import main
+from ereport.library.formatter import ColoredFormatter, DefaultFormatter, JSONFormatter
+from ereport.library.level import Levels
+from ereport.library.replay import follow_lines, iter_lines, make_filter, parse_reports
+from ereport.library.report import Report
+
+_REPORTS: list[Report] = [
+    Report(Levels.DEBUG, 'db', 'connect', 10, 'connecting to primary', 'APP', '2023-06-01 12:59:59,000000'),
+    Report(Levels.INFO, 'web', 'handle', 20, 'GET /users answered', 'APP', '2023-06-01 13:00:00,000000'),
+    Report(Levels.WARN, 'db_pool', 'acquire', 30, 'pool almost full', 'DB', '2023-06-01 13:30:00,000000'),
+    Report(Levels.ERROR, 'web', 'handle', 40, 'GET /orders failed', 'APP', '2023-06-02 08:00:00,000000')
+]
+
+
+def _write(path, formatter=None, reports: list[Report] = _REPORTS) -> str:
+    formatter = formatter or DefaultFormatter()
+    with open(path, 'w', encoding='utf8') as file:
+        file.write(''.join(f'{formatter.format(report)}\n' for report in reports))
+    return str(path)
+
+
+def _messages(reports) -> list[str]:
+    return [report.message for report in reports]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 20])
+def test_memory_mapped_lines_are_split_across_chunks(tmp_path, chunk_size):
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'first\nsecond line\n\nlast without terminator')
+
+    assert list(iter_lines(str(path), chunk_size)) == [b'first', b'second line', b'', b'last without terminator']
+
+
+def test_empty_and_compressed_files_are_read(tmp_path):
+    (tmp_path / 'empty.log').write_bytes(b'')
+    with gzip.open(tmp_path / 'app.log.gz', 'wb') as file:
+        file.write(b'first\nsecond\n')
+
+    assert list(iter_lines(str(tmp_path / 'empty.log'))) == []
+    assert list(iter_lines(str(tmp_path / 'app.log.gz'), 3)) == [b'first', b'second']
+
+
+@pytest.mark.parametrize('formatter', [DefaultFormatter(), ColoredFormatter(enabled=True), JSONFormatter()], ids=['default', 'colored', 'json'])
+def test_formatted_lines_are_parsed_back(tmp_path, formatter):
+    reports: list[Report] = list(parse_reports(iter_lines(_write(tmp_path / 'app.log', formatter))))
+
+    assert [(report.level, report.module, report.function, report.line, report.message, report.reporter_name, report.date_time)
+            for report in reports] == [
+        (report.level, report.module, report.function, report.line, report.message, report.reporter_name, report.date_time)
+        for report in _REPORTS
+    ]
+
+
+def test_lines_following_a_report_are_its_traceback(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text(f'{DefaultFormatter().format(_REPORTS[3])}\nTraceback (most recent call last):\n  ValueError: bad\n', 'utf8')
+
+    assert [report.exc_info for report in parse_reports(iter_lines(str(path)))] == ['Traceback (most recent call last):\n  ValueError: bad']
+
+
+def test_lines_below_the_minimum_level_are_skipped(tmp_path):
+    assert _messages(parse_reports(iter_lines(_write(tmp_path / 'app.log')), Levels.WARN)) == ['pool almost full', 'GET /orders failed']
+
+
+@pytest.mark.parametrize(('criteria', 'expected'), [
+    ({'since': '2023-06-01 13:00'}, [1, 2, 3]),
+    ({'until': '2023-06-01T13:30'}, [0, 1]),
+    ({'since': '2023-06-01 13:00', 'until': '2023-06-02'}, [1, 2]),
+    ({'pattern': r'GET /\w+ (answered|failed)'}, [1, 3]),
+    ({'modules': ['db*'], 'level': Levels.INFO}, [2]),
+    ({'reporters': ['app'], 'pattern': 'failed'}, [3]),
+    ({}, [0, 1, 2, 3])
+])
+def test_filters_keep_the_matching_reports(criteria, expected):
+    keep = make_filter(**criteria)
+
+    assert [index for index, report in enumerate(_REPORTS) if keep(report)] == expected
+
+
+def test_followed_files_yield_appended_and_rotated_lines(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'old\n')
+    lines = follow_lines(str(path), poll_interval=0.01)
+
+    assert next(lines) is None
+    with open(path, 'ab') as file:
+        file.write(b'first\nsec')
+    assert next(lines) == b'first'
+    assert next(lines) is None
+    with open(path, 'ab') as file:
+        file.write(b'ond\n')
+    assert next(lines) == b'second'
+
+    os.replace(_write(tmp_path / 'rotated.log', reports=_REPORTS[:1]), path)
+    assert next(lines) is None
+    assert next(lines).endswith(b'connecting to primary')
+    assert next(lines) is None
+    lines.close()
+
+
+def test_read_command_filters_the_files(tmp_path, capsys):
+    path: str = _write(tmp_path / 'app.log')
+
+    assert main(['read', path, '--since', '2023-06-01 13:00', '--until', '2023-06-02', '--grep', 'GET|pool', '--level', 'info']) == 0
+    assert [line.rsplit('] ', 1)[-1] for line in capsys.readouterr().out.splitlines()] == ['GET /users answered', 'pool almost full']
+
+
+def test_read_command_writes_dictionaries_as_json(tmp_path, capsys):
+    path: str = _write(tmp_path / 'app.log')
+
+    assert main(['read', path, '--format', 'dict', '--grep', 'failed']) == 0
+    documents: list[dict] = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(document['level'], document['message'], document['fields']) for document in documents] == [('ERROR', 'GET /orders failed', {})]
+
+
+def test_follow_lines_can_be_consumed_from_another_thread(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_bytes(b'')
+    received: list[bytes] = []
+
+    def consume():
+        for line in follow_lines(str(path), from_start=True, poll_interval=0.01):
+            if line is not None:
+                received.append(line)
+                if line == b'stop':
+                    return
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    with open(path, 'ab') as file:
+        file.write(b'one\nstop\n')
+    thread.join(5.0)
+
+    assert not thread.is_alive()
+    assert received == [b'one', b'stop']
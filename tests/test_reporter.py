@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import itertools
+import weakref
+
+from ereport.library.level import LevelRule, Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library import reporter as reporter_module
+from ereport.library.reporter import Reporter
+
+_NAMES = itertools.count()
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+    @property
+    def messages(self) -> list[str]:
+        return [report.message for report in self.reports]
+
+
+def _reporter(level=Levels.INFO) -> tuple[Reporter, _ListOutlet]:
+    outlet = _ListOutlet()
+    reporter = Reporter(f'REPORTER_TEST_{next(_NAMES)}', level).set_outlets([outlet])
+    return reporter, outlet
+
+
+def _log_debug(reporter: Reporter, message: str):
+    reporter.debug(message)
+
+
+def _log_debug_elsewhere(reporter: Reporter, message: str):
+    reporter.debug(message)
+
+
+def test_rules_select_call_sites_by_function():
+    reporter, outlet = _reporter()
+    reporter.add_level_rule(Levels.DEBUG, function='_log_debug')
+
+    for _ in range(3):
+        _log_debug(reporter, 'enabled')
+        _log_debug_elsewhere(reporter, 'disabled')
+
+    assert outlet.messages == ['enabled'] * 3
+
+
+def test_cached_call_sites_follow_level_changes():
+    reporter, outlet = _reporter()
+    reporter.add_level_rule(Levels.WARN, module='unknown_module')
+
+    _log_debug(reporter, 'first')
+    reporter.level = Levels.DEBUG
+    _log_debug(reporter, 'second')
+    reporter.level = Levels.INFO
+    _log_debug(reporter, 'third')
+
+    assert outlet.messages == ['second']
+
+
+def test_cached_call_sites_follow_rule_changes():
+    reporter, outlet = _reporter()
+    reporter.add_level_rule(Levels.WARN, module='unknown_module')
+
+    _log_debug(reporter, 'first')
+    reporter.set_level_rules([LevelRule(Levels.DEBUG, function='_log_debug')])
+    _log_debug(reporter, 'second')
+    reporter.set_level_rules([LevelRule(Levels.ERROR, function='_log_debug')])
+    _log_debug(reporter, 'third')
+
+    assert outlet.messages == ['second']
+
+
+def test_cached_call_sites_of_bound_reporters_follow_configure():
+    reporter, outlet = _reporter()
+    child: Reporter = reporter.bind(request='1')
+    child.add_level_rule(Levels.WARN, module='unknown_module')
+
+    _log_debug(child, 'first')
+    reporter.configure(level=Levels.DEBUG, rules=[LevelRule(Levels.WARN, module='unknown_module')])
+    _log_debug(child, 'second')
+
+    assert outlet.messages == ['second']
+    assert dict(outlet.reports[0].fields) == {'request': '1'}
+
+
+def test_call_sites_of_different_code_objects_are_told_apart():
+    reporter, outlet = _reporter()
+    reporter.add_level_rule(Levels.DEBUG, function='generated')
+    # Compiled again on each iteration: a code object collected before may leave its id to the next one
+    for index in range(50):
+        function_name: str = 'generated' if index % 2 else 'other'
+        namespace: dict = {}
+        exec(f'def {function_name}(reporter):\n    reporter.debug("{index}")', namespace)  # pylint: disable=exec-used
+        namespace[function_name](reporter)
+
+    assert outlet.messages == [str(index) for index in range(1, 50, 2)]
+
+
+def test_code_names_are_computed_per_code_object():
+    reporter, outlet = _reporter()
+    for function_name in ('first', 'second', 'first'):
+        namespace: dict = {}
+        exec(f'def {function_name}(reporter):\n    reporter.info("message")', namespace)  # pylint: disable=exec-used
+        namespace[function_name](reporter)
+
+    assert [report.function for report in outlet.reports] == ['first', 'second', 'first']
+
+
+def test_call_sites_of_code_made_on_the_fly_are_not_kept_for_ever():
+    reporter, outlet = _reporter()
+    reporter.add_level_rule(Levels.DEBUG, function='generated')
+    first = None
+    for index in range(reporter_module._MAX_CACHED_CALL_SITES + 10):  # pylint: disable=protected-access
+        namespace: dict = {}
+        exec('def generated(reporter, index):\n    reporter.debug(str(index))', namespace)  # pylint: disable=exec-used
+        namespace['generated'](reporter, index)
+        if first is None:
+            first = weakref.ref(namespace['generated'].__code__)
+
+    assert len(reporter._call_sites) <= reporter_module._MAX_CACHED_CALL_SITES  # pylint: disable=protected-access
+    assert first() is None
+    assert len(outlet.messages) == reporter_module._MAX_CACHED_CALL_SITES + 10  # pylint: disable=protected-access
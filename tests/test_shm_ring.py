@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from ereport.library.level import Levels
+from ereport.library.outlet import ReporterOutlet
+from ereport.library.report import Report
+from ereport.library.reporter import Reporter
+from ereport.library.shm_ring import ReporterOutletSharedMemory, SharedMemoryCollector, decode_report, encode_report
+
+
+class _ListOutlet(ReporterOutlet):
+    __slots__ = (
+        'reports',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.reports: list[Report] = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+
+class _FailingOutlet(ReporterOutlet):
+    def emit(self, report: Report):
+        raise RuntimeError('unavailable')
+
+
+def _report(message: str, module: str = 'module') -> Report:
+    return Report(Levels.INFO, module, 'function', 1, message, 'TEST')
+
+
+@pytest.fixture
+def collected() -> tuple[SharedMemoryCollector, _ListOutlet]:
+    outlet = _ListOutlet()
+    reporter: Reporter = Reporter.get_or_make('SHM_TEST').set_outlets([outlet])
+    collector = SharedMemoryCollector(reporter)
+    yield collector, outlet
+    collector.stop()
+
+
+def test_reports_round_trip():
+    report: Report = Report(Levels.WARN, 'module', 'function', 12, 'message', 'TEST', fields={'user': 'alice'})
+    decoded: Report = decode_report(encode_report(report))
+
+    assert (decoded.level, decoded.module, decoded.function, decoded.line) == (Levels.WARN, 'module', 'function', 12)
+    assert (decoded.message, decoded.reporter_name, decoded.date_time) == ('message', 'TEST', report.date_time)
+    assert dict(decoded.fields) == {'user': 'alice'}
+
+
+def test_long_names_are_cut_between_characters():
+    decoded: Report = decode_report(encode_report(_report('message', module='é' * 40_000)))
+
+    assert decoded.module == 'é' * (0xFFFF // 2)
+
+
+def test_threads_of_a_process_share_a_ring(collected):
+    collector, outlet = collected
+    producer = ReporterOutletSharedMemory(collector.add_ring(16 * 1024 * 1024))
+
+    def produce(thread_index: int):
+        for index in range(2000):
+            producer.emit(_report(f'{thread_index} {index}'))
+
+    threads: list[threading.Thread] = [threading.Thread(target=produce, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    collector.start()
+    for thread in threads:
+        thread.join()
+    collector.stop(close_rings=False)
+
+    assert producer.ring.dropped == 0
+    assert collector.invalid == 0
+    assert sorted(report.message for report in outlet.reports) == sorted(f'{thread} {index}' for thread in range(8) for index in range(2000))
+
+
+def test_stop_drains_every_pending_record(collected):
+    collector, outlet = collected
+    ring = collector.add_ring(16 * 1024 * 1024)
+    for index in range(25_000):
+        ring.write(encode_report(_report(str(index))))
+    ring.write(b'not a record')
+    ring.write(encode_report(_report('last')))
+
+    collector.stop(close_rings=False)
+
+    assert ring.used == 0
+    assert collector.invalid == 1
+    assert [report.message for report in outlet.reports] == [str(index) for index in range(25_000)] + ['last']
+
+
+def test_invalid_records_are_skipped(collected):
+    collector, outlet = collected
+    ring = collector.add_ring(64 * 1024)
+    ring.write(b'not a record')
+    ring.write(encode_report(_report('valid')))
+
+    assert collector.drain() == 1
+    assert collector.invalid == 1
+    assert [report.message for report in outlet.reports] == ['valid']
+
+
+def test_failing_outlets_do_not_stop_the_others(collected):
+    collector, outlet = collected
+    Reporter.get_or_make('SHM_TEST').set_outlets([_FailingOutlet(), outlet])
+    ring = collector.add_ring(64 * 1024)
+    ring.write(encode_report(_report('first')))
+    ring.write(encode_report(_report('second')))
+
+    assert collector.drain() == 2
+    assert collector.errors == 1
+    assert [report.message for report in outlet.reports] == ['first', 'second']
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import traceback
+
+from ereport.library._internal.traceback_cache import capture_exc_info, clear_traceback_cache, render_exc_info
+
+
+def _fail(value: int):
+    if value:
+        raise ValueError(f'value {value}')
+    raise KeyError('zero')
+
+
+def _captured(value: int):
+    try:
+        _fail(value)
+    except (ValueError, KeyError) as error:
+        return capture_exc_info(error)
+
+
+def _expected(exc_info) -> str:
+    return ''.join(traceback.format_exception(*exc_info)).rstrip('\n')
+
+
+def test_rendered_like_format_exception():
+    clear_traceback_cache()
+    for value in (1, 2, 0, 1):
+        exc_info = _captured(value)
+        assert render_exc_info(exc_info) == _expected(exc_info)
+
+
+def test_chained_exceptions_are_rendered():
+    try:
+        try:
+            _fail(1)
+        except ValueError as error:
+            raise RuntimeError('wrapped') from error
+    except RuntimeError as error:
+        exc_info = capture_exc_info(error)
+
+    assert render_exc_info(exc_info) == _expected(exc_info)
+
+
+def test_stacks_of_recompiled_code_are_not_mixed_up():
+    clear_traceback_cache()
+    # Compiled again on each iteration: a code object collected before may leave its id to the next one
+    for index in range(30):
+        namespace: dict = {}
+        padding: str = '\n' * (index % 3)
+        code = compile(f'{padding}def failing():\n    raise ValueError({index})', f'<generated {index}>', 'exec')
+        exec(code, namespace)  # pylint: disable=exec-used
+        try:
+            namespace['failing']()
+        except ValueError as error:
+            exc_info = capture_exc_info(error)
+
+        assert render_exc_info(exc_info) == _expected(exc_info)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from ereport.library._internal.worker import BatchingWorker
+
+
+def test_batches_are_handed_over_in_order():
+    batches: list[list[int]] = []
+    worker = BatchingWorker('test-worker', batches.append, max_batch=4, flush_interval=60.0)
+    worker.submit_many(list(range(10)))
+    worker.close()
+
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_close_does_not_wait_for_a_stuck_handler(capsys):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def handle(batch: list):
+        entered.set()
+        release.wait(10.0)
+
+    worker = BatchingWorker('test-worker', handle, flush_interval=0.01, close_timeout=0.1)
+    worker.submit(1)
+    assert entered.wait(5.0)
+    worker.submit(2)
+    started: float = time.monotonic()
+    worker.close()
+    elapsed: float = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 2.0
+    assert 'still handling a batch after 0.1s, leaving 1 pending item(s)' in capsys.readouterr().err